@@ -31,6 +31,14 @@ namespace Data
 
         public int GetAnomaliesGenNumForDay(int day)
         {
+            // An @series export keeps the schedule as runs: one binary search instead of a row scan.
+            if (Tables.IsSeriesTable("AnomaliesGen"))
+            {
+                return Tables.TryGetSeriesValue("AnomaliesGen", "AnomaliesGenNum", day, out var seriesValue) && seriesValue > 0
+                    ? (int)seriesValue
+                    : 0;
+            }
+
             if (AnomaliesGen == null || AnomaliesGen.Count == 0) return 0;
             int total = 0;
             foreach (var row in AnomaliesGen)
@@ -127,7 +135,7 @@ namespace Data
         {
             Balance = Root.balance ?? new Dictionary<string, BalanceValue>();
 
-            Tables = new TableRegistry(Root.tables);
+            Tables = new TableRegistry(Root.tables, Root.strings);
             Debug.Log($"[Tables] loaded {Tables.TableCount} tables");
             LogTablesSanity();
 
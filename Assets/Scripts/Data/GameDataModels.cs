@@ -10,6 +10,8 @@ namespace Data
         public Dictionary<string, BalanceValue> balance = new();
         public List<AnomalyDef> anomalies = new();
         public Dictionary<string, GameDataTable> tables = new();
+        // String pool (xlsx_to_json.py --intern-strings); string cells may hold an index into it.
+        public List<string> strings;
     }
 
     [Serializable]
@@ -81,6 +83,32 @@ namespace Data
         public string idField;
         public List<GameDataColumn> columns = new();
         public List<Dictionary<string, object>> rows = new();
+        // Columnar layout (xlsx_to_json.py --layout columnar): one value list per column.
+        public Dictionary<string, List<object>> data;
+        // Precomputed lookups (xlsx_to_json.py --index); rows are then sorted by id.
+        public GameDataTableIndex index;
+        // Sheets marked @series: "rle" or "delta", with the encoded columns in series; rows are rebuilt on load.
+        public string encoding;
+        public GameDataSeries series;
+    }
+
+    [Serializable]
+    public class GameDataSeries
+    {
+        // First id of the contiguous int id column and the number of rows; ids are start .. start + count - 1.
+        public long start;
+        public int count;
+        // rle: column -> [startId, length, value] runs; delta: column -> first value, then differences.
+        public Dictionary<string, List<object>> columns;
+    }
+
+    [Serializable]
+    public class GameDataTableIndex
+    {
+        // id (as text) -> row position.
+        public Dictionary<string, int> id;
+        // column -> value (as text) -> ascending row positions, for columns marked @index.
+        public Dictionary<string, Dictionary<string, List<int>>> columns;
     }
 
     [Serializable]
@@ -11,6 +11,7 @@ namespace Data
         private static readonly char[] ListSeparators = { ',', ';', '，' };
         private readonly Dictionary<string, GameDataTable> _tables;
         private readonly Dictionary<string, Dictionary<string, Dictionary<string, object>>> _rowsByTable;
+        private readonly Dictionary<string, Dictionary<string, SeriesRuns>> _seriesByTable;
 
         public TableRegistry()
             : this(new Dictionary<string, GameDataTable>())
@@ -18,9 +19,18 @@ namespace Data
         }
 
         public TableRegistry(Dictionary<string, GameDataTable> tables)
+            : this(tables, null)
+        {
+        }
+
+        public TableRegistry(Dictionary<string, GameDataTable> tables, IReadOnlyList<string> strings)
         {
             _tables = tables ?? new Dictionary<string, GameDataTable>();
             _rowsByTable = new Dictionary<string, Dictionary<string, Dictionary<string, object>>>(StringComparer.Ordinal);
+            _seriesByTable = new Dictionary<string, Dictionary<string, SeriesRuns>>(StringComparer.Ordinal);
+            ExpandSeriesTables();
+            ExpandColumnarTables();
+            ResolveInternedStrings(strings);
             BuildIndex();
         }
 
@@ -49,6 +59,16 @@ namespace Data
             if (string.IsNullOrEmpty(tableName) || string.IsNullOrEmpty(columnName)) return matches;
             if (!_tables.TryGetValue(tableName, out var table) || table?.rows == null) return matches;
 
+            if (table.index?.columns != null && table.index.columns.TryGetValue(columnName, out var buckets) && buckets != null)
+            {
+                if (value != null && buckets.TryGetValue(value, out var positions) && positions != null)
+                {
+                    foreach (var position in positions) matches.Add(table.rows[position]);
+                }
+
+                return matches;
+            }
+
             foreach (var row in table.rows)
             {
                 if (row == null || !row.TryGetValue(columnName, out var raw)) continue;
@@ -64,8 +84,11 @@ namespace Data
         {
             row = null;
             if (string.IsNullOrEmpty(tableName) || string.IsNullOrEmpty(rowId)) return false;
-            if (!_rowsByTable.TryGetValue(tableName, out var tableIndex)) return false;
-            return tableIndex.TryGetValue(rowId, out row);
+            if (_rowsByTable.TryGetValue(tableName, out var tableIndex)) return tableIndex.TryGetValue(rowId, out row);
+            if (!_tables.TryGetValue(tableName, out var table) || !HasExportedIndex(table)) return false;
+            if (!table.index.id.TryGetValue(rowId, out var position)) return false;
+            row = table.rows[position];
+            return row != null;
         }
 
         public int GetInt(string tableName, string rowId, string column, int fallback = 0)
@@ -110,6 +133,20 @@ namespace Data
             return CoerceFloatList(raw);
         }
 
+        public bool IsSeriesTable(string tableName)
+        {
+            return !string.IsNullOrEmpty(tableName) && _seriesByTable.ContainsKey(tableName);
+        }
+
+        // Value of an @series column for one id, by binary search over its runs; false outside the series.
+        public bool TryGetSeriesValue(string tableName, string column, long id, out long value)
+        {
+            value = 0;
+            if (string.IsNullOrEmpty(tableName) || string.IsNullOrEmpty(column)) return false;
+            if (!_seriesByTable.TryGetValue(tableName, out var columns)) return false;
+            return columns.TryGetValue(column, out var runs) && runs.TryGetValue(id, out value);
+        }
+
         public bool TryFindFirstValue(string column, out string tableName, out string rowId, out object value)
         {
             tableName = null;
@@ -117,9 +154,9 @@ namespace Data
             value = null;
             if (string.IsNullOrEmpty(column)) return false;
 
-            foreach (var tableEntry in _rowsByTable)
+            foreach (var tableEntry in _tables)
             {
-                foreach (var rowEntry in tableEntry.Value)
+                foreach (var rowEntry in EnumerateIndexedRows(tableEntry.Key, tableEntry.Value))
                 {
                     if (!rowEntry.Value.TryGetValue(column, out var raw)) continue;
                     tableName = tableEntry.Key;
@@ -132,6 +169,147 @@ namespace Data
             return false;
         }
 
+        private IEnumerable<KeyValuePair<string, Dictionary<string, object>>> EnumerateIndexedRows(string tableName, GameDataTable table)
+        {
+            if (_rowsByTable.TryGetValue(tableName, out var tableIndex)) return tableIndex;
+            if (!HasExportedIndex(table)) return Array.Empty<KeyValuePair<string, Dictionary<string, object>>>();
+            return table.index.id
+                .Where(pair => table.rows[pair.Value] != null)
+                .Select(pair => new KeyValuePair<string, Dictionary<string, object>>(pair.Key, table.rows[pair.Value]));
+        }
+
+        // An exported index is trusted only when it covers every row; the exporter verifies it against the rows.
+        private static bool HasExportedIndex(GameDataTable table)
+        {
+            return table?.rows != null && table.index?.id != null && table.index.id.Count == table.rows.Count;
+        }
+
+        private void ExpandSeriesTables()
+        {
+            foreach (var entry in _tables)
+            {
+                var table = entry.Value;
+                if (table?.series == null || table.columns == null || string.IsNullOrEmpty(table.idField)) continue;
+
+                var series = table.series;
+                var decoded = new Dictionary<string, SeriesRuns>(StringComparer.Ordinal);
+                var isDelta = string.Equals(table.encoding, "delta", StringComparison.Ordinal);
+                if (!isDelta && !string.Equals(table.encoding, "rle", StringComparison.Ordinal))
+                {
+                    throw new InvalidOperationException($"[DataRegistry] Table '{entry.Key}' has unknown series encoding '{table.encoding}'.");
+                }
+
+                foreach (var column in table.columns)
+                {
+                    if (column?.name == null || column.name == table.idField) continue;
+                    if (series.columns == null || !series.columns.TryGetValue(column.name, out var encoded) || encoded == null) continue;
+                    decoded[column.name] = isDelta
+                        ? SeriesRuns.FromDeltas(series.start, encoded)
+                        : SeriesRuns.FromRuns(series.start, series.count, encoded, entry.Key, column.name);
+                }
+
+                var rows = new List<Dictionary<string, object>>(series.count);
+                for (var i = 0; i < series.count; i++)
+                {
+                    var id = series.start + i;
+                    var row = new Dictionary<string, object>(table.columns.Count, StringComparer.Ordinal);
+                    foreach (var column in table.columns)
+                    {
+                        if (column?.name == null) continue;
+                        if (column.name == table.idField)
+                        {
+                            row[column.name] = id;
+                        }
+                        else if (decoded.TryGetValue(column.name, out var runs) && runs.TryGetValue(id, out var value))
+                        {
+                            row[column.name] = value;
+                        }
+                    }
+
+                    rows.Add(row);
+                }
+
+                table.rows = rows;
+                table.series = null;
+                _seriesByTable[entry.Key] = decoded;
+            }
+        }
+
+        private void ExpandColumnarTables()
+        {
+            foreach (var entry in _tables)
+            {
+                var table = entry.Value;
+                if (table?.data == null || table.columns == null) continue;
+
+                var rowCount = table.data.Values.Select(values => values?.Count ?? 0).DefaultIfEmpty(0).Max();
+                var rows = new List<Dictionary<string, object>>(rowCount);
+                for (var i = 0; i < rowCount; i++)
+                {
+                    var row = new Dictionary<string, object>(table.columns.Count, StringComparer.Ordinal);
+                    foreach (var column in table.columns)
+                    {
+                        if (column?.name == null) continue;
+                        if (!table.data.TryGetValue(column.name, out var values) || values == null) continue;
+                        row[column.name] = i < values.Count ? values[i] : null;
+                    }
+
+                    rows.Add(row);
+                }
+
+                table.rows = rows;
+                table.data = null;
+            }
+        }
+
+        private void ResolveInternedStrings(IReadOnlyList<string> strings)
+        {
+            if (strings == null || strings.Count == 0) return;
+
+            foreach (var table in _tables.Values)
+            {
+                if (table?.rows == null || table.columns == null) continue;
+                foreach (var column in table.columns)
+                {
+                    if (column?.name == null) continue;
+                    var isList = string.Equals(column.type, "string[]", StringComparison.Ordinal);
+                    if (!isList && !string.Equals(column.type, "string", StringComparison.Ordinal)) continue;
+
+                    foreach (var row in table.rows)
+                    {
+                        if (row == null || !row.TryGetValue(column.name, out var raw) || raw == null) continue;
+                        if (!isList)
+                        {
+                            if (TryResolveStringRef(raw, strings, out var text)) row[column.name] = text;
+                            continue;
+                        }
+
+                        if (raw is not JArray items) continue;
+                        for (var i = 0; i < items.Count; i++)
+                        {
+                            if (TryResolveStringRef(items[i], strings, out var text)) items[i] = new JValue(text);
+                        }
+                    }
+                }
+            }
+        }
+
+        private static bool TryResolveStringRef(object raw, IReadOnlyList<string> strings, out string text)
+        {
+            text = null;
+            if (raw is JValue jValue) raw = jValue.Value;
+            if (raw is not long && raw is not int) return false;
+
+            var index = Convert.ToInt64(raw, CultureInfo.InvariantCulture);
+            if (index < 0 || index >= strings.Count)
+            {
+                throw new InvalidOperationException($"[DataRegistry] String ref {index} out of range (pool size {strings.Count}).");
+            }
+
+            text = strings[(int)index];
+            return true;
+        }
+
         private void BuildIndex()
         {
             _rowsByTable.Clear();
@@ -139,6 +317,8 @@ namespace Data
             {
                 var tableName = entry.Key;
                 var table = entry.Value;
+                if (HasExportedIndex(table)) continue;
+
                 var index = new Dictionary<string, Dictionary<string, object>>(StringComparer.Ordinal);
                 if (table?.rows == null || string.IsNullOrEmpty(table.idField))
                 {
@@ -416,5 +596,73 @@ namespace Data
                 .Where(part => !string.IsNullOrEmpty(part))
                 .ToList();
         }
+
+        // One decoded @series column: sorted run starts and the value of each run.
+        private sealed class SeriesRuns
+        {
+            private readonly long[] _starts;
+            private readonly long[] _values;
+            private readonly long _end;
+
+            private SeriesRuns(List<long> starts, List<long> values, long end)
+            {
+                _starts = starts.ToArray();
+                _values = values.ToArray();
+                _end = end;
+            }
+
+            public static SeriesRuns FromRuns(long start, int count, List<object> encoded, string tableName, string column)
+            {
+                var starts = new List<long>(encoded.Count);
+                var values = new List<long>(encoded.Count);
+                var next = start;
+                foreach (var raw in encoded)
+                {
+                    if (raw is not JArray run || run.Count != 3 || run[0].Value<long>() != next)
+                    {
+                        throw new InvalidOperationException($"[DataRegistry] Table '{tableName}' column '{column}' has a broken run at id {next}.");
+                    }
+
+                    starts.Add(next);
+                    values.Add(run[2].Value<long>());
+                    next += run[1].Value<long>();
+                }
+
+                if (next != start + count)
+                {
+                    throw new InvalidOperationException($"[DataRegistry] Table '{tableName}' column '{column}' runs cover {next - start} of {count} rows.");
+                }
+
+                return new SeriesRuns(starts, values, next);
+            }
+
+            public static SeriesRuns FromDeltas(long start, List<object> encoded)
+            {
+                var starts = new List<long>();
+                var values = new List<long>();
+                long value = 0;
+                for (var i = 0; i < encoded.Count; i++)
+                {
+                    var raw = encoded[i] is JValue jValue ? jValue.Value : encoded[i];
+                    var delta = Convert.ToInt64(raw, CultureInfo.InvariantCulture);
+                    value += delta;
+                    if (i > 0 && delta == 0) continue;
+                    starts.Add(start + i);
+                    values.Add(value);
+                }
+
+                return new SeriesRuns(starts, values, start + encoded.Count);
+            }
+
+            public bool TryGetValue(long id, out long value)
+            {
+                value = 0;
+                if (_starts.Length == 0 || id < _starts[0] || id >= _end) return false;
+                var position = Array.BinarySearch(_starts, id);
+                if (position < 0) position = ~position - 1;
+                value = _values[position];
+                return true;
+            }
+        }
     }
 }
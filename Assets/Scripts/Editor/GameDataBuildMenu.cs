@@ -1,6 +1,12 @@
 using System;
+using System.Collections.Generic;
 using System.Diagnostics;
 using System.IO;
+using System.Net;
+using System.Net.Sockets;
+using System.Text;
+using Newtonsoft.Json;
+using Newtonsoft.Json.Linq;
 using UnityEditor;
 using UnityEngine;
 using Debug = UnityEngine.Debug;
@@ -11,9 +17,18 @@ public static class GameDataBuildMenu
     private const string K_XLSX = "GAME_DATA_XLSX_PATH";
     private const string K_OUT = "GAME_DATA_JSON_OUT_PATH";
     private const string K_LEVEL = "GAME_DATA_LOG_LEVEL";
+    private const string K_PROFILE = "GAME_DATA_PROFILE";
+    private const string K_PORT = "GAME_DATA_SERVE_PORT";
 
     private const string DefaultXlsx = "GameData/Local/game_data.xlsx";
     private const string DefaultOut = "Assets/StreamingAssets/game_data.json";
+    private const string ProfileReport = "Library/GameData/export_profile.json";
+    private const string ProfileCProfile = "Library/GameData/export.prof";
+
+    // xlsx_to_json.py --serve listens here by default (DEFAULT_SERVE_PORT).
+    private const int DefaultServePort = 47823;
+    private const int ServeConnectTimeoutMs = 200;
+    private const int ServeReplyTimeoutMs = 60000;
 
     [MenuItem("Tools/GameData/Build game_data.json (from XLSX)")]
     private static void Build()
@@ -25,6 +40,15 @@ public static class GameDataBuildMenu
         var outJson = GetConfiguredPath(K_OUT, repoRoot, DefaultOut);
         var logLevel = EditorPrefs.GetString(K_LEVEL, "INFO");
 
+        // A running `xlsx_to_json.py --serve` keeps parsed workbooks in memory, so a build costs
+        // milliseconds instead of a cold Python start. Profiling needs its own process and env.
+        if (!EditorPrefs.GetBool(K_PROFILE, false)
+            && TryBuildViaServer(xlsx, outJson, logLevel, out var serveExitCode, out var serveIssues))
+        {
+            FinishBuild(serveExitCode, outJson, serveIssues);
+            return;
+        }
+
         if (string.IsNullOrEmpty(python))
         {
             EditorUtility.DisplayDialog("GameData", "Python not found. Set it in Tools/GameData/Settings...", "OK");
@@ -62,15 +86,33 @@ public static class GameDataBuildMenu
         }
 
         var args = $"-u \"{script}\" --xlsx \"{xlsx}\" --out \"{outJson}\" --log-level {logLevel}";
-        RunProcess(repoRoot, python, args, out var stdout, out var stderr, out var exitCode);
+        Dictionary<string, string> env = null;
+        if (EditorPrefs.GetBool(K_PROFILE, false))
+        {
+            // Read by xlsx_to_json.py as defaults for --profile-report / --cprofile.
+            env = new Dictionary<string, string>
+            {
+                ["GAME_DATA_PROFILE_REPORT"] = Path.GetFullPath(Path.Combine(repoRoot, ProfileReport)),
+                ["GAME_DATA_CPROFILE"] = Path.GetFullPath(Path.Combine(repoRoot, ProfileCProfile)),
+            };
+        }
+        RunProcess(repoRoot, python, args, out var stdout, out var stderr, out var exitCode, env);
 
         // IMPORTANT: stderr is not always "error" (Python logging may write INFO to stderr)
         LogOutput(stdout, false); // stdout
         LogOutput(stderr, true);  // stderr
 
+        FinishBuild(exitCode, outJson, null);
+    }
+
+    private static void FinishBuild(int exitCode, string outJson, IReadOnlyList<string> issues)
+    {
         if (exitCode != 0)
         {
-            EditorUtility.DisplayDialog("GameData Build Failed", $"ExitCode={exitCode}\nSee Console for details.", "OK");
+            var details = issues != null && issues.Count > 0
+                ? string.Join("\n", issues.Count > 10 ? new List<string>(issues).GetRange(0, 10) : issues) + "\n"
+                : string.Empty;
+            EditorUtility.DisplayDialog("GameData Build Failed", $"ExitCode={exitCode}\n{details}See Console for details.", "OK");
             return;
         }
 
@@ -78,6 +120,73 @@ public static class GameDataBuildMenu
         Debug.Log($"[GameData] Generated: {outJson}");
     }
 
+    // Returns false when no export server answers, so the caller falls back to spawning Python.
+    private static bool TryBuildViaServer(string xlsx, string outJson, string logLevel, out int exitCode, out List<string> issues)
+    {
+        exitCode = 0;
+        issues = new List<string>();
+        var port = EditorPrefs.GetInt(K_PORT, DefaultServePort);
+        JObject reply;
+        try
+        {
+            using var client = new TcpClient();
+            var connect = client.ConnectAsync(IPAddress.Loopback, port);
+            if (!connect.Wait(ServeConnectTimeoutMs) || !client.Connected) return false;
+            client.ReceiveTimeout = ServeReplyTimeoutMs;
+            client.SendTimeout = ServeReplyTimeoutMs;
+
+            using var stream = client.GetStream();
+            var request = new JObject
+            {
+                ["xlsx"] = xlsx,
+                ["out"] = outJson,
+                ["logLevel"] = logLevel,
+                ["validateOnly"] = false,
+            };
+            var payload = Encoding.UTF8.GetBytes(request.ToString(Formatting.None) + "\n");
+            stream.Write(payload, 0, payload.Length);
+            using var reader = new StreamReader(stream, new UTF8Encoding(false));
+            var line = reader.ReadLine();
+            if (string.IsNullOrEmpty(line))
+            {
+                Debug.LogWarning($"[GameData] export server on 127.0.0.1:{port} closed without a reply; starting Python instead.");
+                return false;
+            }
+            reply = JObject.Parse(line);
+        }
+        catch (AggregateException)
+        {
+            // Connection refused: no server running.
+            return false;
+        }
+        catch (Exception e) when (e is SocketException || e is IOException || e is JsonException)
+        {
+            Debug.LogWarning($"[GameData] export server on 127.0.0.1:{port} failed ({e.Message}); starting Python instead.");
+            return false;
+        }
+
+        Debug.Log($"[GameData] export server 127.0.0.1:{port}");
+        if (reply["log"] is JArray log)
+        {
+            foreach (var entry in log)
+            {
+                if (entry is JArray pair && pair.Count >= 2) LogLineSmart($"[{pair[0]}] {pair[1]}", false);
+            }
+        }
+        if (reply["issues"] is JArray issueArray)
+        {
+            foreach (var issue in issueArray) issues.Add(issue.ToString());
+        }
+        if (reply["timings"] is JObject timings && timings.Count > 0)
+        {
+            var parts = new List<string>();
+            foreach (var timing in timings.Properties()) parts.Add($"{timing.Name}={timing.Value}");
+            Debug.Log($"[GameData] server timings_ms {string.Join(" ", parts)}");
+        }
+        exitCode = reply.Value<int?>("status") ?? 1;
+        return true;
+    }
+
     [MenuItem("Tools/GameData/Settings...")]
     private static void Settings()
     {
@@ -134,7 +243,14 @@ public static class GameDataBuildMenu
         }
     }
 
-    private static void RunProcess(string wd, string exe, string args, out string stdout, out string stderr, out int exitCode)
+    private static void RunProcess(
+        string wd,
+        string exe,
+        string args,
+        out string stdout,
+        out string stderr,
+        out int exitCode,
+        IReadOnlyDictionary<string, string> env = null)
     {
         var outputBuilder = new System.Text.StringBuilder();
         var errorBuilder = new System.Text.StringBuilder();
@@ -151,6 +267,10 @@ public static class GameDataBuildMenu
             CreateNoWindow = true
         };
         psi.Environment["PYTHONUNBUFFERED"] = "1";
+        if (env != null)
+        {
+            foreach (var pair in env) psi.Environment[pair.Key] = pair.Value;
+        }
         using var p = Process.Start(psi);
         if (p == null) throw new Exception("Failed to start process.");
         p.OutputDataReceived += (_, e) =>
@@ -258,13 +378,15 @@ public static class GameDataBuildMenu
         private string xlsxPath = string.Empty;
         private string outPath = string.Empty;
         private string logLevel = "INFO";
+        private bool profile;
+        private int servePort = DefaultServePort;
 
         private static readonly string[] LogLevels = { "DEBUG", "INFO", "WARN", "ERROR" };
 
         public static void ShowWindow()
         {
             var window = GetWindow<GameDataSettingsWindow>(true, "GameData Settings");
-            window.minSize = new Vector2(520f, 220f);
+            window.minSize = new Vector2(520f, 240f);
             window.Load();
             window.Show();
         }
@@ -276,6 +398,8 @@ public static class GameDataBuildMenu
             xlsxPath = EditorPrefs.GetString(K_XLSX, Path.Combine(repoRoot, DefaultXlsx));
             outPath = EditorPrefs.GetString(K_OUT, Path.Combine(repoRoot, DefaultOut));
             logLevel = EditorPrefs.GetString(K_LEVEL, "INFO");
+            profile = EditorPrefs.GetBool(K_PROFILE, false);
+            servePort = EditorPrefs.GetInt(K_PORT, DefaultServePort);
         }
 
         private void OnGUI()
@@ -293,6 +417,10 @@ public static class GameDataBuildMenu
             if (currentIndex < 0) currentIndex = 1;
             var selectedIndex = EditorGUILayout.Popup("Log Level", currentIndex, LogLevels);
             logLevel = LogLevels[selectedIndex];
+            profile = EditorGUILayout.Toggle(new GUIContent("Profile Export", $"Write {ProfileReport} and {ProfileCProfile}"), profile);
+            servePort = EditorGUILayout.IntField(
+                new GUIContent("Export Server Port", "Build goes through `xlsx_to_json.py --serve --port N` when it is running"),
+                servePort);
 
             EditorGUILayout.Space();
             using (new EditorGUILayout.HorizontalScope())
@@ -303,6 +431,8 @@ public static class GameDataBuildMenu
                     xlsxPath = Path.Combine(repoRoot, DefaultXlsx);
                     outPath = Path.Combine(repoRoot, DefaultOut);
                     logLevel = "INFO";
+                    profile = false;
+                    servePort = DefaultServePort;
                 }
 
                 if (GUILayout.Button("Save"))
@@ -324,6 +454,8 @@ public static class GameDataBuildMenu
             EditorPrefs.SetString(K_XLSX, xlsxFull);
             EditorPrefs.SetString(K_OUT, outFull);
             EditorPrefs.SetString(K_LEVEL, logLevel);
+            EditorPrefs.SetBool(K_PROFILE, profile);
+            EditorPrefs.SetInt(K_PORT, servePort);
         }
     }
 }
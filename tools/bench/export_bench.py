@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Time the exporter's phases over a matrix of synthetic workbook sizes.
+
+    export_bench.py run --rows 1000,10000,50000 --sheets 1,4 --out bench.json
+    export_bench.py run ... --out bench.json --baseline tools/bench/baseline.json
+    export_bench.py compare baseline.json bench.json --threshold 0.2
+
+``run`` generates (or reuses) one workbook per matrix cell with
+make_workbook.py and times ``load_workbook``, ``parse_sheet`` (all sheets),
+``json.dumps`` and the atomic file write separately, keeping the best of
+``--repeat`` runs. ``compare`` reports every phase that got slower than the
+baseline by more than ``--threshold`` (a fraction) and ``--min-ms``, and
+exits 2 when there is at least one regression.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import openpyxl  # noqa: E402
+
+import xlsx_to_json  # noqa: E402
+from make_workbook import DEFAULT_TYPES, write_workbook  # noqa: E402
+
+RESULTS_FORMAT = "xlsx_to_json.bench/1"
+PHASES = ("load", "parse", "dumps", "write")
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(item) for item in text.split(",") if item.strip()]
+
+
+def _case_key(case: dict[str, Any]) -> str:
+    return f"sheets={case['sheets']} rows={case['rows']} columns={case['columns']} listLen={case['listLen']}"
+
+
+def time_export(xlsx_path: Path, out_path: Path) -> tuple[dict[str, float], int, int]:
+    """One pass over the exporter phases; returns (ms per phase, rows parsed, json bytes)."""
+    reporter = xlsx_to_json.Reporter("ERROR")
+    timings: dict[str, float] = {}
+
+    start = time.perf_counter()
+    workbook = xlsx_to_json.open_workbook(xlsx_path)
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tables: dict[str, Any] = {}
+    try:
+        for sheet_name in workbook.sheetnames:
+            table, issues = xlsx_to_json.parse_sheet(workbook[sheet_name], reporter)
+            if issues:
+                raise RuntimeError(f"synthetic workbook failed validation: {issues[:3]}")
+            if table is not None:
+                tables[sheet_name] = {"idField": table.id_field, "columns": table.columns, "rows": table.rows}
+    finally:
+        workbook.close()
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    meta = tables["Meta"]["rows"][0] if tables.get("Meta", {}).get("rows") else {}
+    payload = json.dumps({"meta": meta, "tables": tables}, ensure_ascii=False, indent=2).encode("utf-8")
+    timings["dumps"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    xlsx_to_json.write_bytes_atomic(out_path, payload)
+    timings["write"] = time.perf_counter() - start
+
+    rows = sum(len(table["rows"]) for name, table in tables.items() if name != "Meta")
+    return {phase: seconds * 1000 for phase, seconds in timings.items()}, rows, len(payload)
+
+
+def run_matrix(args: argparse.Namespace) -> dict[str, Any]:
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="xlsx_bench_"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    cases: list[dict[str, Any]] = []
+    for sheets in _int_list(args.sheets):
+        for rows in _int_list(args.rows):
+            case: dict[str, Any] = {
+                "sheets": sheets,
+                "rows": rows,
+                "columns": args.columns,
+                "listLen": args.list_len,
+            }
+            xlsx_path = work_dir / f"bench_s{sheets}_r{rows}_c{args.columns}_l{args.list_len}.xlsx"
+            if not xlsx_path.exists():
+                write_workbook(
+                    xlsx_path,
+                    sheets=sheets,
+                    rows=rows,
+                    columns=args.columns,
+                    types=tuple(args.types.split(",")),
+                    list_len=args.list_len,
+                )
+            best: dict[str, float] = {}
+            for _ in range(args.repeat):
+                timings, parsed_rows, json_bytes = time_export(xlsx_path, work_dir / "out.json")
+                for phase, value in timings.items():
+                    best[phase] = min(best.get(phase, value), value)
+            best["total"] = sum(best[phase] for phase in PHASES)
+            case.update(
+                {
+                    "xlsxBytes": xlsx_path.stat().st_size,
+                    "jsonBytes": json_bytes,
+                    "timings_ms": {phase: round(value, 3) for phase, value in best.items()},
+                    "rowsPerSec": round(parsed_rows / (best["parse"] / 1000)) if best["parse"] else None,
+                }
+            )
+            print(
+                f"[INFO] {_case_key(case)} "
+                + " ".join(f"{phase}={value:.1f}ms" for phase, value in case["timings_ms"].items())
+                + f" rows_per_s={case['rowsPerSec']:,}"
+            )
+            cases.append(case)
+    return {
+        "format": RESULTS_FORMAT,
+        "environment": {
+            "python": platform.python_version(),
+            "openpyxl": openpyxl.__version__,
+            "platform": platform.platform(),
+            "cpuCount": os.cpu_count(),
+            "types": args.types,
+            "repeat": args.repeat,
+        },
+        "cases": cases,
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    threshold: float,
+    min_ms: float,
+) -> list[str]:
+    """Describe every phase of a matching case that regressed past both limits."""
+    baseline_cases = {_case_key(case): case for case in baseline.get("cases", [])}
+    regressions: list[str] = []
+    for case in current.get("cases", []):
+        key = _case_key(case)
+        reference = baseline_cases.get(key)
+        if reference is None:
+            print(f"[WARN] {key} not in baseline")
+            continue
+        for phase, value in case["timings_ms"].items():
+            before = reference["timings_ms"].get(phase)
+            if before is None:
+                continue
+            ratio = value / before if before else float("inf")
+            status = "ok"
+            if ratio > 1 + threshold and value - before > min_ms:
+                status = "REGRESSION"
+                regressions.append(f"{key} {phase}: {before:.1f}ms -> {value:.1f}ms ({ratio:.2f}x)")
+            print(f"[INFO] {key} {phase} {before:.1f}ms -> {value:.1f}ms ({ratio:.2f}x) {status}")
+    return regressions
+
+
+def _report_regressions(regressions: list[str], threshold: float) -> int:
+    if regressions:
+        print(f"[ERROR] {len(regressions)} regression(s) over {threshold:.0%}:", file=sys.stderr)
+        for line in regressions:
+            print(f"[ERROR]  - {line}", file=sys.stderr)
+        return 2
+    print("[SUCCESS] no regressions")
+    return 0
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the size matrix and write results JSON")
+    run_parser.add_argument("--rows", default="1000,10000,50000", help="Comma-separated rows per sheet")
+    run_parser.add_argument("--sheets", default="1,4", help="Comma-separated data sheet counts")
+    run_parser.add_argument("--columns", type=int, default=12, help="Data columns per sheet, besides the id")
+    run_parser.add_argument(
+        "--types",
+        default=",".join(DEFAULT_TYPES),
+        help="Comma-separated column types to cycle through (default: all exporter types)",
+    )
+    run_parser.add_argument("--list-len", dest="list_len", type=int, default=3, help="Items per list cell")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the best is kept")
+    run_parser.add_argument("--work-dir", dest="work_dir", help="Where workbooks are generated and reused")
+    run_parser.add_argument("--out", dest="out", required=True, help="Results JSON to write")
+    run_parser.add_argument("--baseline", dest="baseline", help="Results JSON to compare against")
+    run_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown fraction (default: 0.2)")
+    run_parser.add_argument("--min-ms", dest="min_ms", type=float, default=5.0, help="Ignore slowdowns below this")
+
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("baseline", help="Stored baseline results JSON")
+    compare_parser.add_argument("current", help="Fresh results JSON")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown fraction")
+    compare_parser.add_argument("--min-ms", dest="min_ms", type=float, default=5.0, help="Ignore slowdowns below this")
+    return parser.parse_args(argv[1:])
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    if args.command == "compare":
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+        return _report_regressions(
+            compare_results(baseline, current, threshold=args.threshold, min_ms=args.min_ms), args.threshold
+        )
+
+    unknown = sorted(set(args.types.split(",")) - set(DEFAULT_TYPES))
+    if unknown:
+        print(f"[ERROR] unsupported --types: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+    results = run_matrix(args)
+    Path(args.out).write_text(json.dumps(results, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"[SUCCESS] wrote {args.out} cases={len(results['cases'])}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        return _report_regressions(
+            compare_results(baseline, results, threshold=args.threshold, min_ms=args.min_ms), args.threshold
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Generate synthetic game_data workbooks in the exporter's 3-header-row layout.
+
+Every data sheet has a comment row, a ``name`` row and a ``type`` row, then
+``--rows`` data rows. The first column is a string id; the remaining columns
+cycle through ``--types``. A one-row ``Meta`` sheet is always included.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+from openpyxl import Workbook
+
+DEFAULT_TYPES = ("int", "float", "string", "int[]", "float[]", "string[]")
+_WORDS = ("alpha", "bravo", "keter", "euclid", "safe", "site", "panic", "agent", "node", "cell")
+
+
+def _cell(rng: random.Random, type_name: str, list_len: int) -> object:
+    if type_name == "int":
+        return rng.randint(-1000, 100_000)
+    if type_name == "float":
+        return round(rng.uniform(-100.0, 100.0), 3)
+    if type_name == "string":
+        return f"{rng.choice(_WORDS)} {rng.randint(0, 999)}"
+    base = type_name[:-2]
+    return ",".join(str(_cell(rng, base, list_len)) for _ in range(list_len))
+
+
+def write_workbook(
+    path: Path,
+    *,
+    sheets: int,
+    rows: int,
+    columns: int,
+    types: tuple[str, ...] = DEFAULT_TYPES,
+    list_len: int = 3,
+    seed: int = 1,
+) -> Path:
+    """Write a synthetic workbook and return its path. Same arguments, same cells."""
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    meta = workbook.create_sheet("Meta")
+    meta.append(["schema", "data"])
+    meta.append(["schemaVersion", "dataVersion"])
+    meta.append(["string", "string"])
+    meta.append(["0.1", f"bench-{sheets}x{rows}x{columns}"])
+
+    column_types = [types[i % len(types)] for i in range(columns)]
+    for sheet_index in range(sheets):
+        ws = workbook.create_sheet(f"Bench{sheet_index:02d}")
+        ws.append(["row id"] + [f"{type_name} column" for type_name in column_types])
+        ws.append(["id"] + [f"c{i}" for i in range(columns)])
+        ws.append(["string"] + column_types)
+        for row in range(rows):
+            ws.append([f"R{sheet_index:02d}_{row:07d}"] + [_cell(rng, t, list_len) for t in column_types])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook.save(path)
+    return path
+
+
+def run(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("out", help="Path of the .xlsx to write")
+    parser.add_argument("--sheets", type=int, default=1, help="Data sheets (besides Meta)")
+    parser.add_argument("--rows", type=int, default=1000, help="Data rows per sheet")
+    parser.add_argument("--columns", type=int, default=12, help="Data columns per sheet, besides the id")
+    parser.add_argument(
+        "--types",
+        default=",".join(DEFAULT_TYPES),
+        help="Comma-separated column types to cycle through (default: all exporter types)",
+    )
+    parser.add_argument("--list-len", dest="list_len", type=int, default=3, help="Items per list cell")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args(argv[1:])
+
+    types = tuple(item.strip() for item in args.types.split(",") if item.strip())
+    unknown = sorted(set(types) - set(DEFAULT_TYPES))
+    if unknown or not types:
+        print(f"[ERROR] unsupported --types: {', '.join(unknown) or '(empty)'}", file=sys.stderr)
+        return 1
+    path = write_workbook(
+        Path(args.out),
+        sheets=args.sheets,
+        rows=args.rows,
+        columns=args.columns,
+        types=types,
+        list_len=args.list_len,
+        seed=args.seed,
+    )
+    print(f"[SUCCESS] wrote {path} bytes={path.stat().st_size}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: rows/second through xlsx_to_json.parse_sheet, without openpyxl I/O."""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import xlsx_to_json  # noqa: E402
+
+HEADER = ("id", "count", "rate", "name", "ints", "floats", "tags", "#note")
+TYPES = ("string", "int", "float", "string", "int[]", "float[]", "string[]", "string")
+
+
+class FakeWorksheet:
+    """Just enough of openpyxl's worksheet API for parse_sheet."""
+
+    def __init__(self, title: str, rows: list[tuple]) -> None:
+        self.title = title
+        self._rows = rows
+
+    def iter_rows(self, values_only: bool = True):
+        return iter(self._rows)
+
+
+def make_rows(row_count: int) -> list[tuple]:
+    rows: list[tuple] = [(None,) * len(HEADER), HEADER, TYPES]
+    for i in range(row_count):
+        rows.append(
+            (
+                f"AN_{i:06d}",
+                i % 97,
+                (i % 13) * 0.25,
+                f" name {i % 50} ",
+                "1,2,3,4",
+                "0.5;1.5",
+                "a，b, c",
+                "ignored",
+            )
+        )
+    return rows
+
+
+def run(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="Data rows in the synthetic sheet")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions; the best one is reported")
+    args = parser.parse_args(argv[1:])
+
+    ws = FakeWorksheet("Bench", make_rows(args.rows))
+    reporter = xlsx_to_json.Reporter("WARN")
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        table, issues = xlsx_to_json.parse_sheet(ws, reporter)
+        best = min(best, time.perf_counter() - start)
+        if issues or table is None or len(table.rows) != args.rows:
+            print(f"[ERROR] unexpected parse result: issues={issues[:3]}", file=sys.stderr)
+            return 1
+    print(f"[INFO] rows={args.rows} best_s={best:.3f} rows_per_s={args.rows / best:,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv))
@@ -0,0 +1,85 @@
+"""Read-only, lazily loaded access to exported game data for Python tools.
+
+    from gamedata import open_game_data
+
+    with open_game_data() as data:           # Assets/StreamingAssets/game_data.json
+        anomalies = data["Anomalies"]        # parsed on first access, then cached
+        print(anomalies["AN_001"].name)      # O(1) id lookup, typed values
+        days = anomalies.column("baseDays")  # one list, no row dicts
+
+Works with every export xlsx_to_json.py writes: rows or columnar JSON, with
+or without interned strings, a ``--shard`` directory, or a ``--format bin``
+file, which is memory-mapped and decoded column by column.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from .sources import DEFAULT_EXPORT, BinarySource, JsonSource, ShardSource, open_source
+from .table import Row, Table, index_key
+
+__all__ = [
+    "BinarySource",
+    "GameData",
+    "JsonSource",
+    "Row",
+    "ShardSource",
+    "Table",
+    "index_key",
+    "open_game_data",
+]
+
+
+class GameData:
+    """Tables of one export, each loaded on first access and then cached."""
+
+    def __init__(self, source) -> None:
+        self.source = source
+        self._tables: dict[str, Table] = {}
+
+    @property
+    def kind(self) -> str:
+        return self.source.kind
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return self.source.meta
+
+    def table_names(self) -> list[str]:
+        return self.source.table_names()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.source.table_names()
+
+    def __getitem__(self, name: str) -> Table:
+        table = self._tables.get(name)
+        if table is None:
+            if name not in self.source.table_names():
+                raise KeyError(f"no table {name!r} in {self.source.kind} export")
+            table = self._tables[name] = self.source.load_table(name)
+        return table
+
+    def get(self, name: str) -> Table | None:
+        return self[name] if name in self else None
+
+    def close(self) -> None:
+        self._tables.clear()
+        self.source.close()
+
+    def __enter__(self) -> GameData:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def open_game_data(path: str | Path | None = None, *, prefer_siblings: bool = True) -> GameData:
+    """Open an export; ``path`` defaults to the project's game_data.json.
+
+    A .json path uses a sibling ``.bin`` or shard directory when it is at least
+    as new; pass ``prefer_siblings=False`` to always read the JSON itself.
+    """
+    if path is None:
+        path = Path(__file__).resolve().parents[2] / DEFAULT_EXPORT
+    return GameData(open_source(Path(path), prefer_siblings=prefer_siblings))
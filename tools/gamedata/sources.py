@@ -0,0 +1,187 @@
+"""Backends that find an export on disk and hand out its tables lazily."""
+from __future__ import annotations
+
+import json
+import mmap
+from itertools import accumulate
+from pathlib import Path
+from typing import Any
+
+import gamedata_bin
+
+from .table import Table
+
+DEFAULT_EXPORT = "Assets/StreamingAssets/game_data.json"
+
+
+def _resolver(pool: list[str] | None, type_name: str):
+    if pool is None or type_name not in {"string", "string[]"}:
+        return None
+    if type_name == "string":
+        return lambda value: pool[value] if isinstance(value, int) else value
+    return lambda value: [pool[item] if isinstance(item, int) else item for item in value]
+
+
+def table_from_document(name: str, raw: dict[str, Any], layout: str, pool: list[str] | None) -> Table:
+    """Wrap one table of a JSON document (rows, columnar or @series layout, optionally interned)."""
+    column_types = {column["name"]: column["type"] for column in raw["columns"]}
+    if "series" in raw:
+        series = raw["series"]
+        row_count = series["count"]
+
+        def raw_column(column: str) -> list[Any]:
+            if column == raw["idField"]:
+                return list(range(series["start"], series["start"] + row_count))
+            encoded = series["columns"][column]
+            if raw["encoding"] == "delta":
+                return list(accumulate(encoded))
+            return [value for _, length, value in encoded for _ in range(length)]
+
+    elif layout == "columnar":
+        data = raw["data"]
+        row_count = len(next(iter(data.values()), []))
+
+        def raw_column(column: str) -> list[Any]:
+            return data[column]
+
+    else:
+        rows = raw["rows"]
+        row_count = len(rows)
+
+        def raw_column(column: str) -> list[Any]:
+            return [row.get(column) for row in rows]
+
+    def load(column: str) -> list[Any]:
+        values = raw_column(column)
+        resolve = _resolver(pool, column_types[column])
+        return values if resolve is None else [resolve(value) for value in values]
+
+    return Table(name, raw["idField"], raw["columns"], row_count, load, raw.get("index"))
+
+
+class JsonSource:
+    """A single game_data.json. JSON cannot be read in pieces, so the file is parsed
+    once on first table access; each table is wrapped (and its columns built) only
+    when asked for."""
+
+    kind = "json"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._document: dict[str, Any] | None = None
+
+    def _load(self) -> dict[str, Any]:
+        if self._document is None:
+            self._document = json.loads(self.path.read_bytes())
+        return self._document
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return self._load().get("meta", {})
+
+    def table_names(self) -> list[str]:
+        return list(self._load().get("tables", {}))
+
+    def load_table(self, name: str) -> Table:
+        document = self._load()
+        return table_from_document(name, document["tables"][name], document.get("layout", "rows"), document.get("strings"))
+
+    def close(self) -> None:
+        self._document = None
+
+
+class ShardSource:
+    """A ``--shard`` directory: the manifest is read up front, each table file on first access."""
+
+    kind = "shards"
+
+    def __init__(self, shard_dir: Path) -> None:
+        self.shard_dir = shard_dir
+        self._manifest = json.loads((shard_dir / "manifest.json").read_bytes())
+        self._files = {entry["table"]: entry["file"] for entry in self._manifest.get("shards", [])}
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return self._manifest.get("meta", {})
+
+    def table_names(self) -> list[str]:
+        return list(self._files)
+
+    def load_table(self, name: str) -> Table:
+        document = json.loads((self.shard_dir / self._files[name]).read_bytes())
+        return table_from_document(name, document["tables"][name], document.get("layout", "rows"), document.get("strings"))
+
+    def close(self) -> None:
+        pass
+
+
+class BinarySource:
+    """A ``--format bin`` export, memory-mapped. Only the header is parsed up front;
+    the string table and each column are decoded from the mapping on first use."""
+
+    kind = "bin"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._header, self._body_start = gamedata_bin.read_header(self._map)
+        self._tables = {table["name"]: table for table in self._header["tables"]}
+        self._strings: list[str] | None = None
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return self._header.get("meta", {})
+
+    def table_names(self) -> list[str]:
+        return list(self._tables)
+
+    def _string_table(self) -> list[str]:
+        if self._strings is None:
+            self._strings = gamedata_bin.decode_strings(self._map, self._header, self._body_start)
+        return self._strings
+
+    def load_table(self, name: str) -> Table:
+        header = self._tables[name]
+        layouts = {column["name"]: (column, layout) for column, layout in zip(header["columns"], header["layout"])}
+        row_count = header["rowCount"]
+
+        def load(column_name: str) -> list[Any]:
+            column, layout = layouts[column_name]
+            strings = self._string_table() if column["type"].startswith("string") else []
+            return gamedata_bin.decode_column(self._map, self._body_start, column, layout, row_count, strings)
+
+        return Table(name, header["idField"], header["columns"], row_count, load, header.get("index"))
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def _newer_or_same(candidate: Path, reference: Path) -> bool:
+    return candidate.stat().st_mtime >= reference.stat().st_mtime
+
+
+def open_source(path: Path, *, prefer_siblings: bool = True):
+    """Pick a backend for ``path``: a .bin file, a shard directory (or its
+    manifest.json), or a .json file. For a .json path, a sibling .bin or shard
+    directory written at least as recently is preferred, since both load lazily."""
+    if path.is_dir():
+        return ShardSource(path)
+    if path.name == "manifest.json":
+        return ShardSource(path.parent)
+    if path.suffix == ".bin":
+        return BinarySource(path)
+    if prefer_siblings and path.exists():
+        binary = path.with_suffix(".bin")
+        if binary.exists() and _newer_or_same(binary, path):
+            return BinarySource(binary)
+        manifest = path.with_suffix("") / "manifest.json"
+        if manifest.exists() and _newer_or_same(manifest, path):
+            return ShardSource(manifest.parent)
+    if not path.exists():
+        binary, manifest = path.with_suffix(".bin"), path.with_suffix("") / "manifest.json"
+        if binary.exists():
+            return BinarySource(binary)
+        if manifest.exists():
+            return ShardSource(manifest.parent)
+    return JsonSource(path)
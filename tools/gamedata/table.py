@@ -0,0 +1,137 @@
+"""Lazily materialised tables and lightweight row views."""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterator
+
+
+def index_key(value: Any) -> str:
+    """Text form of an id or indexed value, as used by exported ``index`` sections
+    (integral floats without the fraction, like xlsx_to_json._index_key)."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class Row:
+    """View of one row: ``row["name"]`` or ``row.name`` read straight from the column lists."""
+
+    __slots__ = ("_table", "_position")
+
+    def __init__(self, table: Table, position: int) -> None:
+        self._table = table
+        self._position = position
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @property
+    def id(self) -> Any:
+        return self._table.column(self._table.id_field)[self._position]
+
+    def __getitem__(self, column: str) -> Any:
+        return self._table.column(column)[self._position]
+
+    def __getattr__(self, column: str) -> Any:
+        try:
+            return self._table.column(column)[self._position]
+        except KeyError:
+            raise AttributeError(f"{self._table.name} has no column {column!r}") from None
+
+    def get(self, column: str, default: Any = None) -> Any:
+        if column not in self._table.column_types:
+            return default
+        return self[column]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: self[name] for name in self._table.column_types}
+
+    def __repr__(self) -> str:
+        return f"Row({self._table.name}[{self.id!r}])"
+
+
+class Table:
+    """One exported table. Columns are decoded on first use and then kept.
+
+    ``column_loader(name)`` returns the full value list of a column; sources
+    supply it so a JSON, columnar, interned, sharded or binary export all look
+    the same here. ``index`` is the exported ``index`` section, if any.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        id_field: str,
+        columns: list[dict[str, str]],
+        row_count: int,
+        column_loader: Callable[[str], list[Any]],
+        index: dict[str, Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.id_field = id_field
+        self.columns = columns
+        self.column_types = {column["name"]: column["type"] for column in columns}
+        self._row_count = row_count
+        self._load_column = column_loader
+        self._columns: dict[str, list[Any]] = {}
+        self._index = index or {}
+        self._positions: dict[str, int] | None = self._index.get("id")
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def __repr__(self) -> str:
+        return f"Table({self.name!r}, rows={self._row_count}, columns={len(self.columns)})"
+
+    def column(self, name: str) -> list[Any]:
+        """All values of one column, in row order. No row objects are built."""
+        values = self._columns.get(name)
+        if values is None:
+            if name not in self.column_types:
+                raise KeyError(f"{self.name} has no column {name!r}")
+            values = self._columns[name] = self._load_column(name)
+        return values
+
+    def ids(self) -> list[Any]:
+        return self.column(self.id_field)
+
+    def _id_positions(self) -> dict[str, int]:
+        if self._positions is None:
+            self._positions = {index_key(row_id): position for position, row_id in enumerate(self.ids())}
+        return self._positions
+
+    def get(self, row_id: Any, default: Row | None = None) -> Row | None:
+        """O(1) lookup by idField value, through the exported index when there is one."""
+        position = self._id_positions().get(index_key(row_id))
+        return default if position is None else Row(self, position)
+
+    def __getitem__(self, row_id: Any) -> Row:
+        row = self.get(row_id)
+        if row is None:
+            raise KeyError(f"{self.name} has no row with {self.id_field}={row_id!r}")
+        return row
+
+    def __contains__(self, row_id: Any) -> bool:
+        return index_key(row_id) in self._id_positions()
+
+    def __iter__(self) -> Iterator[Row]:
+        return (Row(self, position) for position in range(self._row_count))
+
+    def row(self, position: int) -> Row:
+        if not 0 <= position < self._row_count:
+            raise IndexError(f"{self.name} row {position} out of range")
+        return Row(self, position)
+
+    def where(self, column: str, value: Any) -> list[Row]:
+        """Rows whose ``column`` equals ``value``; uses an exported @index when present."""
+        buckets = self._index.get("columns", {}).get(column)
+        if buckets is not None:
+            return [Row(self, position) for position in buckets.get(index_key(value), ())]
+        key = index_key(value)
+        return [
+            Row(self, position)
+            for position, cell in enumerate(self.column(column))
+            if cell is not None and index_key(cell) == key
+        ]
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Binary game-data format written by `xlsx_to_json.py --format bin`, and its decoder.
+
+Layout (little-endian)::
+
+    magic    4s   b"SCPG"
+    version  u16  FORMAT_VERSION
+    reserved u16
+    hdr_len  u32  length of the JSON header
+    header   JSON (utf-8), padded with spaces to an 8-byte boundary
+    body     column sections, each 8-byte aligned
+
+The header carries ``meta`` (schemaVersion/dataVersion), the shared string
+table location and, per table, its columns, row count, byte range and the
+location of every column section, plus the table's ``index`` section when
+the export was made with ``--index`` and its ``encoding`` for ``@series``
+sheets (their rows are stored like any other table; the narrow int columns
+already keep them small). All offsets are relative to the body.
+
+Column encodings:
+
+* ``int``/``float``: optional presence bitmap (1 bit per row, only when some
+  cell is empty) followed by one value per row. Ints use the narrowest of
+  int8/16/32/64 that fits the column; floats are float64 so values are exact.
+* ``string``: one uint32 index per row into the shared string table.
+* ``int[]``/``float[]``/``string[]``: uint32 offsets (rows + 1) into a flat
+  value array encoded as above.
+
+The shared string table is uint32 offsets (count + 1) into one utf-8 blob.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"SCPG"
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct("<4sHHI")
+ALIGN = 8
+
+_INT_TYPECODES = {1: "b", 2: "h", 4: "i", 8: "q"}
+_INT_LIMITS = [(1, -(1 << 7), (1 << 7) - 1), (2, -(1 << 15), (1 << 15) - 1), (4, -(1 << 31), (1 << 31) - 1)]
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_BIG_ENDIAN_HOST = sys.byteorder == "big"
+if array("I").itemsize != 4 or array("i").itemsize != 4:
+    raise ImportError("gamedata_bin needs 4-byte array('i') and array('I')")
+
+
+def _typed_bytes(typecode: str, values: Any) -> bytes:
+    packed = array(typecode, values)
+    if _BIG_ENDIAN_HOST:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _typed_values(typecode: str, data: bytes | memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _BIG_ENDIAN_HOST:
+        values.byteswap()
+    return values
+
+
+def _int_width(values: list[int]) -> int:
+    if not values:
+        return 1
+    low, high = min(values), max(values)
+    if low < _INT64_MIN or high > _INT64_MAX:
+        raise ValueError(f"integer out of int64 range: {low if low < _INT64_MIN else high}")
+    for width, lower, upper in _INT_LIMITS:
+        if lower <= low and high <= upper:
+            return width
+    return 8
+
+
+class _BodyWriter:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.size = 0
+
+    def add(self, data: bytes) -> int:
+        offset = self.size
+        self.chunks.append(data)
+        self.size += len(data)
+        padding = -self.size % ALIGN
+        if padding:
+            self.chunks.append(b"\0" * padding)
+            self.size += padding
+        return offset
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def ref(self, value: str) -> int:
+        ref = self.index.get(value)
+        if ref is None:
+            ref = self.index[value] = len(self.values)
+            self.values.append(value)
+        return ref
+
+
+def _encode_scalars(body: _BodyWriter, type_name: str, values: list[Any], strings: _StringTable) -> dict[str, Any]:
+    if type_name == "string":
+        return {"values": body.add(_typed_bytes("I", [strings.ref(value) for value in values]))}
+    layout: dict[str, Any] = {}
+    if any(value is None for value in values):
+        bitmap = bytearray((len(values) + 7) // 8)
+        for row, value in enumerate(values):
+            if value is not None:
+                bitmap[row >> 3] |= 1 << (row & 7)
+        layout["nulls"] = body.add(bytes(bitmap))
+        values = [0 if value is None else value for value in values]
+    if type_name == "float":
+        layout["values"] = body.add(_typed_bytes("d", values))
+    else:
+        width = _int_width(values)
+        layout["width"] = width
+        layout["values"] = body.add(_typed_bytes(_INT_TYPECODES[width], values))
+    return layout
+
+
+def _encode_column(body: _BodyWriter, type_name: str, values: list[Any], strings: _StringTable) -> dict[str, Any]:
+    if not type_name.endswith("[]"):
+        return _encode_scalars(body, type_name, values, strings)
+    offsets = [0]
+    flat: list[Any] = []
+    for items in values:
+        flat.extend(items)
+        offsets.append(len(flat))
+    layout = _encode_scalars(body, type_name[:-2], flat, strings)
+    layout["offsets"] = body.add(_typed_bytes("I", offsets))
+    layout["count"] = len(flat)
+    return layout
+
+
+def encode(meta: dict[str, Any], tables: dict[str, Any]) -> bytes:
+    """Encode exported tables (row layout, as built by xlsx_to_json.build_tables)."""
+    body = _BodyWriter()
+    strings = _StringTable()
+    table_headers: list[dict[str, Any]] = []
+    for name, table in tables.items():
+        start = body.size
+        rows = table["rows"]
+        column_layouts = []
+        for column in table["columns"]:
+            values = [row.get(column["name"]) for row in rows]
+            column_layouts.append(_encode_column(body, column["type"], values, strings))
+        table_header = {
+            "name": name,
+            "idField": table["idField"],
+            "columns": table["columns"],
+            "rowCount": len(rows),
+            "offset": start,
+            "length": body.size - start,
+            "layout": column_layouts,
+        }
+        if "index" in table:
+            table_header["index"] = table["index"]
+        if "encoding" in table:
+            table_header["encoding"] = table["encoding"]
+        table_headers.append(table_header)
+
+    encoded = [value.encode("utf-8") for value in strings.values]
+    string_offsets = [0]
+    for item in encoded:
+        string_offsets.append(string_offsets[-1] + len(item))
+    string_header = {
+        "count": len(encoded),
+        "offsets": body.add(_typed_bytes("I", string_offsets)),
+        "data": body.add(b"".join(encoded)),
+    }
+
+    header = {
+        "schemaVersion": meta.get("schemaVersion"),
+        "dataVersion": meta.get("dataVersion"),
+        "meta": meta,
+        "strings": string_header,
+        "tables": table_headers,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-(PREAMBLE.size + len(header_bytes)) % ALIGN)
+    preamble = PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(header_bytes))
+    return preamble + header_bytes + b"".join(body.chunks)
+
+
+def read_header(data: bytes | memoryview) -> tuple[dict[str, Any], int]:
+    """Return the JSON header and the absolute offset of the body."""
+    magic, version, _, header_len = PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a game-data binary (bad magic)")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported game-data binary version {version}")
+    header = json.loads(bytes(data[PREAMBLE.size : PREAMBLE.size + header_len]).decode("utf-8"))
+    return header, PREAMBLE.size + header_len
+
+
+def decode_strings(data: bytes | memoryview, header: dict[str, Any], body_start: int) -> list[str]:
+    table = header["strings"]
+    count = table["count"]
+    start = body_start + table["offsets"]
+    offsets = _typed_values("I", data[start : start + 4 * (count + 1)])
+    blob_start = body_start + table["data"]
+    blob = bytes(data[blob_start : blob_start + offsets[-1]])
+    return [blob[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(count)]
+
+
+def _decode_scalars(
+    data: bytes | memoryview,
+    body_start: int,
+    type_name: str,
+    layout: dict[str, Any],
+    count: int,
+    strings: list[str],
+) -> list[Any]:
+    start = body_start + layout["values"]
+    if type_name == "string":
+        return [strings[ref] for ref in _typed_values("I", data[start : start + 4 * count])]
+    if type_name == "float":
+        values: list[Any] = _typed_values("d", data[start : start + 8 * count]).tolist()
+    else:
+        width = layout["width"]
+        values = _typed_values(_INT_TYPECODES[width], data[start : start + width * count]).tolist()
+    if "nulls" in layout:
+        nulls_start = body_start + layout["nulls"]
+        bitmap = data[nulls_start : nulls_start + (count + 7) // 8]
+        for row in range(count):
+            if not bitmap[row >> 3] & (1 << (row & 7)):
+                values[row] = None
+    return values
+
+
+def decode_column(
+    data: bytes | memoryview,
+    body_start: int,
+    column: dict[str, str],
+    layout: dict[str, Any],
+    row_count: int,
+    strings: list[str],
+) -> list[Any]:
+    """Decode one column to a list of cell values (lists for array types)."""
+    type_name = column["type"]
+    if not type_name.endswith("[]"):
+        return _decode_scalars(data, body_start, type_name, layout, row_count, strings)
+    flat = _decode_scalars(data, body_start, type_name[:-2], layout, layout["count"], strings)
+    start = body_start + layout["offsets"]
+    offsets = _typed_values("I", data[start : start + 4 * (row_count + 1)])
+    return [flat[offsets[row] : offsets[row + 1]] for row in range(row_count)]
+
+
+def decode(data: bytes | memoryview) -> dict[str, Any]:
+    """Decode a binary export into the same ``{"meta", "tables"}`` document as the JSON export."""
+    header, body_start = read_header(data)
+    strings = decode_strings(data, header, body_start)
+    tables: dict[str, Any] = {}
+    for table in header["tables"]:
+        names = [column["name"] for column in table["columns"]]
+        columns = [
+            decode_column(data, body_start, column, layout, table["rowCount"], strings)
+            for column, layout in zip(table["columns"], table["layout"])
+        ]
+        tables[table["name"]] = {
+            "idField": table["idField"],
+            "columns": table["columns"],
+            "rows": [dict(zip(names, values)) for values in zip(*columns)] if columns else [],
+        }
+        if "index" in table:
+            tables[table["name"]]["index"] = table["index"]
+        if "encoding" in table:
+            tables[table["name"]]["encoding"] = table["encoding"]
+    return {"meta": header["meta"], "tables": tables}
+
+
+def run(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Decode a game-data binary and optionally compare it to a JSON export.")
+    parser.add_argument("path", help="Path to game_data.bin")
+    parser.add_argument("--compare", dest="compare", help="JSON export that the binary must round-trip to")
+    args = parser.parse_args(argv[1:])
+
+    data = Path(args.path).read_bytes()
+    start = time.perf_counter()
+    document = decode(data)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    rows = sum(len(table["rows"]) for table in document["tables"].values())
+    print(f"[INFO] bin_bytes={len(data)} tables={len(document['tables'])} rows={rows} decode_ms={elapsed_ms:.2f}")
+    if args.compare:
+        expected = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if expected.get("layout", "rows") != "rows":
+            print("[ERROR] --compare expects a rows-layout JSON export", file=sys.stderr)
+            return 1
+        if {"meta": expected["meta"], "tables": expected["tables"]} != document:
+            print("[ERROR] binary does not match JSON export", file=sys.stderr)
+            return 2
+        print("[SUCCESS] binary matches JSON export")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv))
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Per-table deltas between two game_data.json exports, and applying them.
+
+    xlsx_to_json.py diff OLD.json NEW.json --out delta.json
+    xlsx_to_json.py apply OLD.json delta.json --out NEW.json
+
+Rows are matched by each table's ``idField`` through dict indexes, so a diff
+is O(rows) even for 100k-row tables. A delta lists, per table, the rows
+added, the ids removed and, for changed rows, only the changed columns.
+``apply`` rebuilds the new export byte for byte: the delta records the JSON
+indentation and any row or table order that cannot be derived, and both
+commands check the sha256 of their input and output.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+DELTA_FORMAT = "game_data.delta/1"
+_MISSING = object()
+
+
+class DeltaError(Exception):
+    """Inputs cannot be diffed or the delta does not fit its base."""
+
+
+def _same_value(left: Any, right: Any) -> bool:
+    # 1 == 1.0 in Python but not in the exported bytes, so types must match too.
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, list):
+        return len(left) == len(right) and all(_same_value(a, b) for a, b in zip(left, right))
+    return left == right
+
+
+def _detect_indent(text: str) -> int | None:
+    return 2 if text.startswith("{\n  ") else None
+
+
+def _index_rows(table_name: str, table: dict[str, Any]) -> dict[Any, dict[str, Any]]:
+    id_field = table["idField"]
+    index: dict[Any, dict[str, Any]] = {}
+    for row in table["rows"]:
+        row_id = row.get(id_field)
+        if row_id in index:
+            raise DeltaError(f"{table_name} has duplicate id {row_id!r}; cannot diff")
+        index[row_id] = row
+    return index
+
+
+def _check_document(document: dict[str, Any], label: str) -> None:
+    if document.get("layout", "rows") != "rows" or "strings" in document:
+        raise DeltaError(f"{label} must be a rows-layout export without --intern-strings")
+    series = sorted(name for name, table in document.get("tables", {}).items() if "series" in table)
+    if series:
+        raise DeltaError(f"{label} has @series-encoded tables ({', '.join(series)}); export them as rows to diff")
+
+
+def _diff_table(table_name: str, old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any] | None:
+    delta: dict[str, Any] = {}
+    if old["idField"] != new["idField"]:
+        # Rows cannot be matched across a key change; ship the table whole.
+        return {"table": new}
+    if old["columns"] != new["columns"]:
+        delta["columns"] = new["columns"]
+
+    old_index = _index_rows(table_name, old)
+    new_index = _index_rows(table_name, new)
+    column_names = [column["name"] for column in new["columns"]]
+    id_field = new["idField"]
+
+    added = [row for row_id, row in new_index.items() if row_id not in old_index]
+    removed = [row_id for row_id in old_index if row_id not in new_index]
+    changed: list[list[Any]] = []
+    for row_id, new_row in new_index.items():
+        old_row = old_index.get(row_id)
+        if old_row is None:
+            continue
+        columns = {
+            name: new_row[name]
+            for name in column_names
+            if not _same_value(old_row.get(name, _MISSING), new_row.get(name, _MISSING))
+        }
+        if columns:
+            changed.append([row_id, columns])
+    if added:
+        delta["addedRows"] = added
+    if removed:
+        delta["removedIds"] = removed
+    if changed:
+        delta["changedRows"] = changed
+
+    # Default order after apply: surviving old rows in old order, then additions.
+    removed_ids = set(removed)
+    expected_order = [row_id for row_id in old_index if row_id not in removed_ids]
+    expected_order.extend(row[id_field] for row in added)
+    new_order = list(new_index)
+    if expected_order != new_order:
+        # --index exports keep rows sorted by id; say so instead of listing every id.
+        if new_order == sorted(new_order):
+            delta["sortById"] = True
+        else:
+            delta["order"] = new_order
+    if old.get("index") != new.get("index"):
+        delta["index"] = new.get("index")
+    return delta or None
+
+
+def diff_documents(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Build a delta that turns ``old`` into ``new`` (both loaded game_data documents)."""
+    _check_document(old, "old export")
+    _check_document(new, "new export")
+    old_tables = old.get("tables", {})
+    new_tables = new.get("tables", {})
+    delta: dict[str, Any] = {"format": DELTA_FORMAT}
+    if old.get("meta") != new.get("meta"):
+        delta["meta"] = new.get("meta", {})
+    tables: dict[str, Any] = {}
+    for name, table in new_tables.items():
+        if name not in old_tables:
+            tables[name] = {"table": table}
+            continue
+        table_delta = _diff_table(name, old_tables[name], table)
+        if table_delta is not None:
+            tables[name] = table_delta
+    for name in old_tables:
+        if name not in new_tables:
+            tables[name] = {"removedTable": True}
+    delta["tables"] = tables
+    expected_order = [name for name in old_tables if name in new_tables]
+    expected_order.extend(name for name in new_tables if name not in old_tables)
+    if expected_order != list(new_tables):
+        delta["tableOrder"] = list(new_tables)
+    return delta
+
+
+def _apply_table(table_name: str, old: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    if "table" in delta:
+        return delta["table"]
+    columns = delta.get("columns", old["columns"])
+    id_field = old["idField"]
+    rows = _index_rows(table_name, old)
+    for row_id in delta.get("removedIds", []):
+        if rows.pop(row_id, None) is None:
+            raise DeltaError(f"{table_name}: removed id {row_id!r} not in base")
+    for row_id, changes in delta.get("changedRows", []):
+        row = rows.get(row_id)
+        if row is None:
+            raise DeltaError(f"{table_name}: changed id {row_id!r} not in base")
+        rows[row_id] = {**row, **changes}
+    for row in delta.get("addedRows", []):
+        if row[id_field] in rows:
+            raise DeltaError(f"{table_name}: added id {row[id_field]!r} already in base")
+        rows[row[id_field]] = row
+    order = sorted(rows) if delta.get("sortById") else delta.get("order", list(rows))
+    column_names = [column["name"] for column in columns]
+    table = {
+        "idField": id_field,
+        "columns": columns,
+        "rows": [{name: rows[row_id][name] for name in column_names} for row_id in order],
+    }
+    index = delta["index"] if "index" in delta else old.get("index")
+    if index is not None:
+        table["index"] = index
+    return table
+
+
+def apply_delta(old: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """Return the document ``delta`` describes, given the ``old`` document it was made from."""
+    if delta.get("format") != DELTA_FORMAT:
+        raise DeltaError(f"unsupported delta format {delta.get('format')!r}")
+    _check_document(old, "base export")
+    old_tables = old.get("tables", {})
+    table_deltas = delta.get("tables", {})
+    tables: dict[str, Any] = {}
+    for name, table in old_tables.items():
+        table_delta = table_deltas.get(name)
+        if table_delta is None:
+            tables[name] = table
+        elif not table_delta.get("removedTable"):
+            tables[name] = _apply_table(name, table, table_delta)
+    for name, table_delta in table_deltas.items():
+        if name not in old_tables:
+            if "table" not in table_delta:
+                raise DeltaError(f"{name}: table not in base and delta does not add it")
+            tables[name] = table_delta["table"]
+    if "tableOrder" in delta:
+        tables = {name: tables[name] for name in delta["tableOrder"]}
+    return {"meta": delta.get("meta", old.get("meta", {})), "tables": tables}
+
+
+def render(document: dict[str, Any], indent: int | None) -> bytes:
+    return json.dumps(document, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def summarize(delta: dict[str, Any]) -> list[str]:
+    lines: list[str] = []
+    if "meta" in delta:
+        lines.append(f"meta -> {json.dumps(delta['meta'], ensure_ascii=False)}")
+    for name, table_delta in delta.get("tables", {}).items():
+        if table_delta.get("removedTable"):
+            lines.append(f"table={name} removed")
+        elif "table" in table_delta:
+            lines.append(f"table={name} replaced rows={len(table_delta['table']['rows'])}")
+        else:
+            changed_columns = sorted({column for _, columns in table_delta.get("changedRows", []) for column in columns})
+            lines.append(
+                f"table={name} added={len(table_delta.get('addedRows', []))} "
+                f"removed={len(table_delta.get('removedIds', []))} "
+                f"changed={len(table_delta.get('changedRows', []))} "
+                f"columns={','.join(changed_columns) or '-'}"
+                + (" schema=changed" if "columns" in table_delta else "")
+                + (" reordered" if "order" in table_delta or "sortById" in table_delta else "")
+                + (" index=changed" if "index" in table_delta else "")
+            )
+    return lines
+
+
+def _load(path: Path) -> tuple[bytes, dict[str, Any]]:
+    data = path.read_bytes()
+    return data, json.loads(data.decode("utf-8"))
+
+
+def run_diff(args: argparse.Namespace) -> int:
+    old_bytes, old = _load(Path(args.old))
+    new_bytes, new = _load(Path(args.new))
+    delta = diff_documents(old, new)
+    delta["indent"] = _detect_indent(new_bytes.decode("utf-8"))
+    delta["base"] = hashlib.sha256(old_bytes).hexdigest()
+    delta["target"] = hashlib.sha256(new_bytes).hexdigest()
+    if render(apply_delta(old, delta), delta["indent"]) != new_bytes:
+        raise DeltaError("new export is not in canonical exporter form; apply could not rebuild it exactly")
+
+    for line in summarize(delta) or ["no changes"]:
+        print(f"[INFO] {line}")
+    delta_bytes = json.dumps(delta, ensure_ascii=False, indent=None if args.no_pretty else 2).encode("utf-8")
+    if args.out:
+        Path(args.out).write_bytes(delta_bytes)
+        print(f"[SUCCESS] delta_bytes={len(delta_bytes)} out={args.out}")
+    else:
+        sys.stdout.write(delta_bytes.decode("utf-8") + "\n")
+    return 0
+
+
+def run_apply(args: argparse.Namespace) -> int:
+    old_bytes, old = _load(Path(args.old))
+    _, delta = _load(Path(args.delta))
+    if delta.get("base") and hashlib.sha256(old_bytes).hexdigest() != delta["base"]:
+        raise DeltaError(f"{args.old} is not the export this delta was made from")
+    new_bytes = render(apply_delta(old, delta), delta.get("indent"))
+    if delta.get("target") and hashlib.sha256(new_bytes).hexdigest() != delta["target"]:
+        raise DeltaError("rebuilt export does not match the delta's target hash")
+    Path(args.out).write_bytes(new_bytes)
+    print(f"[SUCCESS] out_bytes={len(new_bytes)} out={args.out}")
+    return 0
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    diff_parser = commands.add_parser("diff", help="Write the delta between two exports")
+    diff_parser.add_argument("old", help="Previous export, e.g. GameData/Published/game_data.json")
+    diff_parser.add_argument("new", help="Fresh export")
+    diff_parser.add_argument("--out", dest="out", help="Delta file to write (default: stdout)")
+    diff_parser.add_argument(
+        "--no-pretty",
+        dest="no_pretty",
+        action="store_true",
+        help="Emit compact JSON instead of pretty-printed JSON.",
+    )
+    apply_parser = commands.add_parser("apply", help="Rebuild the new export from the old one and a delta")
+    apply_parser.add_argument("old", help="Export the delta was made from")
+    apply_parser.add_argument("delta", help="Delta file written by diff")
+    apply_parser.add_argument("--out", dest="out", required=True, help="Path for the rebuilt export")
+    return parser.parse_args(argv[1:])
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    try:
+        if args.command == "diff":
+            return run_diff(args)
+        return run_apply(args)
+    except (OSError, ValueError, KeyError, DeltaError) as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv))
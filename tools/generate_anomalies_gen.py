@@ -1,6 +1,41 @@
 #!/usr/bin/env python3
-"""Generate 500-day AnomaliesGen data with pacing rules."""
+"""Generate AnomaliesGen data with pacing rules.
 
+The schedule is computed for the whole horizon at once with NumPy. Every
+pacing rule (base tiers, the wave, spike and cooldown windows, clamping) is
+data: the built-in defaults below can be overridden per key from the
+workbook's Balance sheet (keys prefixed ``AnomaliesGen``, values in ``p1``)
+or from a JSON file passed with ``--rules``:
+
+    Balance key                  p1 (int[])            meaning
+    AnomaliesGenHorizon          500                   number of days
+    AnomaliesGenTierStarts       1,81,201,321,421      first day of each base tier
+    AnomaliesGenTierValues       1,2,3,4,5             base value of each tier
+    AnomaliesGenWavePeriod       20                    wave cycle length
+    AnomaliesGenWaveStarts       1,9,15,19             first cycle day of each wave step
+    AnomaliesGenWaveValues       0,1,0,-1              modifier of each wave step
+    AnomaliesGenSpikeStarts      90,160,...            spike window starts
+    AnomaliesGenSpikeEnds        96,166,...            spike window ends (inclusive)
+    AnomaliesGenSpikeBonus       3                     added during spikes
+    AnomaliesGenCooldownStarts   97,167,...            cooldown window starts (forced 0)
+    AnomaliesGenCooldownEnds     100,170,...           cooldown window ends (inclusive)
+    AnomaliesGenWindowRepeat     0                     repeat spike/cooldown windows every N days (0 = off)
+    AnomaliesGenClamp            0,8                   min,max after spikes
+
+In a JSON rules file the keys drop the prefix and start lower-case
+(``{"horizon": 10000, "windowRepeat": 480}``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Any, Iterable, Sequence
+
+import numpy as np
 from openpyxl import load_workbook
 
 # Cooldown periods - spawnCount MUST be 0
@@ -23,146 +58,413 @@ SPIKE_WEEKS = [
     (450, 458),
 ]
 
+SERIES_SHEET = "AnomaliesGen"
+SERIES_COLUMNS = ("day", "AnomaliesGenNum")
+DATA_START_ROW = 4
+BALANCE_SHEET = "Balance"
+BALANCE_PREFIX = "AnomaliesGen"
+LIST_SPLIT_PATTERN = re.compile(r"[;,，]")
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleRules:
+    """Pacing rules for AnomaliesGenNum. Windows are inclusive day ranges."""
+
+    horizon: int = 500
+    tier_starts: tuple[int, ...] = (1, 81, 201, 321, 421)
+    tier_values: tuple[int, ...] = (1, 2, 3, 4, 5)
+    wave_period: int = 20
+    wave_starts: tuple[int, ...] = (1, 9, 15, 19)
+    wave_values: tuple[int, ...] = (0, 1, 0, -1)
+    spike_starts: tuple[int, ...] = tuple(start for start, _ in SPIKE_WEEKS)
+    spike_ends: tuple[int, ...] = tuple(end for _, end in SPIKE_WEEKS)
+    spike_bonus: int = 3
+    cooldown_starts: tuple[int, ...] = tuple(start for start, _ in COOLDOWN_PERIODS)
+    cooldown_ends: tuple[int, ...] = tuple(end for _, end in COOLDOWN_PERIODS)
+    window_repeat: int = 0
+    clamp: tuple[int, int] = (0, 8)
+
+    def validate(self) -> ScheduleRules:
+        def ascending(name: str, values: tuple[int, ...]) -> None:
+            if any(later <= earlier for earlier, later in zip(values, values[1:])):
+                raise ValueError(f"{name} must be strictly ascending: {list(values)}")
+
+        if self.horizon < 1:
+            raise ValueError(f"horizon must be >= 1, got {self.horizon}")
+        if not self.tier_starts or self.tier_starts[0] != 1:
+            raise ValueError("tierStarts must begin at day 1")
+        if len(self.tier_starts) != len(self.tier_values):
+            raise ValueError("tierStarts and tierValues must have the same length")
+        ascending("tierStarts", self.tier_starts)
+        if self.wave_period < 1:
+            raise ValueError(f"wavePeriod must be >= 1, got {self.wave_period}")
+        if not self.wave_starts or self.wave_starts[0] != 1 or self.wave_starts[-1] > self.wave_period:
+            raise ValueError(f"waveStarts must begin at 1 and stay within wavePeriod {self.wave_period}")
+        if len(self.wave_starts) != len(self.wave_values):
+            raise ValueError("waveStarts and waveValues must have the same length")
+        ascending("waveStarts", self.wave_starts)
+        for kind, starts, ends in (
+            ("spike", self.spike_starts, self.spike_ends),
+            ("cooldown", self.cooldown_starts, self.cooldown_ends),
+        ):
+            if len(starts) != len(ends):
+                raise ValueError(f"{kind}Starts and {kind}Ends must have the same length")
+            bad = [(start, end) for start, end in zip(starts, ends) if start < 1 or end < start]
+            if bad:
+                raise ValueError(f"invalid {kind} windows: {bad}")
+        if self.window_repeat < 0:
+            raise ValueError(f"windowRepeat must be >= 0, got {self.window_repeat}")
+        if len(self.clamp) != 2 or self.clamp[0] > self.clamp[1]:
+            raise ValueError(f"clamp must be min,max, got {list(self.clamp)}")
+        return self
+
+    def spike_windows(self) -> list[tuple[int, int]]:
+        return _expand_windows(self.spike_starts, self.spike_ends, self.window_repeat, self.horizon)
+
+    def cooldown_windows(self) -> list[tuple[int, int]]:
+        return _expand_windows(self.cooldown_starts, self.cooldown_ends, self.window_repeat, self.horizon)
+
+
+DEFAULT_RULES = ScheduleRules()
+
+_SCALAR_FIELDS = {"horizon", "wave_period", "spike_bonus", "window_repeat"}
+
+
+def _rule_key(field_name: str) -> str:
+    head, *rest = field_name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+RULE_KEYS = {_rule_key(item.name): item.name for item in fields(ScheduleRules)}
+
+
+def rules_from_mapping(values: dict[str, Any], base: ScheduleRules = DEFAULT_RULES) -> ScheduleRules:
+    """Override ``base`` with ``{"tierStarts": [...], "horizon": 500, ...}``."""
+    changes: dict[str, Any] = {}
+    for key, value in values.items():
+        name = RULE_KEYS.get(key)
+        if name is None:
+            raise ValueError(f"unknown AnomaliesGen rule {key!r}; expected one of {sorted(RULE_KEYS)}")
+        items = tuple(int(item) for item in (value if isinstance(value, (list, tuple)) else [value]))
+        if name in _SCALAR_FIELDS:
+            if len(items) != 1:
+                raise ValueError(f"rule {key!r} takes a single value, got {list(items)}")
+            changes[name] = items[0]
+        else:
+            changes[name] = items
+    return replace(base, **changes).validate()
+
+
+def _split_ints(value: Any) -> list[int]:
+    if isinstance(value, (int, float)):
+        return [int(value)]
+    return [int(float(part)) for part in LIST_SPLIT_PATTERN.split(str(value)) if part.strip()]
+
+
+def rules_from_workbook(wb, base: ScheduleRules = DEFAULT_RULES) -> ScheduleRules:
+    """Apply ``AnomaliesGen*`` rows of the Balance sheet (key in column 1, p1 in column 2)."""
+    if BALANCE_SHEET not in wb.sheetnames:
+        return base
+    values: dict[str, list[int]] = {}
+    for row in wb[BALANCE_SHEET].iter_rows(min_row=4, max_col=2, values_only=True):
+        key = str(row[0]).strip() if row and row[0] is not None else ""
+        if key.startswith(BALANCE_PREFIX) and len(row) > 1 and row[1] not in (None, ""):
+            suffix = key[len(BALANCE_PREFIX):]
+            values[suffix[:1].lower() + suffix[1:]] = _split_ints(row[1])
+    return rules_from_mapping(values, base) if values else base
+
+
+def _window_bounds(starts: Sequence[int], ends: Sequence[int], repeat: int, horizon: int) -> np.ndarray:
+    """(n, 2) inclusive windows clipped to the horizon, repeated every ``repeat`` days when set."""
+    starts_array = np.asarray(starts, dtype=np.int64)
+    ends_array = np.asarray(ends, dtype=np.int64)
+    if repeat:
+        offsets = np.arange(0, horizon, repeat, dtype=np.int64)[:, None]
+        starts_array = (starts_array[None, :] + offsets).ravel()
+        ends_array = (ends_array[None, :] + offsets).ravel()
+    keep = starts_array <= horizon
+    return np.column_stack([starts_array[keep], np.minimum(ends_array[keep], horizon)])
+
+
+def _expand_windows(
+    starts: Sequence[int], ends: Sequence[int], repeat: int, horizon: int
+) -> list[tuple[int, int]]:
+    """Sorted (start, end) windows for reporting."""
+    bounds = _window_bounds(starts, ends, repeat, horizon)
+    bounds = bounds[np.argsort(bounds[:, 0], kind="stable")]
+    return list(zip(bounds[:, 0].tolist(), bounds[:, 1].tolist()))
+
+
+def _stacked_steps(steps: list[tuple[Sequence[int], Sequence[int]]], width: int) -> np.ndarray:
+    """Step functions of several variants as one (variants, width) int32 array.
+
+    ``steps[i]`` holds 1-based start positions and the value from each start on.
+    Each step is scattered as a +delta into one difference array, so a single
+    cumsum builds every row.
+    """
+    lengths = [len(starts) for starts, _ in steps]
+    rows = np.repeat(np.arange(len(steps)), lengths)
+    starts = np.concatenate([np.asarray(starts, dtype=np.int64) for starts, _ in steps])
+    values = np.concatenate([np.asarray(values, dtype=np.int32) for _, values in steps])
+    first = np.cumsum(lengths) - lengths
+    deltas = np.diff(values, prepend=0)
+    deltas[first] = values[first]
+    # Steps starting past the last column never take effect; dropping them (rather than
+    # clamping them onto the last day) keeps a short horizon a prefix of a longer one.
+    inside = starts <= width
+    edges = np.zeros((len(steps), width), dtype=np.int32)
+    np.add.at(edges, (rows[inside], starts[inside] - 1), deltas[inside])
+    return np.cumsum(edges, axis=1, dtype=np.int32)
+
+
+def _window_masks(windows: list[np.ndarray], horizon: int) -> np.ndarray:
+    """Boolean (variants, horizon) masks of day windows, built from a difference array."""
+    rows = np.repeat(np.arange(len(windows)), [len(bounds) for bounds in windows])
+    bounds = np.concatenate(windows) if windows else np.zeros((0, 2), dtype=np.int64)
+    edges = np.zeros((len(windows), horizon + 1), dtype=np.int16)
+    np.add.at(edges, (rows, bounds[:, 0] - 1), 1)
+    np.add.at(edges, (rows, bounds[:, 1]), -1)
+    return np.cumsum(edges, axis=1, dtype=np.int16)[:, :horizon] > 0
+
+
+def _tiled_waves(variants: list[ScheduleRules], horizon: int) -> np.ndarray:
+    """Wave modifiers over the horizon: one cycle per variant, tiled per distinct period."""
+    periods = np.asarray([rules.wave_period for rules in variants])
+    cycles = _stacked_steps([(rules.wave_starts, rules.wave_values) for rules in variants], int(periods.max()))
+    wave = np.empty((len(variants), horizon), dtype=np.int32)
+    for period in np.unique(periods).tolist():
+        rows = np.flatnonzero(periods == period)
+        wave[rows] = np.tile(cycles[rows, :period], (1, -(-horizon // period)))[:, :horizon]
+    return wave
+
+
+def compute_schedules(variants: Iterable[ScheduleRules], horizon: int | None = None) -> np.ndarray:
+    """Schedules of several rule variants as one (variants, horizon) int32 array.
 
-def get_base_value(day: int) -> int:
-    """Get base spawn count for a day."""
-    if 1 <= day <= 80:
-        return 1
-    elif 81 <= day <= 200:
-        return 2
-    elif 201 <= day <= 320:
-        return 3
-    elif 321 <= day <= 420:
-        return 4
-    else:  # 421-500
-        return 5
-
-
-def get_wave_modifier(day: int) -> int:
-    """Get wave modifier based on 20-day cycle."""
-    cycle_day = ((day - 1) % 20) + 1
-    if 1 <= cycle_day <= 8:
-        return 0
-    elif 9 <= cycle_day <= 14:
-        return 1
-    elif 15 <= cycle_day <= 18:
-        return 0
-    else:  # 19-20
-        return -1
-
-
-def is_in_range(day: int, ranges: list[tuple[int, int]]) -> bool:
-    """Check if day is in any of the given ranges."""
-    return any(start <= day <= end for start, end in ranges)
-
-
-def calculate_spawn_count(day: int) -> int:
-    """Calculate spawn count for a given day."""
+    Column 0 is day 1. Without ``horizon`` every variant must share the same one.
+    All variants are evaluated together: tiers and windows are difference
+    arrays, so the per-variant Python work is only gathering rule values.
+    """
+    variants = list(variants)
+    if horizon is None:
+        horizons = {variant.horizon for variant in variants}
+        if len(horizons) > 1:
+            raise ValueError(f"variants have different horizons {sorted(horizons)}; pass horizon=")
+        horizon = horizons.pop() if horizons else 0
+    if not variants or horizon < 1:
+        return np.zeros((len(variants), max(horizon, 0)), dtype=np.int32)
+
+    def column(values: list[int]) -> np.ndarray:
+        return np.asarray(values, dtype=np.int32)[:, None]
+
+    counts = _stacked_steps([(rules.tier_starts, rules.tier_values) for rules in variants], horizon)
+    counts += _tiled_waves(variants, horizon)
+    spikes = _window_masks(
+        [_window_bounds(r.spike_starts, r.spike_ends, r.window_repeat, horizon) for r in variants], horizon
+    )
+    counts += spikes * column([rules.spike_bonus for rules in variants])
+    np.clip(
+        counts,
+        column([rules.clamp[0] for rules in variants]),
+        column([rules.clamp[1] for rules in variants]),
+        out=counts,
+    )
     # Cooldown has highest priority
-    if is_in_range(day, COOLDOWN_PERIODS):
-        return 0
-    
-    # Calculate base + wave + spike
-    base = get_base_value(day)
-    wave = get_wave_modifier(day)
-    spike = 3 if is_in_range(day, SPIKE_WEEKS) else 0
-    
-    # Clamp to [0, 8]
-    result = base + wave + spike
-    return max(0, min(8, result))
-
-
-def generate_data():
-    """Generate 500 days of data."""
-    data = []
-    for day in range(1, 501):
-        spawn_count = calculate_spawn_count(day)
-        data.append((day, spawn_count))
-    return data
-
-
-def update_excel(xlsx_path: str):
-    """Update the AnomaliesGen sheet with generated data."""
+    cooldowns = _window_masks(
+        [_window_bounds(r.cooldown_starts, r.cooldown_ends, r.window_repeat, horizon) for r in variants], horizon
+    )
+    counts[cooldowns] = 0
+    return counts
+
+
+def compute_schedule(rules: ScheduleRules = DEFAULT_RULES, horizon: int | None = None) -> np.ndarray:
+    """AnomaliesGenNum for days 1..horizon as one int array (index 0 is day 1)."""
+    return compute_schedules([rules], rules.horizon if horizon is None else horizon)[0]
+
+
+def generate_data(rules: ScheduleRules = DEFAULT_RULES):
+    """Generate (day, spawnCount) rows for the rules' horizon."""
+    counts = compute_schedule(rules)
+    return list(zip(range(1, len(counts) + 1), counts.tolist()))
+
+
+def _series_columns(header: tuple[Any, ...]) -> tuple[int, int]:
+    """1-based (day, AnomaliesGenNum) columns from the name row; A and B when absent."""
+    names = [str(value).strip() if value is not None else "" for value in header]
+    if all(name in names for name in SERIES_COLUMNS):
+        return tuple(names.index(name) + 1 for name in SERIES_COLUMNS)
+    return 1, 2
+
+
+def _same_cell(current: Any, expected: int) -> bool:
+    return isinstance(current, (int, float)) and not isinstance(current, bool) and current == expected
+
+
+def diff_series(existing: list[tuple[Any, Any]], data) -> tuple[list[tuple[int, int, int]], int | None]:
+    """Cells to write as (sheet row, series slot, value), and the first stale row to drop.
+
+    ``existing`` holds the (day, AnomaliesGenNum) cells of the data rows; rows past
+    the generated series that still hold values are stale.
+    """
+    changes: list[tuple[int, int, int]] = []
+    for offset, expected in enumerate(data):
+        current = existing[offset] if offset < len(existing) else (None, None)
+        for slot in (0, 1):
+            if not _same_cell(current[slot], expected[slot]):
+                changes.append((DATA_START_ROW + offset, slot, expected[slot]))
+    tail = existing[len(data):]
+    stale = any(value is not None for row in tail for value in row)
+    return changes, DATA_START_ROW + len(data) if stale else None
+
+
+def update_excel(xlsx_path: str, rules: ScheduleRules | None = None, overrides: dict[str, Any] | None = None):
+    """Update the AnomaliesGen sheet with generated data.
+
+    Without ``rules`` the workbook's Balance sheet overrides the defaults;
+    ``overrides`` (JSON rules) are applied last. The current rows are read in
+    read-only mode and diffed against the new series; only changed cells are
+    written, and the workbook is not saved at all when nothing changed.
+    """
+    started = time.perf_counter()
     print(f"Loading workbook: {xlsx_path}")
-    wb = load_workbook(xlsx_path)
-    
-    if 'AnomaliesGen' not in wb.sheetnames:
-        raise ValueError("AnomaliesGen sheet not found!")
-    
-    ws = wb['AnomaliesGen']
-    
+    wb = load_workbook(xlsx_path, read_only=True)
+    try:
+        if SERIES_SHEET not in wb.sheetnames:
+            raise ValueError("AnomaliesGen sheet not found!")
+        ws = wb[SERIES_SHEET]
+        if rules is None:
+            rules = rules_from_workbook(wb)
+        names = next(ws.iter_rows(min_row=2, max_row=2, values_only=True), ())
+        columns = _series_columns(names)
+        existing = [
+            (row[columns[0] - 1], row[columns[1] - 1])
+            for row in ws.iter_rows(min_row=DATA_START_ROW, max_col=max(columns), values_only=True)
+        ]
+    finally:
+        wb.close()
+    if overrides:
+        rules = rules_from_mapping(overrides, rules)
+
     # Generate data
-    print("Generating 500-day data...")
-    data = generate_data()
-    
-    # Clear existing data rows (keep headers in rows 1-3)
-    print("Clearing existing data rows...")
-    ws.delete_rows(4, ws.max_row - 3)
-    
-    # Write new data
-    print("Writing new data...")
-    for day, spawn_count in data:
-        ws.append([day, spawn_count])
-    
+    print(f"Generating {rules.horizon}-day data...")
+    data = generate_data(rules)
+
+    changes, stale_from = diff_series(existing, data)
+    stale_cells = 0
+    if stale_from is not None:
+        stale_cells = sum(value is not None for row in existing[len(data):] for value in row)
+    if not changes and stale_from is None:
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"AnomaliesGen is up to date: 0 cells touched, workbook not saved ({elapsed:.1f} ms)")
+        return data, rules
+
+    print(f"Writing {len(changes)} changed cells...")
+    wb = load_workbook(xlsx_path)
+    ws = wb[SERIES_SHEET]
+    for row, slot, value in changes:
+        ws.cell(row=row, column=columns[slot], value=value)
+    if stale_from is not None:
+        # Rows past the new horizon are dropped, as a shorter schedule should leave none behind.
+        print(f"Removing {ws.max_row - stale_from + 1} stale rows...")
+        ws.delete_rows(stale_from, ws.max_row - stale_from + 1)
+
     # Save workbook
     print(f"Saving workbook...")
     wb.save(xlsx_path)
-    print("Done!")
-    
-    return data
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"Done! {len(changes) + stale_cells} cells touched in {elapsed:.1f} ms")
+
+    return data, rules
+
 
+def _counts_array(data) -> np.ndarray:
+    array = np.asarray(data, dtype=np.int64)
+    # (day, spawnCount) rows from generate_data, or the counts themselves.
+    return array[:, 1] if array.ndim == 2 else array
 
-def calculate_statistics(data):
+
+def _window_reduce(ufunc: np.ufunc, values: np.ndarray, windows: list[tuple[int, int]]) -> np.ndarray:
+    """``ufunc.reduce`` over each inclusive day window, in one reduceat call."""
+    bounds = np.asarray(windows, dtype=np.int64).reshape(-1, 2)
+    # Pairs (start-1, end) slice each window; the odd slots are the gaps in between.
+    padded = np.append(values, values[:1])
+    return ufunc.reduceat(padded, np.column_stack([bounds[:, 0] - 1, bounds[:, 1]]).ravel())[::2]
+
+
+def calculate_statistics(data, rules: ScheduleRules = DEFAULT_RULES, segment: int = 50):
     """Calculate and print statistics."""
+    counts = _counts_array(data)
+    horizon = len(counts)
     print("\n=== Statistics ===")
-    
-    # Average spawn count per 50-day segment
-    print("\nAverage spawn count per 50-day segment:")
-    for i in range(0, 500, 50):
-        segment = data[i:i+50]
-        avg = sum(spawn for _, spawn in segment) / len(segment)
-        print(f"  Days {i+1}-{i+50}: {avg:.2f}")
-    
+
+    # Average spawn count per segment
+    print(f"\nAverage spawn count per {segment}-day segment:")
+    starts = np.arange(0, horizon, segment)
+    averages = np.add.reduceat(counts, starts) / np.diff(np.append(starts, horizon))
+    for start, avg in zip(starts.tolist(), averages.tolist()):
+        print(f"  Days {start + 1}-{min(start + segment, horizon)}: {avg:.2f}")
+
     # Peak spawn counts during spike weeks
+    spike_windows = _expand_windows(rules.spike_starts, rules.spike_ends, rules.window_repeat, horizon)
     print("\nPeak spawn counts during spike weeks:")
-    for start, end in SPIKE_WEEKS:
-        segment = [(day, spawn) for day, spawn in data if start <= day <= end]
-        max_spawn = max(spawn for _, spawn in segment)
-        print(f"  Days {start}-{end}: {max_spawn}")
-    
+    if spike_windows:
+        peaks = _window_reduce(np.maximum, counts, spike_windows)
+        for (start, end), peak in zip(spike_windows, peaks.tolist()):
+            print(f"  Days {start}-{end}: {peak}")
+
     # Verify cooldown periods are all 0
+    cooldown_windows = _expand_windows(rules.cooldown_starts, rules.cooldown_ends, rules.window_repeat, horizon)
     print("\nCooldown period verification:")
     all_zero = True
-    for start, end in COOLDOWN_PERIODS:
-        segment = [(day, spawn) for day, spawn in data if start <= day <= end]
-        non_zero = [day for day, spawn in segment if spawn != 0]
-        if non_zero:
-            print(f"  Days {start}-{end}: ERROR - Non-zero days: {non_zero}")
-            all_zero = False
-        else:
-            print(f"  Days {start}-{end}: OK (all 0)")
-    
+    if cooldown_windows:
+        non_zero_counts = _window_reduce(np.add, (counts != 0).astype(np.int64), cooldown_windows)
+        for (start, end), non_zero_count in zip(cooldown_windows, non_zero_counts.tolist()):
+            if non_zero_count:
+                non_zero = (np.flatnonzero(counts[start - 1:end]) + start).tolist()
+                print(f"  Days {start}-{end}: ERROR - Non-zero days: {non_zero}")
+                all_zero = False
+            else:
+                print(f"  Days {start}-{end}: OK (all 0)")
+
     if all_zero:
         print("\n✓ All cooldown periods verified as 0")
     else:
         print("\n✗ Some cooldown periods have non-zero values!")
-    
+
     # Overall statistics
-    total_spawns = sum(spawn for _, spawn in data)
-    avg_overall = total_spawns / len(data)
-    max_spawn = max(spawn for _, spawn in data)
+    total_spawns = int(counts.sum())
+    avg_overall = total_spawns / horizon
+    max_spawn = int(counts.max())
     print(f"\nOverall statistics:")
     print(f"  Total spawns: {total_spawns}")
     print(f"  Average per day: {avg_overall:.2f}")
     print(f"  Maximum spawn count: {max_spawn}")
 
 
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate the AnomaliesGen sheet from pacing rules.")
+    parser.add_argument("xlsx", nargs="?", default="GameData/Local/game_data.xlsx", help="Workbook to update")
+    parser.add_argument("--rules", help="JSON file overriding rules on top of the workbook's Balance sheet")
+    parser.add_argument("--horizon", type=int, help="Override the number of days to generate")
+    parser.add_argument("--dry-run", action="store_true", help="Compute and print statistics without writing")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    import sys
-    
-    xlsx_path = "GameData/Local/game_data.xlsx"
-    if len(sys.argv) > 1:
-        xlsx_path = sys.argv[1]
-    
-    data = update_excel(xlsx_path)
-    calculate_statistics(data)
+    args = parse_args()
+
+    overrides: dict[str, Any] = {}
+    if args.rules:
+        with open(args.rules, "r", encoding="utf-8") as stream:
+            overrides.update(json.load(stream))
+    if args.horizon is not None:
+        overrides["horizon"] = args.horizon
+
+    if args.dry_run:
+        rules = rules_from_mapping(overrides, rules_from_workbook(load_workbook(args.xlsx, read_only=True)))
+        started = time.perf_counter()
+        data = compute_schedule(rules)
+        print(f"Computed {rules.horizon}-day schedule in {(time.perf_counter() - started) * 1000:.1f} ms")
+    else:
+        data, rules = update_excel(args.xlsx, overrides=overrides)
+    calculate_statistics(data, rules)
@@ -1,15 +1,53 @@
 #!/usr/bin/env python3
 """
 Generate comprehensive SCP Foundation-style narratives for all events and options.
+
+Events, their options and each option's EffectOps are read from the exported
+game data (``--data``, default the project's game_data.json; ``--events``
+still accepts an events-with-effects JSON). Generation is deterministic: each
+event gets its own ``random.Random`` seeded from a hash of its eventDefId,
+anomaly and options' operations. Narratives are cached under that hash in
+``--cache``, so only events whose effects changed are regenerated, and those
+are spread over a process pool when there are many of them.
+
+Every narrative, cached or regenerated, is then diffed against the workbook's
+Events and EventOptions sheets through id -> row indexes (rows keyed by
+eventDefId, and by eventDefId + optionId), so a reverted or replaced workbook
+is brought back in line. Only the title/desc/text/resultText cells that differ
+are written, the workbook is saved once, and not at all when nothing changed.
+Both sheets keep the 3-row header layout (comment, name, type; data from row 4).
 """
 
+import argparse
+import hashlib
 import json
-import pandas as pd
+import os
 import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from openpyxl import load_workbook
+
+from gamedata import open_game_data
 
-# Load events with effects analysis
-with open('/tmp/full_events_with_effects.json', 'r', encoding='utf-8') as f:
-    events_data = json.load(f)
+DEFAULT_XLSX = 'GameData/Local/game_data.xlsx'
+DEFAULT_CACHE = 'GameData/.cache/generate_narratives.json'
+NAME_ROW = 2
+DATA_START_ROW = 4
+# Bump when the vocabulary or generators change, so every cached narrative is rebuilt.
+NARRATIVE_VERSION = 1
+CACHE_FORMAT = 'generate_narratives.cache/1'
+# Below this many events to generate, a process pool costs more than it saves.
+POOL_MIN_EVENTS = 200
+
+# sheet -> (key columns, narrative columns)
+NARRATIVE_SHEETS = {
+    'Events': (('eventDefId',), ('title', 'desc')),
+    'EventOptions': (('eventDefId', 'optionId'), ('text', 'resultText')),
+}
 
 # SCP-style vocabulary pools
 TITLES = {
@@ -108,7 +146,7 @@ def generate_event_title(event_id, anomaly_name, effects_summary):
     else:
         return title_base[:12]
 
-def generate_event_desc(event_id, anomaly_name, anomaly_id, effects_summary):
+def generate_event_desc(event_id, anomaly_name, anomaly_id, effects_summary, rng):
     """Generate event description with specific details"""
     details = []
     event_num = int(event_id.split('_')[1])
@@ -127,18 +165,18 @@ def generate_event_desc(event_id, anomaly_name, anomaly_id, effects_summary):
     
     # Specific details
     specific_details = [
-        f"出现{random.randint(2, 8)}次{random.choice(PHENOMENA)}",
-        f"检测到{random.choice(PHENOMENA)}，持续{random.randint(5, 120)}秒",
-        f"的休谟指数下降至基准值的{random.randint(60, 95)}%",
-        f"表现出非预期的{random.choice(PHENOMENA)}特征",
-        f"周围{random.randint(1, 5)}名D级人员出现{random.choice(['幻视', '记忆错乱', '认知障碍', '生理异常', '精神污染'])}症状",
-        f"导致{random.choice(EQUIPMENT)}负荷达到{random.randint(75, 98)}%",
-        f"引发的{random.choice(PHENOMENA)}范围扩大了{random.uniform(0.5, 5):.1f}平方米",
-        f"使{random.randint(2, 12)}件标准设备出现异常",
-        f"触发了{random.randint(2, 7)}处独立监测点的警报系统",
-        f"造成局部区域{random.choice(['时间流速差异', '空间扭曲', '物理常数偏移', '因果链断裂'])}",
-        f"的{random.choice(['能量输出', '异常指数', '危险等级', '扩散速度'])}增加{random.randint(15, 85)}%",
-        f"生成了{random.randint(3, 15)}份异常数据记录"
+        f"出现{rng.randint(2, 8)}次{rng.choice(PHENOMENA)}",
+        f"检测到{rng.choice(PHENOMENA)}，持续{rng.randint(5, 120)}秒",
+        f"的休谟指数下降至基准值的{rng.randint(60, 95)}%",
+        f"表现出非预期的{rng.choice(PHENOMENA)}特征",
+        f"周围{rng.randint(1, 5)}名D级人员出现{rng.choice(['幻视', '记忆错乱', '认知障碍', '生理异常', '精神污染'])}症状",
+        f"导致{rng.choice(EQUIPMENT)}负荷达到{rng.randint(75, 98)}%",
+        f"引发的{rng.choice(PHENOMENA)}范围扩大了{rng.uniform(0.5, 5):.1f}平方米",
+        f"使{rng.randint(2, 12)}件标准设备出现异常",
+        f"触发了{rng.randint(2, 7)}处独立监测点的警报系统",
+        f"造成局部区域{rng.choice(['时间流速差异', '空间扭曲', '物理常数偏移', '因果链断裂'])}",
+        f"的{rng.choice(['能量输出', '异常指数', '危险等级', '扩散速度'])}增加{rng.randint(15, 85)}%",
+        f"生成了{rng.randint(3, 15)}份异常数据记录"
     ]
     
     detail = specific_details[event_num % len(specific_details)]
@@ -195,7 +233,7 @@ def generate_option_text(option_id, effects):
     
     return text[:10]  # Limit to 10 characters
 
-def generate_result_text(option_id, effects):
+def generate_result_text(option_id, effects, rng):
     """Generate result text based on effects"""
     parts = []
     
@@ -207,7 +245,7 @@ def generate_result_text(option_id, effects):
             f"处置效率提升{int(effects['progress_gain']*100)}%",
             f"工作完成度增加{int(effects['progress_gain']*100)}%"
         ]
-        parts.append(random.choice(progress_outcomes))
+        parts.append(rng.choice(progress_outcomes))
     elif effects['progress_loss'] > 0:
         parts.append(f"进度受阻，延后{int(effects['progress_loss']*100)}%")
     
@@ -225,7 +263,7 @@ def generate_result_text(option_id, effects):
             f"需启动信息控制协议",
             f"触发舆情监控机制"
         ]
-        parts.append(random.choice(panic_outcomes))
+        parts.append(rng.choice(panic_outcomes))
     elif effects['panic_loss'] > 0:
         parts.append("成功稳定局势")
     
@@ -256,105 +294,298 @@ def generate_result_text(option_id, effects):
     
     return result[:25]  # Limit to 25 characters
 
-# Generate narratives for all events
-print("Generating narratives for all events and options...")
+def _blank(value):
+    return value is None or str(value).strip() in ('', 'ANY')
+
+
+def load_events(data):
+    """Events with their options' EffectOps, in the shape the generators take:
+    ``[{eventDefId, anomaly: {id, name}, options: [{optionId, operations: [...]}]}]``."""
+    missing = [name for name in ('Events', 'EventOptions') if name not in data]
+    if missing:
+        raise ValueError(f"export has no {', '.join(missing)} table(s); export the workbook with event sheets first")
 
-event_narratives = {}
-option_narratives = {}
+    operations = {}
+    effect_ops = data.get('EffectOps')
+    if effect_ops is not None:
+        for row in effect_ops:
+            operations.setdefault(row.get('effectId'), []).append({
+                'statKey': row.get('statKey') or '',
+                'op': row.get('op') or 'Add',
+                'value': row.get('value') or 0,
+            })
 
-for event in events_data:
+    options = {}
+    for row in data['EventOptions']:
+        options.setdefault(row.get('eventDefId'), []).append({
+            'optionId': row.get('optionId'),
+            'operations': operations.get(row.get('effectId'), []),
+        })
+
+    anomalies = data.get('Anomalies')
+    events = []
+    for row in data['Events']:
+        event_id = row.id
+        anomaly_id = row.get('requiresAnomalyId')
+        event = {'eventDefId': event_id, 'options': options.get(event_id, [])}
+        if not _blank(anomaly_id):
+            anomaly = anomalies.get(anomaly_id) if anomalies is not None else None
+            event['anomaly'] = {'id': anomaly_id, 'name': anomaly.name if anomaly is not None else anomaly_id}
+        events.append(event)
+    return events
+
+
+def event_hash(event):
+    """Stable hash of everything an event's narrative depends on."""
+    payload = {
+        'version': NARRATIVE_VERSION,
+        'eventDefId': event['eventDefId'],
+        'anomaly': event.get('anomaly', {}),
+        'options': [[opt['optionId'], opt['operations']] for opt in event['options']],
+    }
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def narrate_event(event, digest):
+    """Title/desc and option texts of one event, from an RNG seeded by its hash."""
+    rng = random.Random(int(digest[:16], 16))
     event_id = event['eventDefId']
     anomaly = event.get('anomaly', {})
     anomaly_name = anomaly.get('name', '未知异常')
     anomaly_id = anomaly.get('id', 'AN-XXX')
-    
+
     # Analyze all options for this event to understand overall effects
-    all_effects = []
-    for opt in event['options']:
-        effects = analyze_effects(opt['operations'])
-        all_effects.append(effects)
-    
-    # Generate event title and desc
-    title = generate_event_title(event_id, anomaly_name, all_effects)
-    desc = generate_event_desc(event_id, anomaly_name, anomaly_id, all_effects)
-    
-    event_narratives[event_id] = {
-        'title': title,
-        'desc': desc
+    all_effects = [analyze_effects(opt['operations']) for opt in event['options']]
+    return {
+        'hash': digest,
+        'title': generate_event_title(event_id, anomaly_name, all_effects),
+        'desc': generate_event_desc(event_id, anomaly_name, anomaly_id, all_effects, rng),
+        'options': {
+            opt['optionId']: {
+                'text': generate_option_text(opt['optionId'], effects),
+                'resultText': generate_result_text(opt['optionId'], effects, rng),
+            }
+            for opt, effects in zip(event['options'], all_effects)
+        },
     }
-    
-    # Generate option narratives
-    for opt in event['options']:
-        option_id = opt['optionId']
-        effects = analyze_effects(opt['operations'])
-        
-        text = generate_option_text(option_id, effects)
-        result_text = generate_result_text(option_id, effects)
-        
-        option_narratives[option_id] = {
-            'text': text,
-            'resultText': result_text
-        }
-
-print(f"Generated {len(event_narratives)} event narratives")
-print(f"Generated {len(option_narratives)} option narratives")
-
-# Load Excel file
-print("\nLoading Excel file...")
-xl_path = 'GameData/Local/game_data.xlsx'
-xl = pd.ExcelFile(xl_path)
-events_df = pd.read_excel(xl, 'Events')
-options_df = pd.read_excel(xl, 'EventOptions')
-
-print(f"Events sheet: {len(events_df)} rows")
-print(f"EventOptions sheet: {len(options_df)} rows")
-
-# Update Events sheet
-print("\nUpdating Events sheet...")
-updated_count = 0
-for idx, row in events_df.iterrows():
-    if idx < 2:  # Skip header rows
-        continue
-    
-    event_id = row['eventDefId']
-    if event_id in event_narratives:
-        events_df.at[idx, 'title'] = event_narratives[event_id]['title']
-        events_df.at[idx, 'desc'] = event_narratives[event_id]['desc']
-        updated_count += 1
-
-print(f"Updated {updated_count} events")
-
-# Update EventOptions sheet
-print("\nUpdating EventOptions sheet...")
-updated_count = 0
-for idx, row in options_df.iterrows():
-    option_id = row['optionId']
-    if pd.notna(option_id) and option_id in option_narratives:
-        options_df.at[idx, 'text'] = option_narratives[option_id]['text']
-        options_df.at[idx, 'resultText'] = option_narratives[option_id]['resultText']
-        updated_count += 1
-
-print(f"Updated {updated_count} options")
-
-# Save back to Excel
-print("\nSaving updated Excel file...")
-with pd.ExcelWriter(xl_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-    events_df.to_excel(writer, sheet_name='Events', index=False)
-    options_df.to_excel(writer, sheet_name='EventOptions', index=False)
-
-print("✓ Excel file updated successfully!")
-
-# Show samples
-print("\n=== Sample Event ===")
-sample_event = events_df[events_df['eventDefId'] == 'EV_001'].iloc[0]
-print(f"ID: {sample_event['eventDefId']}")
-print(f"Title: {sample_event['title']}")
-print(f"Desc: {sample_event['desc']}")
-
-print("\n=== Sample Options ===")
-sample_opts = options_df[options_df['eventDefId'] == 'EV_001']
-for _, opt in sample_opts.iterrows():
-    print(f"ID: {opt['optionId']}")
-    print(f"Text: {opt['text']}")
-    print(f"Result: {opt['resultText']}")
-    print()
+
+
+def load_cache(path):
+    try:
+        document = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if document.get('format') != CACHE_FORMAT:
+        return {}
+    return document.get('events', {})
+
+
+def store_cache(path, entries):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps({'format': CACHE_FORMAT, 'events': entries}, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def build_narratives(events_data, cache=None, jobs=1):
+    """Narratives of every event, reusing ``cache`` entries whose hash still matches.
+
+    Returns ({eventDefId: entry}, [eventDefIds regenerated]); an entry holds
+    the hash, title, desc and {optionId: {text, resultText}}.
+    """
+    cache = cache or {}
+    entries = {}
+    pending = []
+    for event in events_data:
+        digest = event_hash(event)
+        cached = cache.get(event['eventDefId'])
+        if cached is not None and cached.get('hash') == digest:
+            entries[event['eventDefId']] = cached
+        else:
+            pending.append((event, digest))
+
+    if jobs > 1 and len(pending) >= POOL_MIN_EVENTS:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunksize = max(1, len(pending) // (jobs * 4))
+            generated = list(pool.map(narrate_event, *zip(*pending), chunksize=chunksize))
+    else:
+        generated = [narrate_event(event, digest) for event, digest in pending]
+    for (event, _), entry in zip(pending, generated):
+        entries[event['eventDefId']] = entry
+    return entries, [event['eventDefId'] for event, _ in pending]
+
+
+def sheet_narratives(entries):
+    """Split cache entries into the per-sheet maps update_excel diffs."""
+    event_narratives = {}
+    option_narratives = {}
+    for event_id, entry in entries.items():
+        event_narratives[event_id] = {'title': entry['title'], 'desc': entry['desc']}
+        for option_id, texts in entry['options'].items():
+            option_narratives[(event_id, option_id)] = dict(texts)
+    return event_narratives, option_narratives
+
+
+def _cell_text(value: Any) -> str:
+    return '' if value is None else str(value).strip()
+
+
+def index_sheet(ws, key_fields, value_fields):
+    """Map each data row's key to (sheet row, {field: current value}).
+
+    Returns the 1-based column of every named field and the index. Blank keys
+    are skipped; a duplicated key keeps its first row, as the runtime does.
+    """
+    names = [_cell_text(value) for value in next(ws.iter_rows(min_row=NAME_ROW, max_row=NAME_ROW, values_only=True), ())]
+    missing = [field for field in (*key_fields, *value_fields) if field not in names]
+    if missing:
+        raise ValueError(f"{ws.title} sheet has no column(s) {', '.join(missing)}")
+    columns = {field: names.index(field) + 1 for field in (*key_fields, *value_fields)}
+
+    index = {}
+    last_column = max(columns.values())
+    for row_number, row in enumerate(ws.iter_rows(min_row=DATA_START_ROW, max_col=last_column, values_only=True), DATA_START_ROW):
+        key_parts = tuple(_cell_text(row[columns[field] - 1]) for field in key_fields)
+        if not all(key_parts):
+            continue
+        key = key_parts[0] if len(key_parts) == 1 else key_parts
+        if key not in index:
+            index[key] = (row_number, {field: row[columns[field] - 1] for field in value_fields})
+    return columns, index
+
+
+def diff_narratives(columns, index, narratives):
+    """Cells to write as (sheet row, column, value), plus the narrative keys with no sheet row."""
+    changes = []
+    unmatched = []
+    for key, texts in narratives.items():
+        entry = index.get(key)
+        if entry is None:
+            unmatched.append(key)
+            continue
+        row_number, current = entry
+        for field, value in texts.items():
+            if current.get(field) != value:
+                changes.append((row_number, columns[field], value))
+    return changes, unmatched
+
+
+def update_excel(xlsx_path, event_narratives, option_narratives, dry_run=False):
+    """Write changed narrative cells into the Events and EventOptions sheets.
+
+    The sheets are indexed in read-only mode first; the workbook is only
+    loaded for writing, and saved once, when at least one cell differs.
+    Returns {sheet: cells changed}.
+    """
+    started = time.perf_counter()
+    narratives_by_sheet = {'Events': event_narratives, 'EventOptions': option_narratives}
+    print(f"Loading workbook: {xlsx_path}")
+    wb = load_workbook(xlsx_path, read_only=True)
+    try:
+        changes_by_sheet = {}
+        for sheet, (key_fields, value_fields) in NARRATIVE_SHEETS.items():
+            if sheet not in wb.sheetnames:
+                raise ValueError(f"{sheet} sheet not found!")
+            columns, index = index_sheet(wb[sheet], key_fields, value_fields)
+            changes, unmatched = diff_narratives(columns, index, narratives_by_sheet[sheet])
+            changes_by_sheet[sheet] = changes
+            print(f"{sheet}: {len(index)} rows indexed, {len(changes)} cells to change")
+            if unmatched:
+                shown = ', '.join(str(key) for key in unmatched[:5])
+                print(f"  {len(unmatched)} generated narratives have no {sheet} row (e.g. {shown})")
+    finally:
+        wb.close()
+
+    counts = {sheet: len(changes) for sheet, changes in changes_by_sheet.items()}
+    total = sum(counts.values())
+    if total == 0 or dry_run:
+        elapsed = (time.perf_counter() - started) * 1000
+        reason = 'dry run' if dry_run and total else 'up to date'
+        print(f"Narratives {reason}: {total} cells changed, workbook not saved ({elapsed:.1f} ms)")
+        return counts
+
+    wb = load_workbook(xlsx_path)
+    for sheet, changes in changes_by_sheet.items():
+        ws = wb[sheet]
+        for row_number, column, value in changes:
+            ws.cell(row=row_number, column=column, value=value)
+    print("Saving workbook...")
+    wb.save(xlsx_path)
+    elapsed = (time.perf_counter() - started) * 1000
+    detail = ', '.join(f"{sheet} {count}" for sheet, count in counts.items())
+    print(f"Done! {total} cells changed ({detail}) in {elapsed:.1f} ms")
+    return counts
+
+
+def print_samples(event_narratives, option_narratives, event_id=None):
+    if not event_narratives:
+        return
+    event_id = event_id if event_id in event_narratives else next(iter(event_narratives))
+    print("\n=== Sample Event ===")
+    print(f"ID: {event_id}")
+    print(f"Title: {event_narratives[event_id]['title']}")
+    print(f"Desc: {event_narratives[event_id]['desc']}")
+
+    print("\n=== Sample Options ===")
+    for (owner, option_id), texts in option_narratives.items():
+        if owner != event_id:
+            continue
+        print(f"ID: {option_id}")
+        print(f"Text: {texts['text']}")
+        print(f"Result: {texts['resultText']}")
+        print()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate event and option narratives into the game data workbook.")
+    parser.add_argument("xlsx", nargs="?", default=DEFAULT_XLSX, help="Workbook to update")
+    parser.add_argument("--data", help="Exported game data to read events from (default: the project's game_data.json)")
+    parser.add_argument("--events", help="Read an events-with-effects JSON instead of the exported game data")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Narrative cache keyed by event hash")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", help="Regenerate every event, ignoring the cache")
+    # Kept so existing invocations still parse; every narrative is diffed against the workbook now.
+    parser.add_argument("--all", dest="write_all", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for generation")
+    parser.add_argument("--dry-run", action="store_true", help="Report the cells that would change without saving")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        if args.events:
+            with open(args.events, 'r', encoding='utf-8') as f:
+                events_data = json.load(f)
+        else:
+            with open_game_data(args.data) as data:
+                events_data = load_events(data)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    print("Generating narratives for all events and options...")
+    started = time.perf_counter()
+    cache = {} if args.no_cache else load_cache(args.cache)
+    entries, regenerated = build_narratives(events_data, cache, args.jobs)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{len(regenerated)} of {len(entries)} events regenerated, {len(entries) - len(regenerated)} from cache ({elapsed:.1f} ms)")
+
+    event_narratives, option_narratives = sheet_narratives(entries)
+    if event_narratives:
+        try:
+            update_excel(args.xlsx, event_narratives, option_narratives, dry_run=args.dry_run)
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 1
+    else:
+        print("No events to narrate; workbook not opened")
+    if not args.dry_run and (regenerated or len(entries) != len(cache)):
+        store_cache(args.cache, entries)
+    print_samples(event_narratives, option_narratives, 'EV_001')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""Daily loop of the headless balance simulator, vectorised across runs.
+
+Every array has the runs on axis 0, so one NumPy call advances a whole batch
+of independent games by one step. The loop follows the Unity day pipeline
+where it exists and the Balance sheet's intent where the C# side is still a
+stub:
+
+* spawn: each day ``AnomaliesGen`` asks for N anomalies. Like
+  ``AnomalySpawnSystem.GenerateScheduled``, up to ``max(10, 6N)`` attempts
+  draw a random anomaly def, skip defs already present, and place the new
+  anomaly on a random city.
+* work: ``agents`` agents work uncontained anomalies oldest first, at most
+  ``AnomalySlotsMax`` on one. Containing an anomaly takes ``baseDays``
+  agent-days per phase (investigate, contain). A contained anomaly gives
+  ``ContainReliefFixed`` panic relief once.
+* behaviour: every uncontained anomaly removes ``actPeopleKill`` population
+  from its city and adds ``worldPanicPerDayUncontained`` world panic.
+* economy: each city yields ``int(population * PopToMoneyRate)``. Wages
+  (``WagePerAgentPerDay``) and the ``maintenanceCostPerDay`` of every
+  contained anomaly (``ContainedAnomalyMaintenanceDefault`` when unset) are
+  paid from it.
+* decay: panic falls by ``WorldPanicDecayPerSafeNodePerDay`` for every city
+  with no uncontained anomaly. Money and panic are then clamped by
+  ``ClampMoneyMin`` and ``ClampWorldPanicMin``.
+* loss: a run ends on the first day panic reaches ``WorldPanicFailThreshold``.
+  Its money and panic stay frozen from then on.
+
+City count, population and agent count live in the Unity scene, not in the
+exported data, so they are parameters here.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+
+# Balance keys the model reads, with the fallbacks DataRegistry uses when a row is missing.
+# The fallback's type also picks the reader: int keys go through GetBalanceInt, float keys
+# through GetBalanceFloat (matching GameController where it reads the key at all).
+BALANCE_DEFAULTS: dict[str, float] = {
+    "StartMoney": 0,
+    "StartWorldPanic": 0.0,
+    "PopToMoneyRate": 0.0,
+    "WagePerAgentPerDay": 0,
+    "ContainedAnomalyMaintenanceDefault": 0,
+    "WorldPanicFailThreshold": 100,
+    "ContainReliefFixed": 0,
+    "WorldPanicDecayPerSafeNodePerDay": 0.0,
+    "ClampWorldPanicMin": 0.0,
+    "ClampMoneyMin": 0,
+    "AnomalySlotsMax": 5,
+}
+
+
+def _first(row, column: str, convert) -> Any:
+    for value in (row.get(column) or [])[:1]:
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def balance_int(table, key: str, fallback: int) -> int:
+    """DataRegistry.GetBalanceInt: p1 (int[]), else p2 (float[]) rounded like Mathf.RoundToInt, else p3 parsed."""
+    if table is None or key not in table:
+        return fallback
+    row = table[key]
+    for column, convert in (("p1", int), ("p2", lambda value: round(float(value))), ("p3", int)):
+        value = _first(row, column, convert)
+        if value is not None:
+            return value
+    return fallback
+
+
+def balance_float(table, key: str, fallback: float) -> float:
+    """DataRegistry.GetBalanceFloat: p2 (float[]), else p1 (int[]), else p3 parsed."""
+    if table is None or key not in table:
+        return fallback
+    row = table[key]
+    for column in ("p2", "p1", "p3"):
+        value = _first(row, column, float)
+        if value is not None:
+            return value
+    return fallback
+
+
+def balance_value(table, key: str, fallback: float) -> float:
+    """Read ``key`` with balance_int or balance_float, chosen by the type of ``fallback``."""
+    if isinstance(fallback, int):
+        return balance_int(table, key, fallback)
+    return balance_float(table, key, fallback)
+
+
+@dataclass(frozen=True, slots=True)
+class SimParams:
+    """Everything one batch needs; plain arrays and numbers, so it pickles cheaply to workers."""
+
+    schedule: np.ndarray
+    anomaly_ids: tuple[str, ...]
+    panic_per_day: np.ndarray
+    work_days: np.ndarray
+    maintenance: np.ndarray
+    people_kill: np.ndarray
+    balance: dict[str, float]
+    agents: int = 3
+    cities: int = 6
+    population: int = 10000
+    phases: int = 2
+    days: int = 500
+
+    def with_balance(self, overrides: dict[str, float]) -> SimParams:
+        unknown = sorted(set(overrides) - set(BALANCE_DEFAULTS))
+        if unknown:
+            raise ValueError(f"unknown Balance keys {unknown}; the simulator reads {sorted(BALANCE_DEFAULTS)}")
+        return replace(self, balance={**self.balance, **overrides})
+
+
+def load_params(data, **scene: Any) -> SimParams:
+    """Build SimParams from an open ``gamedata.GameData`` export plus scene-side values."""
+    balance_table = data.get("Balance")
+    balance = {key: balance_value(balance_table, key, fallback) for key, fallback in BALANCE_DEFAULTS.items()}
+    anomalies = data["Anomalies"]
+    gen = data["AnomaliesGen"]
+    days = gen.column("day")
+    counts = gen.column("AnomaliesGenNum")
+    horizon = max((day for day in days if day is not None), default=0)
+    schedule = np.zeros(horizon, dtype=np.int64)
+    for day, count in zip(days, counts):
+        if day is not None and day >= 1 and count:
+            # GetAnomaliesGenNumForDay sums the positive rows of a day.
+            schedule[day - 1] += max(0, count)
+
+    def column(name: str, dtype) -> np.ndarray:
+        return np.asarray([value or 0 for value in anomalies.column(name)], dtype=dtype)
+
+    params = SimParams(
+        schedule=schedule,
+        anomaly_ids=tuple(str(row_id) for row_id in anomalies.ids()),
+        panic_per_day=column("worldPanicPerDayUncontained", np.float64),
+        # SettlementUtil treats a missing or non-positive baseDays as 1.
+        work_days=np.maximum(column("baseDays", np.int64), 1),
+        maintenance=column("maintenanceCostPerDay", np.int64),
+        people_kill=np.maximum(column("actPeopleKill", np.int64), 0),
+        balance=balance,
+    )
+    return replace(params, **scene) if scene else params
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Per-run trajectories of one batch: (runs, days) money and panic, and the day each run failed (0 = survived)."""
+
+    money: np.ndarray
+    panic: np.ndarray
+    fail_day: np.ndarray
+    spawned: np.ndarray
+
+
+class _BatchState:
+    """Anomalies of every run, stored by spawn order (slot k is a run's k-th spawn), so
+    "oldest first" is simply left to right. Daily rates are kept as running totals and
+    only touched when an anomaly spawns or is contained."""
+
+    def __init__(self, params: SimParams, runs: int) -> None:
+        defs = len(params.anomaly_ids)
+        self.params = params
+        self.rows = np.arange(runs)
+        self.present = np.zeros((runs, defs), dtype=bool)
+        self.spawned = np.zeros(runs, dtype=np.int64)
+        self.slot_def = np.zeros((runs, defs), dtype=np.int64)
+        self.slot_city = np.zeros((runs, defs), dtype=np.int64)
+        self.slot_active = np.zeros((runs, defs), dtype=bool)
+        self.slot_remaining = np.zeros((runs, defs), dtype=np.int32)
+        self.panic_rate = np.zeros(runs, dtype=np.float64)
+        self.maintenance = np.zeros(runs, dtype=np.float64)
+        self.kills = np.zeros((runs, params.cities), dtype=np.int64)
+        default_maintenance = params.balance["ContainedAnomalyMaintenanceDefault"]
+        self.maintenance_cost = np.where(params.maintenance > 0, params.maintenance, default_maintenance)
+        self.threats = np.zeros((runs, params.cities), dtype=np.int64)
+        # Slots left of ``oldest`` are filled and finished in every live run; work scans from there.
+        self.oldest = 0
+
+    def spawn(self, rng: np.random.Generator, requested: int, alive: np.ndarray) -> None:
+        params, rows, present = self.params, self.rows, self.present
+        runs, defs = present.shape
+        today = np.zeros(runs, dtype=np.int64)
+        wanting = alive & (self.spawned < defs)
+        for _ in range(max(10, requested * 6)):
+            if not wanting.any():
+                break
+            pick = rng.integers(defs, size=runs)
+            city = rng.integers(params.cities, size=runs)
+            hit = wanting & ~present[rows, pick]
+            if not hit.any():
+                continue
+            hit_rows, hit_defs, hit_cities = rows[hit], pick[hit], city[hit]
+            slots = self.spawned[hit]
+            present[hit_rows, hit_defs] = True
+            self.slot_def[hit_rows, slots] = hit_defs
+            self.slot_city[hit_rows, slots] = hit_cities
+            self.slot_active[hit_rows, slots] = True
+            self.slot_remaining[hit_rows, slots] = params.work_days[hit_defs] * params.phases
+            self.panic_rate[hit_rows] += params.panic_per_day[hit_defs]
+            np.add.at(self.kills, (hit_rows, hit_cities), params.people_kill[hit_defs])
+            np.add.at(self.threats, (hit_rows, hit_cities), 1)
+            self.spawned[hit] += 1
+            today[hit] += 1
+            wanting &= (today < requested) & (self.spawned < defs)
+
+    def work(self, alive: np.ndarray) -> np.ndarray:
+        """Spend one day of agent work; returns how many anomalies each run contained."""
+        params = self.params
+        width = int(self.spawned.max())
+        filled = int(self.spawned[alive].min()) if alive.any() else width
+        while self.oldest < filled and not self.slot_active[:, self.oldest].any():
+            self.oldest += 1
+        if self.oldest == width:
+            return np.zeros(len(self.rows), dtype=np.int64)
+        active = self.slot_active[:, self.oldest:width]
+        remaining = self.slot_remaining[:, self.oldest:width]
+        slots = max(1, int(params.balance["AnomalySlotsMax"]))
+        demand = np.where(active, np.minimum(remaining, slots), 0).astype(np.int32)
+        before = np.cumsum(demand, axis=1, dtype=np.int32) - demand
+        remaining -= np.minimum(np.maximum(params.agents - before, 0), demand)
+        contained = active & (remaining <= 0)
+        active &= ~contained
+        hit_rows, hit_slots = np.nonzero(contained)
+        hit_slots += self.oldest
+        if len(hit_rows):
+            hit_defs = self.slot_def[hit_rows, hit_slots]
+            hit_cities = self.slot_city[hit_rows, hit_slots]
+            np.subtract.at(self.panic_rate, hit_rows, params.panic_per_day[hit_defs])
+            np.add.at(self.maintenance, hit_rows, self.maintenance_cost[hit_defs])
+            np.subtract.at(self.kills, (hit_rows, hit_cities), params.people_kill[hit_defs])
+            np.subtract.at(self.threats, (hit_rows, hit_cities), 1)
+        return np.bincount(hit_rows, minlength=len(self.rows))
+
+    def retire(self, failed: np.ndarray) -> None:
+        """Stop tracking the anomalies of failed runs; their results are frozen anyway."""
+        self.slot_active[failed] = False
+
+
+def simulate_batch(params: SimParams, runs: int, seed: np.random.SeedSequence | int) -> BatchResult:
+    """Run ``runs`` independent games for ``params.days`` days with one generator."""
+    rng = np.random.default_rng(seed)
+    days = params.days
+    balance = params.balance
+    cities = params.cities
+    threshold = balance["WorldPanicFailThreshold"]
+    rate = balance["PopToMoneyRate"]
+    upkeep = balance["WagePerAgentPerDay"] * params.agents
+    decay = balance["WorldPanicDecayPerSafeNodePerDay"]
+    relief = balance["ContainReliefFixed"]
+    money_min = balance["ClampMoneyMin"]
+    panic_min = balance["ClampWorldPanicMin"]
+
+    state = _BatchState(params, runs)
+    population = np.full((runs, cities), params.population, dtype=np.int64)
+    money = np.full(runs, max(money_min, balance["StartMoney"]), dtype=np.float64)
+    panic = np.full(runs, max(panic_min, balance["StartWorldPanic"]), dtype=np.float64)
+    alive = np.ones(runs, dtype=bool)
+    fail_day = np.zeros(runs, dtype=np.int64)
+
+    money_out = np.empty((runs, days), dtype=np.float64)
+    panic_out = np.empty((runs, days), dtype=np.float32)
+    for day in range(1, days + 1):
+        requested = int(params.schedule[day - 1]) if day <= len(params.schedule) else 0
+        if requested > 0:
+            state.spawn(rng, requested, alive)
+        contained = state.work(alive)
+
+        population = np.maximum(population - state.kills, 0)
+        income = np.floor(population * rate).sum(axis=1)
+        new_money = np.maximum(money + income - upkeep - state.maintenance, money_min)
+        safe_cities = (state.threats == 0).sum(axis=1)
+        new_panic = np.maximum(panic + state.panic_rate - relief * contained - decay * safe_cities, panic_min)
+        money = np.where(alive, new_money, money)
+        panic = np.where(alive, new_panic, panic)
+
+        failed = alive & (panic >= threshold)
+        fail_day[failed] = day
+        alive &= ~failed
+        if failed.any():
+            state.retire(failed)
+        money_out[:, day - 1] = money
+        panic_out[:, day - 1] = panic
+    return BatchResult(money=money_out, panic=panic_out, fail_day=fail_day, spawned=state.spawned)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Monte Carlo balance runs over an exported game_data.json, no Unity needed.
+
+    simulate.py --runs 4000 --out sim.json
+    simulate.py --sweep WorldPanicFailThreshold=60,80,100 --sweep AnomalySlotsMax=3,5
+    simulate.py --set StartMoney=1000 --schedule-rules fast_ramp.json --jobs 4
+
+Each variant (the export's Balance values, plus one point of the ``--sweep``
+grid and any ``--set`` overrides) runs ``--runs`` seeded games of ``--days``
+days. Runs are split into chunks of ``--chunk`` that are simulated
+vectorised (see model.py) on a process pool. Chunk seeds come from
+``--seed`` alone, so results do not depend on ``--jobs``, and every variant
+sees the same random draws, so differences between variants come from the
+parameters, not from noise.
+
+The report gives each variant's per-day survival curve, the spread of fail
+days, and per-day percentiles of money and world panic.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gamedata import open_game_data  # noqa: E402
+from model import BALANCE_DEFAULTS, BatchResult, SimParams, load_params, simulate_batch  # noqa: E402
+
+REPORT_FORMAT = "scp.sim/1"
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _number(text: str) -> float:
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+def _assignment(text: str) -> tuple[str, str]:
+    key, sep, value = text.partition("=")
+    if not sep or not key.strip() or not value.strip():
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {text!r}")
+    key = key.strip()
+    if key not in BALANCE_DEFAULTS:
+        raise argparse.ArgumentTypeError(f"unknown Balance key {key!r}; the simulator reads {', '.join(BALANCE_DEFAULTS)}")
+    return key, value.strip()
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(item) for item in text.split(",") if item.strip()]
+
+
+def build_variants(sets: list[tuple[str, str]], sweeps: list[tuple[str, str]]) -> list[tuple[str, dict[str, float]]]:
+    """(name, Balance overrides) for every point of the sweep grid, ``--set`` applied to all of them."""
+    fixed = {key: _number(value) for key, value in sets}
+    axes = [(key, [_number(item) for item in value.split(",") if item.strip()]) for key, value in sweeps]
+    if not axes:
+        return [("base", fixed)]
+    variants = []
+    for point in itertools.product(*(values for _, values in axes)):
+        overrides = {**fixed, **{key: value for (key, _), value in zip(axes, point)}}
+        variants.append((" ".join(f"{key}={value}" for (key, _), value in zip(axes, point)), overrides))
+    return variants
+
+
+def run_chunk(params: SimParams, runs: int, seed: np.random.SeedSequence) -> BatchResult:
+    return simulate_batch(params, runs, seed)
+
+
+def _chunk_sizes(runs: int, chunk: int) -> list[int]:
+    full, rest = divmod(runs, chunk)
+    return [chunk] * full + ([rest] if rest else [])
+
+
+def simulate_variants(
+    variants: list[tuple[str, SimParams]],
+    runs: int,
+    seed: int,
+    chunk: int,
+    jobs: int,
+) -> list[BatchResult]:
+    """Run every variant; chunk i of each variant uses the same child seed."""
+    sizes = _chunk_sizes(runs, chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(params, size, chunk_seed) for _, params in variants for size, chunk_seed in zip(sizes, seeds)]
+    if jobs <= 1 or len(tasks) == 1:
+        batches = [run_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            batches = list(pool.map(run_chunk, *zip(*tasks)))
+
+    results = []
+    for offset in range(0, len(batches), len(sizes)):
+        group = batches[offset:offset + len(sizes)]
+        results.append(
+            BatchResult(
+                money=np.concatenate([batch.money for batch in group]),
+                panic=np.concatenate([batch.panic for batch in group]),
+                fail_day=np.concatenate([batch.fail_day for batch in group]),
+                spawned=np.concatenate([batch.spawned for batch in group]),
+            )
+        )
+    return results
+
+
+def summarize(name: str, params: SimParams, result: BatchResult, percentiles: tuple[int, ...]) -> dict[str, Any]:
+    days = params.days
+    failed = result.fail_day[result.fail_day > 0]
+    # survival[d] is the share of runs still going at the end of day d + 1.
+    fails_per_day = np.bincount(failed, minlength=days + 1)[1:]
+    survival = 1.0 - np.cumsum(fails_per_day) / len(result.fail_day)
+
+    def curves(values: np.ndarray, digits: int) -> dict[str, list[float]]:
+        table = np.percentile(values, percentiles, axis=0)
+        return {f"p{level}": np.round(row, digits).tolist() for level, row in zip(percentiles, table)}
+
+    fail_days = (
+        {f"p{level}": float(value) for level, value in zip(percentiles, np.percentile(failed, percentiles))}
+        if len(failed)
+        else {}
+    )
+    return {
+        "name": name,
+        "balance": params.balance,
+        "runs": int(len(result.fail_day)),
+        "failRate": round(float(len(failed) / len(result.fail_day)), 6),
+        "failDay": fail_days,
+        "spawnedMean": round(float(result.spawned.mean()), 3),
+        "survival": np.round(survival, 6).tolist(),
+        "money": curves(result.money, 1),
+        "panic": curves(result.panic, 3),
+    }
+
+
+def print_summary(report: dict[str, Any]) -> None:
+    days = report["days"]
+    width = max(len("variant"), *(len(variant["name"]) for variant in report["variants"]))
+    print(f"{'variant':<{width}} {'fail%':>7} {'p50 fail day':>13} {'p50 money@end':>14} {'p95 panic@end':>14} {'spawned':>8}")
+    for variant in report["variants"]:
+        median_fail = variant["failDay"].get("p50")
+        print(
+            f"{variant['name']:<{width}} {variant['failRate'] * 100:>6.1f}% "
+            f"{'-' if median_fail is None else f'{median_fail:.0f}':>13} "
+            f"{variant['money'].get('p50', [0])[days - 1]:>14.0f} "
+            f"{variant['panic'].get('p95', [0])[days - 1]:>14.2f} "
+            f"{variant['spawnedMean']:>8.1f}"
+        )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulation over an exported game_data.json.")
+    parser.add_argument("--data", type=Path, help="Export to read (json, shard dir or .bin); default is the project's game_data.json")
+    parser.add_argument("--runs", type=int, default=2000, help="Runs per variant")
+    parser.add_argument("--days", type=int, default=500, help="Days per run")
+    parser.add_argument("--seed", type=int, default=0, help="Root seed; identical seeds give identical reports")
+    parser.add_argument("--chunk", type=int, default=250, help="Runs simulated together in one vectorised batch")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (1 runs in-process)")
+    parser.add_argument("--set", dest="sets", type=_assignment, action="append", default=[], metavar="KEY=VALUE", help="Override a Balance value for every variant")
+    parser.add_argument("--sweep", type=_assignment, action="append", default=[], metavar="KEY=V1,V2,...", help="Sweep a Balance value; several --sweep flags form a grid")
+    parser.add_argument("--schedule-rules", type=Path, help="JSON AnomaliesGen rules (see generate_anomalies_gen.py) to use instead of the exported schedule")
+    parser.add_argument("--agents", type=int, default=3, help="Agents on the team (GameController starts with 3)")
+    parser.add_argument("--cities", type=int, default=6, help="Cities anomalies can spawn in (scene data, not exported)")
+    parser.add_argument("--population", type=int, default=10000, help="Starting population per city (scene data, not exported)")
+    parser.add_argument("--phases", type=int, default=2, help="Task phases before an anomaly is contained, baseDays each")
+    parser.add_argument("--percentiles", type=_int_list, default=list(DEFAULT_PERCENTILES), help="Comma-separated percentiles for money/panic curves")
+    parser.add_argument("--out", type=Path, help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.runs < 1 or args.days < 1 or args.chunk < 1:
+        print("--runs, --days and --chunk must be positive", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    with open_game_data(args.data) as data:
+        base = load_params(
+            data,
+            agents=args.agents,
+            cities=args.cities,
+            population=args.population,
+            phases=args.phases,
+            days=args.days,
+        )
+        data_version = data.meta.get("dataVersion")
+    if args.schedule_rules:
+        from generate_anomalies_gen import compute_schedule, rules_from_mapping
+
+        rules = rules_from_mapping(json.loads(args.schedule_rules.read_text(encoding="utf-8")))
+        base = replace(base, schedule=compute_schedule(rules).astype(np.int64))
+
+    try:
+        variants = [(name, base.with_balance(overrides)) for name, overrides in build_variants(args.sets, args.sweep)]
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    loaded = time.perf_counter()
+
+    results = simulate_variants(variants, args.runs, args.seed, args.chunk, args.jobs)
+    finished = time.perf_counter()
+
+    percentiles = tuple(args.percentiles)
+    report = {
+        "format": REPORT_FORMAT,
+        "dataVersion": data_version,
+        "seed": args.seed,
+        "runs": args.runs,
+        "days": args.days,
+        "scene": {"agents": args.agents, "cities": args.cities, "population": args.population, "phases": args.phases},
+        "scheduleDays": int(len(base.schedule)),
+        "scheduleTotal": int(base.schedule.sum()),
+        "variants": [summarize(name, params, result, percentiles) for (name, params), result in zip(variants, results)],
+    }
+    print_summary(report)
+    total_runs = args.runs * len(variants)
+    print(
+        f"{len(variants)} variant(s) x {args.runs} runs x {args.days} days in {finished - loaded:.2f} s "
+        f"({total_runs / max(finished - loaded, 1e-9):.0f} runs/s, jobs={args.jobs}, load {(loaded - started) * 1000:.0f} ms)"
+    )
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, ensure_ascii=False), encoding="utf-8")
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Send an export request to a running `xlsx_to_json.py --serve` daemon."""
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import sys
+from typing import Any
+
+DEFAULT_PORT = 47823
+
+
+def send_request(payload: dict[str, Any], *, port: int = DEFAULT_PORT, timeout: float = 60.0) -> dict[str, Any]:
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("export server closed the connection without a reply")
+    return json.loads(line.decode("utf-8"))
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--xlsx", dest="xlsx", help="Path to game_data.xlsx (server default if omitted)")
+    parser.add_argument("--out", dest="out", help="Path to output game_data.json (server default if omitted)")
+    parser.add_argument(
+        "--log-level",
+        dest="log_level",
+        default="INFO",
+        choices=sorted({"DEBUG", "INFO", "WARN", "ERROR"}),
+        help="Logging level (default: INFO)",
+    )
+    parser.add_argument(
+        "--validate-only",
+        "--dry-run",
+        dest="validate_only",
+        action="store_true",
+        help="Validate workbook without writing output JSON.",
+    )
+    parser.add_argument("--port", dest="port", type=int, default=DEFAULT_PORT, help="Server port")
+    parser.add_argument("--timeout", dest="timeout", type=float, default=60.0, help="Socket timeout in seconds")
+    command = parser.add_mutually_exclusive_group()
+    command.add_argument("--ping", dest="command", action="store_const", const="ping", help="Check the server is up")
+    command.add_argument(
+        "--shutdown",
+        dest="command",
+        action="store_const",
+        const="shutdown",
+        help="Stop the server",
+    )
+    parser.set_defaults(command="export")
+    return parser.parse_args(argv[1:])
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    payload: dict[str, Any] = {"command": args.command}
+    if args.command == "export":
+        payload.update(
+            {
+                "xlsx": args.xlsx,
+                "out": args.out,
+                "logLevel": args.log_level,
+                "validateOnly": args.validate_only,
+            }
+        )
+    try:
+        reply = send_request(payload, port=args.port, timeout=args.timeout)
+    except (OSError, ValueError) as exc:
+        print(f"[ERROR] export server unavailable on port {args.port}: {exc}", file=sys.stderr)
+        return 4
+
+    # Same "[LABEL] message" lines as the exporter so GameDataBuildMenu can classify them.
+    for label, message in reply.get("log", []):
+        print(f"[{label}] {message}", file=sys.stderr if label == "ERROR" else sys.stdout)
+    timings = reply.get("timings") or {}
+    if timings and args.log_level in {"DEBUG", "INFO"}:
+        print("[INFO] timings_ms " + " ".join(f"{name}={value:.2f}" for name, value in timings.items()))
+    return int(reply.get("status", 1))
+
+
+def main() -> None:
+    sys.exit(run(sys.argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Localhost daemon behind `xlsx_to_json.py --serve`.
+
+Kept out of xlsx_to_json.py so one-shot exports do not import socketserver and
+threading; `xlsx_export_client.py` is the matching client.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any
+
+import xlsx_to_json
+
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class _ExportRequestHandler(socketserver.StreamRequestHandler):
+    server: "ExportServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+        try:
+            if len(line) > MAX_REQUEST_BYTES:
+                raise ValueError("request too large")
+            request = json.loads(line.decode("utf-8"))
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            reply = self.server.handle_request_payload(request)
+        except ValueError as exc:
+            reply = {"status": 1, "issues": [], "log": [["ERROR", f"Bad request: {exc}"]], "timings": {}}
+        self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class ExportServer(socketserver.TCPServer):
+    """Localhost export daemon; requests are served one at a time.
+
+    Each request is one line of JSON::
+
+        {"xlsx": "...", "out": "...", "logLevel": "INFO", "validateOnly": false}
+
+    and gets one line back with ``status`` (the CLI exit code), ``issues``,
+    ``log`` ([label, message] pairs) and ``timings`` in milliseconds. Parsed
+    workbooks stay in memory keyed by file hash, so repeated builds of an
+    unchanged workbook skip openpyxl entirely. A request's ``out`` must resolve
+    inside the project root. ``{"command": "ping"}`` and
+    ``{"command": "shutdown"}`` are also accepted.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        args: argparse.Namespace,
+        reporter: xlsx_to_json.Reporter,
+        project_root: Path,
+        cache: xlsx_to_json.SheetCache | None,
+    ) -> None:
+        super().__init__(address, _ExportRequestHandler)
+        self.args = args
+        self.reporter = reporter
+        self.project_root = project_root
+        self.cache = cache
+        self.memo = xlsx_to_json.WorkbookMemo()
+        # Directory/glob requests keep one WorkbookSet each so per-file results survive between builds.
+        self.workbook_sets: dict[str, xlsx_to_json.WorkbookSet] = {}
+
+    def handle_request_payload(self, request: dict[str, Any]) -> dict[str, Any]:
+        command = request.get("command", "export")
+        if command == "ping":
+            return {"status": 0, "issues": [], "log": [], "timings": {}}
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"status": 0, "issues": [], "log": [["INFO", "server shutting down"]], "timings": {}}
+        if command != "export":
+            raise ValueError(f"unknown command {command!r}")
+
+        level_name = str(request.get("logLevel") or self.args.log_level).upper()
+        request_reporter = xlsx_to_json.BufferedReporter(level_name)
+        request_args = argparse.Namespace(**vars(self.args))
+        request_args.validate_only = bool(request.get("validateOnly", self.args.validate_only))
+        xlsx_path = xlsx_to_json.resolve_workbooks(self.project_root, request.get("xlsx") or self.args.xlsx)
+        if isinstance(xlsx_path, xlsx_to_json.WorkbookSet):
+            xlsx_path = self.workbook_sets.setdefault(xlsx_path.pattern, xlsx_path)
+        out_path = xlsx_to_json.resolve_path(self.project_root, request.get("out") or self.args.out, xlsx_to_json.DEFAULT_OUT)
+        # Any local process can connect, so a client may only write inside the project.
+        if request.get("out") and not out_path.is_relative_to(self.project_root):
+            raise ValueError(f"out {out_path} is outside the project root {self.project_root}")
+        request_reporter.info("xlsx=%s out=%s", xlsx_path, out_path)
+        if xlsx_to_json._workbooks_missing(xlsx_path, request_reporter):
+            result = xlsx_to_json.ExportResult(1, [], {})
+        else:
+            result = xlsx_to_json.export_workbook(request_args, request_reporter, xlsx_path, out_path, self.cache, self.memo)
+        self.reporter.info(
+            "serve request xlsx=%s status=%d total_ms=%.2f",
+            xlsx_path,
+            result.status,
+            result.timings_ms.get("total", 0.0),
+        )
+        return {
+            "status": result.status,
+            "issues": result.issues,
+            "log": [[label, message] for label, message, _ in request_reporter.records],
+            "timings": result.timings_ms,
+            "outBytes": result.out_bytes,
+        }
+
+
+def serve_exports(
+    args: argparse.Namespace,
+    reporter: xlsx_to_json.Reporter,
+    project_root: Path,
+    cache: xlsx_to_json.SheetCache | None,
+) -> int:
+    with ExportServer(("127.0.0.1", args.port), args, reporter, project_root, cache) as server:
+        reporter.info("serve listening on 127.0.0.1:%d", server.server_address[1])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    reporter.info("serve stopped")
+    return 0
@@ -2,21 +2,57 @@
 """Export game_data.xlsx into Unity-friendly game_data.json."""
 from __future__ import annotations
 
+# Only light stdlib modules are imported here, so an up-to-date export can be
+# confirmed from the stamp file in a few milliseconds. openpyxl, gamedata_bin,
+# gamedata_delta, zipfile, multiprocessing and the --serve daemon are imported
+# where they are used.
 import argparse
+import glob
+import hashlib
 import json
+import os
 import re
-import subprocess
 import sys
 import time
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from itertools import accumulate, islice
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterator
 
-from openpyxl import load_workbook
+if TYPE_CHECKING:
+    import zipfile
 
 LIST_SPLIT_PATTERN = re.compile(r"[;,，]")
 ALLOWED_TYPES = {"int", "float", "string", "int[]", "float[]", "string[]"}
+# `ref:Table` / `ref[]:Table` columns hold ids of another table's idField.
+REF_PREFIX = "ref:"
+REF_LIST_PREFIX = "ref[]:"
+# Marker in a column's comment (first header row) requesting a secondary index under --index.
+INDEX_MARKER = "@index"
+INDEXABLE_TYPES = {"int", "string"}
+SERIES_MARKER = "@series"
+SERIES_ENCODINGS = ("rle", "delta")
+_SERIES_MARKER_PATTERN = re.compile(r"@series(?::(\w+))?")
 LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40}
+CACHE_FORMAT_VERSION = 3
+DEFAULT_XLSX = "GameData/Local/game_data.xlsx"
+DEFAULT_OUT = "Assets/StreamingAssets/game_data.json"
+DEFAULT_SERVE_PORT = 47823
+PROFILE_REPORT_ENV = "GAME_DATA_PROFILE_REPORT"
+CPROFILE_ENV = "GAME_DATA_CPROFILE"
+EXIT_BUDGET_EXCEEDED = 5
+DELTA_COMMANDS = {"diff", "apply"}
+COMPRESSED_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+STAMP_FORMAT = "xlsx_to_json.stamp/1"
+# CLI options that change the bytes written; anything else (paths, logging, cache, jobs) does not.
+STAMP_OPTIONS = ("no_pretty", "layout", "intern_strings", "shard", "format", "compress", "max_bytes", "index")
+
+_XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XLSX_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_SHARED_STRING_ITEM = re.compile(rb"<si>.*?</si>", re.S)
+_SHARED_STRING_CELL = re.compile(rb'(<c\b[^>]*\bt="s"[^>]*>\s*<v>)(\d+)(</v>)')
 
 
 @dataclass(slots=True)
@@ -24,6 +60,7 @@ class ColumnInfo:
     index: int
     name: str
     type_name: str
+    convert: Callable[[Any], Any]
 
 
 @dataclass(slots=True)
@@ -32,6 +69,9 @@ class SheetTable:
     id_field: str
     columns: list[dict[str, str]]
     rows: list[dict[str, Any]]
+    row_numbers: list[int] = field(default_factory=list)
+    index_columns: list[str] = field(default_factory=list)
+    series: str | None = None
 
 
 class Reporter:
@@ -60,14 +100,29 @@ class Reporter:
         self._emit("SUCCESS", message % args if args else message)
 
 
+class BufferedReporter(Reporter):
+    """Reporter that records messages so a worker process can hand them back."""
+
+    def __init__(self, level_name: str) -> None:
+        super().__init__(level_name)
+        self.records: list[tuple[str, str, bool]] = []
+
+    def _emit(self, label: str, message: str, *, error: bool = False) -> None:
+        self.records.append((label, message, error))
+
+    def replay(self, reporter: Reporter) -> None:
+        for label, message, error in self.records:
+            if error or LOG_LEVELS.get(label, LOG_LEVELS["ERROR"]) >= reporter.level:
+                reporter._emit(label, message, error=error)
+
+
 def split_list(value: Any) -> list[str]:
     if value is None:
         return []
-    text = str(value).strip()
-    if not text:
-        return []
-    parts = [part.strip() for part in LIST_SPLIT_PATTERN.split(text)]
-    return [part for part in parts if part]
+    text = str(value)
+    # Plain comma lists (the common case) skip the regex.
+    raw_parts = LIST_SPLIT_PATTERN.split(text) if ";" in text or "，" in text else text.split(",")
+    return [part for raw in raw_parts if (part := raw.strip())]
 
 
 def to_int(value: Any) -> int | None:
@@ -96,38 +151,83 @@ def _is_empty_cell(value: Any) -> bool:
     return False
 
 
-def _parse_table_value(type_name: str, value: Any) -> Any:
-    if type_name == "string":
-        return "" if value is None else str(value).strip()
-    if type_name == "int":
-        return to_int(value)
-    if type_name == "float":
-        return to_float(value)
-    if type_name == "string[]":
-        return split_list(value)
-    if type_name == "int[]":
-        return [int(part) for part in split_list(value)]
-    if type_name == "float[]":
-        return [float(part) for part in split_list(value)]
-    raise ValueError(f"Unsupported type: {type_name}")
+def to_string(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def to_ref(value: Any) -> Any:
+    # Kept close to the raw cell; converted to the target's id type once every sheet is parsed.
+    # Numbers stay numbers for int ids; anything else (dates, times) becomes text like to_string,
+    # so a cached table only holds JSON types.
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return str(value).strip()
+
+
+def to_int_list(value: Any) -> list[int]:
+    return [int(part) for part in split_list(value)]
+
+
+def to_float_list(value: Any) -> list[float]:
+    return [float(part) for part in split_list(value)]
+
+
+# Converter per column type, bound once per column when the sheet schema is read.
+COLUMN_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "string": to_string,
+    "int": to_int,
+    "float": to_float,
+    "string[]": split_list,
+    "int[]": to_int_list,
+    "float[]": to_float_list,
+}
+
+
+def ref_target(type_name: str) -> tuple[str, bool] | None:
+    """(target table, is_list) for a ``ref:``/``ref[]:`` column type, else None."""
+    for prefix, is_list in ((REF_LIST_PREFIX, True), (REF_PREFIX, False)):
+        if type_name.startswith(prefix):
+            return type_name[len(prefix) :].strip(), is_list
+    return None
+
+
+def _convert_row_cells(
+    schema: tuple[tuple[int, str, Callable[[Any], Any]], ...],
+    row: tuple[Any, ...],
+    sheet_title: str,
+    row_number: int,
+    issues: list[str],
+) -> dict[str, Any]:
+    entry: dict[str, Any] = {}
+    for index, name, convert in schema:
+        try:
+            entry[name] = convert(row[index])
+        except (TypeError, ValueError) as exc:
+            issues.append(f"{sheet_title}[row {row_number}].{name} parse error: {exc}")
+    return entry
 
 
 def parse_sheet(ws, reporter: Reporter) -> tuple[SheetTable | None, list[str]]:
     issues: list[str] = []
-    rows = list(ws.iter_rows(values_only=True))
-    if not rows:
+    # Stream rows instead of materialising the sheet: only the header rows are
+    # held, data rows are parsed one at a time as the worksheet yields them.
+    row_iter = ws.iter_rows(values_only=True)
+    header_rows = list(islice(row_iter, 3))
+    if not header_rows:
         reporter.warn("sheet %s empty", ws.title)
         return None, issues
-    if len(rows) < 3:
+    if len(header_rows) < 3:
         issues.append(f"{ws.title} requires at least 3 header rows")
         return None, issues
 
-    header_row = rows[1]
-    type_row = rows[2]
-    data_rows = rows[3:]
+    comment_row = header_rows[0]
+    header_row = header_rows[1]
+    type_row = header_rows[2]
 
     columns: list[dict[str, str]] = []
     column_infos: list[ColumnInfo] = []
+    index_columns: list[str] = []
+    series: str | None = None
     for idx, raw_name in enumerate(header_row):
         name = _normalize_header(raw_name)
         if not name or name.startswith("#"):
@@ -137,11 +237,31 @@ def parse_sheet(ws, reporter: Reporter) -> tuple[SheetTable | None, list[str]]:
         if not type_name:
             issues.append(f"{ws.title} column {name} missing type")
             continue
-        if type_name not in ALLOWED_TYPES:
+        ref = ref_target(type_name)
+        if ref is not None and ref[0] and not column_infos:
+            issues.append(f"{ws.title} id column {name} cannot be a reference")
+            continue
+        if ref is not None and ref[0]:
+            convert = split_list if ref[1] else to_ref
+        elif type_name in ALLOWED_TYPES:
+            convert = COLUMN_CONVERTERS[type_name]
+        else:
             issues.append(f"{ws.title} column {name} invalid type {type_name!r}")
             continue
         columns.append({"name": name, "type": type_name})
-        column_infos.append(ColumnInfo(index=idx, name=name, type_name=type_name))
+        column_infos.append(ColumnInfo(index=idx, name=name, type_name=type_name, convert=convert))
+        comment = comment_row[idx] if idx < len(comment_row) else None
+        if len(column_infos) == 1 and (match := _SERIES_MARKER_PATTERN.search(_normalize_header(comment))):
+            series = match.group(1) or SERIES_ENCODINGS[0]
+            if series not in SERIES_ENCODINGS:
+                issues.append(f"{ws.title} {SERIES_MARKER}:{series} is not one of {', '.join(SERIES_ENCODINGS)}")
+        if INDEX_MARKER in _normalize_header(comment) and len(column_infos) > 1:
+            if type_name in INDEXABLE_TYPES or (ref is not None and not ref[1]):
+                index_columns.append(name)
+            else:
+                issues.append(
+                    f"{ws.title} column {name} {INDEX_MARKER} needs an int or string column, not {type_name!r}"
+                )
 
     if not column_infos:
         issues.append(f"{ws.title} has no exportable columns")
@@ -150,27 +270,41 @@ def parse_sheet(ws, reporter: Reporter) -> tuple[SheetTable | None, list[str]]:
     id_field = column_infos[0].name
     id_rows: dict[Any, list[int]] = {}
     row_entries: list[dict[str, Any]] = []
+    row_numbers: list[int] = []
+
+    # Compiled schema for the hot loop: no type-name dispatch and no bounds
+    # checks per cell; short rows are padded once instead.
+    schema = tuple((col.index, col.name, col.convert) for col in column_infos)
+    row_width = max(col.index for col in column_infos) + 1
+    padding = (None,) * row_width
+    id_index = column_infos[0].index
+    sheet_title = ws.title
 
-    for row_offset, row in enumerate(data_rows):
-        row_number = row_offset + 4
+    data_row_count = 0
+    for row_number, row in enumerate(row_iter, start=4):
+        data_row_count += 1
         if row is None:
             continue
-        if all(_is_empty_cell(row[col.index] if col.index < len(row) else None) for col in column_infos):
-            continue
-        entry: dict[str, Any] = {}
-        for col in column_infos:
-            cell_value = row[col.index] if col.index < len(row) else None
+        if len(row) < row_width:
+            row = tuple(row) + padding[len(row) :]
+        id_cell = row[id_index]
+        if not _is_empty_cell(id_cell):
+            # Fast path: a row with an id is never skipped, so convert it in one
+            # go and only fall back to per-cell conversion to report errors.
             try:
-                entry[col.name] = _parse_table_value(col.type_name, cell_value)
-            except (TypeError, ValueError) as exc:
-                issues.append(f"{ws.title}[row {row_number}].{col.name} parse error: {exc}")
-        raw_id_cell = row[column_infos[0].index] if column_infos[0].index < len(row) else None
-        if _is_empty_cell(raw_id_cell):
-            issues.append(f"{ws.title}[row {row_number}] {id_field} is empty")
+                entry = {name: convert(row[index]) for index, name, convert in schema}
+            except (TypeError, ValueError):
+                entry = _convert_row_cells(schema, row, sheet_title, row_number, issues)
+        else:
+            if all(_is_empty_cell(row[index]) for index, _, _ in schema):
+                continue
+            _convert_row_cells(schema, row, sheet_title, row_number, issues)
+            issues.append(f"{sheet_title}[row {row_number}] {id_field} is empty")
             continue
         id_value = entry.get(id_field)
         id_rows.setdefault(id_value, []).append(row_number)
         row_entries.append(entry)
+        row_numbers.append(row_number)
 
     for id_value, rows_list in id_rows.items():
         if len(rows_list) > 1:
@@ -180,18 +314,449 @@ def parse_sheet(ws, reporter: Reporter) -> tuple[SheetTable | None, list[str]]:
         "sheet %s cols=%d rows=%d exportedRows=%d",
         ws.title,
         len(column_infos),
-        len(data_rows),
+        data_row_count,
         len(row_entries),
     )
-    return SheetTable(name=ws.title, id_field=id_field, columns=columns, rows=row_entries), issues
+    table = SheetTable(
+        name=ws.title,
+        id_field=id_field,
+        columns=columns,
+        rows=row_entries,
+        row_numbers=row_numbers,
+        index_columns=index_columns,
+        series=series,
+    )
+    if series is not None:
+        issues.extend(check_series(table))
+    return table, issues
+
+
+def check_series(table: SheetTable) -> list[str]:
+    """A ``@series`` sheet must hold only int columns, keyed by contiguous ascending ids, with no empty cells."""
+    other_types = [f"{column['name']}:{column['type']}" for column in table.columns if column["type"] != "int"]
+    if other_types:
+        return [f"{table.name} {SERIES_MARKER} needs int columns only, not {', '.join(other_types)}"]
+    if not table.rows:
+        return [f"{table.name} {SERIES_MARKER} sheet has no rows"]
+    issues: list[str] = []
+    id_field = table.id_field
+    names = [column["name"] for column in table.columns]
+    # Cells that failed int conversion are left out of the row, so read with .get().
+    start = table.rows[0].get(id_field)
+    for position, (row, row_number) in enumerate(zip(table.rows, table.row_numbers)):
+        empty = [name for name in names if row.get(name) is None]
+        if empty:
+            issues.append(f"{table.name}[row {row_number}] {SERIES_MARKER} cells are empty or invalid: {', '.join(empty)}")
+        elif start is not None and row[id_field] != start + position:
+            issues.append(
+                f"{table.name}[row {row_number}] {id_field}={row[id_field]} breaks the {SERIES_MARKER}, "
+                f"expected {start + position}"
+            )
+            break
+    return issues
+
+
+def _elapsed_ms(since: float, now: float) -> float:
+    return round((now - since) * 1000, 3)
+
+
+class PhaseProfiler:
+    """Wall and CPU time per export phase, written out by --profile-report.
+
+    ``phase()`` times a block; ``lap()`` closes the span since the previous
+    phase or lap, for straight-line code. With ``per_sheet`` every parse_sheet
+    call is timed too; those entries are kept apart in ``sheets`` since they
+    overlap the ``parse`` phase.
+    """
+
+    def __init__(self, *, per_sheet: bool = False) -> None:
+        self.per_sheet = per_sheet
+        self.phases: list[dict[str, Any]] = []
+        self.sheets: list[dict[str, Any]] = []
+        self._wall_mark = time.perf_counter()
+        self._cpu_mark = time.process_time()
+
+    def _close(self, entry: dict[str, Any], wall_start: float, cpu_start: float) -> None:
+        self._wall_mark, self._cpu_mark = time.perf_counter(), time.process_time()
+        entry["wall_ms"] = _elapsed_ms(wall_start, self._wall_mark)
+        entry["cpu_ms"] = _elapsed_ms(cpu_start, self._cpu_mark)
+
+    @contextmanager
+    def phase(self, name: str, **details: Any) -> Iterator[dict[str, Any]]:
+        entry: dict[str, Any] = {"phase": name, **details}
+        self.phases.append(entry)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield entry
+        finally:
+            self._close(entry, wall_start, cpu_start)
+
+    def mark(self) -> None:
+        self._wall_mark, self._cpu_mark = time.perf_counter(), time.process_time()
+
+    def lap(self, name: str, **details: Any) -> None:
+        entry: dict[str, Any] = {"phase": name, **details}
+        self.phases.append(entry)
+        self._close(entry, self._wall_mark, self._cpu_mark)
+
+
+class _TimedWorksheet:
+    """Worksheet proxy that adds up the wall time spent inside openpyxl's row iterator."""
+
+    def __init__(self, ws) -> None:
+        self.title = ws.title
+        self._ws = ws
+        self.read_s = 0.0
+
+    def iter_rows(self, values_only: bool = True):
+        rows = self._ws.iter_rows(values_only=values_only)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            row = next(rows, None)
+            self.read_s += clock() - start
+            if row is None:
+                return
+            yield row
+
+
+def parse_sheet_profiled(ws, reporter: Reporter) -> tuple[SheetTable | None, list[str], dict[str, Any]]:
+    """parse_sheet plus a profile entry splitting openpyxl row reads from our own conversion."""
+    timed = _TimedWorksheet(ws)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    table, issues = parse_sheet(timed, reporter)
+    wall_ms = _elapsed_ms(wall_start, time.perf_counter())
+    read_ms = round(timed.read_s * 1000, 3)
+    entry = {
+        "sheet": ws.title,
+        "rows": len(table.rows) if table is not None else 0,
+        "columns": len(table.columns) if table is not None else 0,
+        "wall_ms": wall_ms,
+        "cpu_ms": _elapsed_ms(cpu_start, time.process_time()),
+        "openpyxl_read_ms": read_ms,
+        "convert_ms": round(wall_ms - read_ms, 3),
+        "pid": os.getpid(),
+    }
+    return table, issues, entry
+
+
+_WORKER_STATE: dict[str, Any] = {}
+
+
+def _init_sheet_worker(xlsx_path: str, level_name: str, profile: bool = False, read_only: bool = True) -> None:
+    _WORKER_STATE["workbook"] = open_workbook(Path(xlsx_path), read_only=read_only)
+    _WORKER_STATE["level_name"] = level_name
+    _WORKER_STATE["profile"] = profile
+
+
+def _parse_sheet_in_worker(
+    sheet_name: str,
+) -> tuple[SheetTable | None, list[str], BufferedReporter, dict[str, Any] | None]:
+    reporter = BufferedReporter(_WORKER_STATE["level_name"])
+    ws = _WORKER_STATE["workbook"][sheet_name]
+    if _WORKER_STATE["profile"]:
+        table, issues, entry = parse_sheet_profiled(ws, reporter)
+        return table, issues, reporter, entry
+    table, issues = parse_sheet(ws, reporter)
+    return table, issues, reporter, None
+
+
+def parse_sheets_parallel(
+    xlsx_path: Path,
+    sheet_names: list[str],
+    level_name: str,
+    jobs: int,
+    profiler: PhaseProfiler | None = None,
+    read_only: bool = True,
+) -> list[tuple[SheetTable | None, list[str], BufferedReporter]]:
+    """Parse sheets in worker processes, each holding its own copy of the workbook
+    (read-only unless ``read_only`` is False, as with --full-load).
+
+    Results come back in ``sheet_names`` order regardless of which worker
+    finished first; log lines are buffered so the caller can replay them in
+    that order and keep the export deterministic.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_sheet_worker,
+        initargs=(str(xlsx_path), level_name, profiler is not None, read_only),
+    ) as executor:
+        results = list(executor.map(_parse_sheet_in_worker, sheet_names))
+    if profiler is not None:
+        profiler.sheets.extend(entry for *_, entry in results if entry is not None)
+    return [(table, issues, reporter) for table, issues, reporter, _ in results]
+
+
+def _xlsx_part_path(base: str, target: str) -> str:
+    if target.startswith("/"):
+        return target.lstrip("/")
+    parts = [part for part in f"{base.rpartition('/')[0]}/{target}".split("/") if part]
+    resolved: list[str] = []
+    for part in parts:
+        if part == "..":
+            if resolved:
+                resolved.pop()
+        elif part != ".":
+            resolved.append(part)
+    return "/".join(resolved)
+
+
+def _rels_targets(archive: zipfile.ZipFile, part: str) -> dict[str, tuple[str, str]]:
+    from xml.etree import ElementTree
+
+    base, _, name = part.rpartition("/")
+    rels_path = f"{base}/_rels/{name}.rels" if base else f"_rels/{name}.rels"
+    root = ElementTree.fromstring(archive.read(rels_path))
+    return {
+        rel.get("Id", ""): (rel.get("Type", ""), _xlsx_part_path(part, rel.get("Target", "")))
+        for rel in root.iter(f"{{{_XLSX_PKG_REL_NS}}}Relationship")
+    }
+
+
+def sheet_content_hashes(xlsx_path: Path, sheet_names: list[str] | None = None) -> dict[str, str]:
+    """Hash the raw cell content of each sheet without going through openpyxl.
+
+    ``sheet_names=None`` hashes every sheet, in workbook order.
+
+    Only ``<sheetData>`` is hashed, so selection, zoom and column widths do not
+    count as edits. Shared-string references are replaced by the string items
+    themselves, which keeps a sheet's hash stable when Excel renumbers the
+    shared string table because another sheet changed. ``styles.xml`` is mixed
+    in since number formats decide how cell values are read back.
+    """
+    import zipfile
+    from xml.etree import ElementTree
+
+    with zipfile.ZipFile(xlsx_path) as archive:
+        workbook_part = next(
+            target
+            for rel_type, target in _rels_targets(archive, "").values()
+            if rel_type.endswith("/officeDocument")
+        )
+        workbook_rels = _rels_targets(archive, workbook_part)
+        shared_strings: list[bytes] = []
+        styles = b""
+        for rel_type, target in workbook_rels.values():
+            if rel_type.endswith("/sharedStrings"):
+                shared_strings = _SHARED_STRING_ITEM.findall(archive.read(target))
+            elif rel_type.endswith("/styles"):
+                styles = archive.read(target)
+        sheet_parts: dict[str, str] = {}
+        workbook_root = ElementTree.fromstring(archive.read(workbook_part))
+        for sheet in workbook_root.iter(f"{{{_XLSX_MAIN_NS}}}sheet"):
+            rel = workbook_rels.get(sheet.get(f"{{{_XLSX_REL_NS}}}id", ""))
+            if rel:
+                sheet_parts[sheet.get("name", "")] = rel[1]
+
+        def resolve_shared(match: re.Match[bytes]) -> bytes:
+            index = int(match.group(2))
+            value = shared_strings[index] if index < len(shared_strings) else match.group(2)
+            return match.group(1) + value + match.group(3)
+
+        styles_digest = hashlib.sha256(styles).digest()
+        hashes: dict[str, str] = {}
+        for sheet_name in list(sheet_parts) if sheet_names is None else sheet_names:
+            part = sheet_parts.get(sheet_name)
+            if part is None:
+                continue
+            data = archive.read(part)
+            start = data.find(b"<sheetData")
+            end = data.find(b"</sheetData>")
+            sheet_data = data[start:end] if start >= 0 and end >= 0 else data
+            digest = hashlib.sha256(styles_digest)
+            digest.update(sheet_name.encode("utf-8"))
+            digest.update(_SHARED_STRING_CELL.sub(resolve_shared, sheet_data))
+            hashes[sheet_name] = digest.hexdigest()
+        return hashes
+
+
+def exporter_fingerprint() -> str:
+    """Identify the parser version; any change to this script or ALLOWED_TYPES invalidates the cache."""
+    digest = hashlib.sha256(f"v{CACHE_FORMAT_VERSION}".encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+    digest.update(",".join(sorted(ALLOWED_TYPES)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SheetCache:
+    """On-disk cache of parsed sheets keyed by their raw content hash."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.fingerprint = exporter_fingerprint()
+
+    def key(self, content_hash: str) -> str:
+        return hashlib.sha256(f"{self.fingerprint}:{content_hash}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def load(self, key: str) -> tuple[SheetTable | None, list[str], BufferedReporter] | None:
+        try:
+            payload = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if payload.get("fingerprint") != self.fingerprint:
+            return None
+        raw_table = payload.get("table")
+        table = None
+        if raw_table is not None:
+            table = SheetTable(
+                name=raw_table["name"],
+                id_field=raw_table["idField"],
+                columns=raw_table["columns"],
+                rows=raw_table["rows"],
+                row_numbers=raw_table["rowNumbers"],
+                index_columns=raw_table["indexColumns"],
+                series=raw_table.get("series"),
+            )
+        buffered = BufferedReporter("DEBUG")
+        buffered.records = [tuple(record) for record in payload.get("log", [])]
+        return table, list(payload.get("issues", [])), buffered
+
+    def store(self, key: str, table: SheetTable | None, issues: list[str], buffered: BufferedReporter) -> None:
+        payload = {
+            "fingerprint": self.fingerprint,
+            "table": None
+            if table is None
+            else {
+                "name": table.name,
+                "idField": table.id_field,
+                "columns": table.columns,
+                "rows": table.rows,
+                "rowNumbers": table.row_numbers,
+                "indexColumns": table.index_columns,
+                "series": table.series,
+            },
+            "issues": issues,
+            "log": buffered.records,
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def _parse_sheets(
+    workbook,
+    sheet_names: list[str],
+    reporter: Reporter,
+    *,
+    xlsx_path: Path | None,
+    jobs: int,
+    profiler: PhaseProfiler | None = None,
+) -> list[tuple[SheetTable | None, list[str], BufferedReporter]]:
+    level_name = next(name for name, value in LOG_LEVELS.items() if value == reporter.level)
+    if profiler is not None and not profiler.per_sheet:
+        profiler = None
+    # More workers than cores (or sheets) only adds process and pickling overhead.
+    jobs = min(jobs, len(sheet_names), os.cpu_count() or 1)
+    if jobs > 1 and xlsx_path is not None:
+        reporter.info("parse jobs=%d sheets=%d", jobs, len(sheet_names))
+        # Workers open the file in the same mode as the caller's workbook (--full-load or not).
+        read_only = getattr(workbook, "read_only", True)
+        return parse_sheets_parallel(xlsx_path, sheet_names, level_name, jobs, profiler, read_only)
+    results = []
+    for sheet_name in sheet_names:
+        buffered = BufferedReporter(level_name)
+        if profiler is not None:
+            table, issues, entry = parse_sheet_profiled(workbook[sheet_name], buffered)
+            profiler.sheets.append(entry)
+        else:
+            table, issues = parse_sheet(workbook[sheet_name], buffered)
+        results.append((table, issues, buffered))
+    return results
+
+
+ParsedSheet = tuple[SheetTable | None, list[str], BufferedReporter]
+
+
+def _cached_sheets(
+    cache: SheetCache,
+    xlsx_path: Path,
+    sheet_names: list[str] | None,
+    reporter: Reporter,
+    profiler: PhaseProfiler,
+) -> tuple[list[str], dict[str, ParsedSheet], dict[str, str]]:
+    """Look every sheet up in the parse cache; returns (sheet names, hits, cache keys)."""
+    parsed: dict[str, ParsedSheet] = {}
+    cache_keys: dict[str, str] = {}
+    with profiler.phase("cache_lookup") as entry:
+        hashes = sheet_content_hashes(xlsx_path, sheet_names)
+        for sheet_name, content_hash in hashes.items():
+            cache_keys[sheet_name] = cache.key(content_hash)
+            cached = cache.load(cache_keys[sheet_name])
+            if cached is not None:
+                parsed[sheet_name] = cached
+        entry["hits"] = sorted(parsed)
+    names = list(hashes) if sheet_names is None else sheet_names
+    for sheet_name in names:
+        reporter.info("sheet %s cache=%s", sheet_name, "hit" if sheet_name in parsed else "miss")
+    return names, parsed, cache_keys
+
 
+def _store_sheets(
+    cache: SheetCache,
+    cache_keys: dict[str, str],
+    results: dict[str, ParsedSheet],
+    profiler: PhaseProfiler,
+) -> None:
+    if not cache_keys:
+        return
+    with profiler.phase("cache_store"):
+        for sheet_name, result in results.items():
+            if sheet_name in cache_keys:
+                cache.store(cache_keys[sheet_name], *result)
 
-def build_tables(workbook, reporter: Reporter) -> tuple[dict[str, Any], list[str]]:
+
+def build_tables(
+    workbook,
+    reporter: Reporter,
+    *,
+    xlsx_path: Path | None = None,
+    jobs: int = 1,
+    cache: SheetCache | None = None,
+    profiler: PhaseProfiler | None = None,
+    index: bool = False,
+) -> tuple[dict[str, Any], list[str]]:
+    sheet_names = list(workbook.sheetnames)
+    profiler = profiler or PhaseProfiler()
+
+    parsed: dict[str, ParsedSheet] = {}
+    cache_keys: dict[str, str] = {}
+    if cache is not None and xlsx_path is not None:
+        _, parsed, cache_keys = _cached_sheets(cache, xlsx_path, sheet_names, reporter, profiler)
+
+    dirty = [sheet_name for sheet_name in sheet_names if sheet_name not in parsed]
+    with profiler.phase("parse", sheets=len(dirty), jobs=jobs):
+        results = dict(zip(dirty, _parse_sheets(workbook, dirty, reporter, xlsx_path=xlsx_path, jobs=jobs, profiler=profiler)))
+    parsed.update(results)
+    if cache is not None:
+        _store_sheets(cache, cache_keys, results, profiler)
+    return assemble_tables({name: parsed[name] for name in sheet_names}, reporter, profiler=profiler, index=index)
+
+
+def assemble_tables(
+    parsed: dict[str, ParsedSheet],
+    reporter: Reporter,
+    *,
+    profiler: PhaseProfiler | None = None,
+    index: bool = False,
+) -> tuple[dict[str, Any], list[str]]:
+    """Resolve references across all parsed sheets and build the exported tables, in ``parsed`` order."""
     tables: dict[str, Any] = {}
     issues: list[str] = []
-    for sheet_name in workbook.sheetnames:
-        ws = workbook[sheet_name]
-        table, sheet_issues = parse_sheet(ws, reporter)
+    profiler = profiler or PhaseProfiler()
+    sheet_tables = {name: result[0] for name, result in parsed.items() if result[0] is not None}
+    with profiler.phase("references") as entry:
+        reference_issues = resolve_references(sheet_tables)
+        entry["issues"] = len(reference_issues)
+
+    for sheet_name, (table, sheet_issues, buffered) in parsed.items():
+        buffered.replay(reporter)
         issues.extend(sheet_issues)
         if table is None:
             continue
@@ -200,10 +765,366 @@ def build_tables(workbook, reporter: Reporter) -> tuple[dict[str, Any], list[str
             "columns": table.columns,
             "rows": table.rows,
         }
+        if table.series is not None:
+            tables[sheet_name]["encoding"] = table.series
+    issues.extend(reference_issues)
+
+    if index and not issues:
+        with profiler.phase("index"):
+            for sheet_name, table in sheet_tables.items():
+                if table.series is not None:
+                    # Series rows are already sorted; a day's position is id - start.
+                    reporter.info("index table=%s skipped (%s)", sheet_name, SERIES_MARKER)
+                    continue
+                tables[sheet_name] = index_table(tables[sheet_name], table.index_columns)
+                verify_table_index(sheet_name, tables[sheet_name])
+                reporter.info(
+                    "index table=%s ids=%d columns=%s",
+                    sheet_name,
+                    len(tables[sheet_name]["rows"]),
+                    ",".join(table.index_columns) or "-",
+                )
     return tables, issues
 
 
+def _index_key(value: Any) -> str:
+    # JSON object keys are strings, spelled the way C# Convert.ToString prints the row value:
+    # integral floats have no ".0" there (1.0 -> "1"), so TableRegistry.TryGetRow("1") hits.
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def index_table(table: dict[str, Any], index_columns: list[str]) -> dict[str, Any]:
+    """Sort rows by id and attach an ``index`` section.
+
+    ``index.id`` maps each id (as text) to its row position; ``index.columns``
+    maps every ``@index`` column to value -> ascending row positions. Empty
+    (null) cells are left out of secondary indexes.
+    """
+    id_field = table["idField"]
+    rows = sorted(table["rows"], key=lambda row: row[id_field])
+    section: dict[str, Any] = {"id": {_index_key(row[id_field]): position for position, row in enumerate(rows)}}
+    if index_columns:
+        secondary: dict[str, dict[str, list[int]]] = {}
+        for name in index_columns:
+            buckets: dict[str, list[int]] = {}
+            for position, row in enumerate(rows):
+                value = row.get(name)
+                if value is not None:
+                    buckets.setdefault(_index_key(value), []).append(position)
+            secondary[name] = buckets
+        section["columns"] = secondary
+    return {**table, "rows": rows, "index": section}
+
+
+def verify_table_index(table_name: str, table: dict[str, Any]) -> None:
+    """Check an ``index`` section against the rows it describes; raise ExportError on mismatch."""
+    id_field = table["idField"]
+    rows = table["rows"]
+    id_index = table["index"]["id"]
+    if len(id_index) != len(rows):
+        raise ExportError(f"{table_name} index has {len(id_index)} ids for {len(rows)} rows")
+    for position, row in enumerate(rows):
+        if position and not rows[position - 1][id_field] < row[id_field]:
+            raise ExportError(f"{table_name} rows are not strictly sorted by {id_field} at position {position}")
+        if id_index.get(_index_key(row[id_field])) != position:
+            raise ExportError(f"{table_name} index.id does not point at row {position}")
+    for name, buckets in table["index"].get("columns", {}).items():
+        covered = 0
+        for key, positions in buckets.items():
+            covered += len(positions)
+            if positions != sorted(positions) or any(_index_key(rows[p].get(name)) != key for p in positions):
+                raise ExportError(f"{table_name} index.columns.{name}[{key!r}] points at rows with other values")
+        expected = sum(1 for row in rows if row.get(name) is not None)
+        if covered != expected:
+            raise ExportError(f"{table_name} index.columns.{name} covers {covered} rows, expected {expected}")
+
+
+def resolve_references(tables: dict[str, SheetTable]) -> list[str]:
+    """Check ``ref:``/``ref[]:`` columns against the target tables' ids, in place.
+
+    Cells are converted to the target idField's type and the column type is
+    rewritten to that plain type, so exported metadata never mentions refs.
+    Each target gets one id set, making the whole check O(total rows).
+    Empty cells are allowed and mean "no reference".
+    """
+    issues: list[str] = []
+    id_sets: dict[str, set[Any]] = {}
+    for table in tables.values():
+        ref_columns = [(column, ref_target(column["type"])) for column in table.columns]
+        if not any(ref is not None for _, ref in ref_columns):
+            continue
+        columns: list[dict[str, str]] = []
+        for column, ref in ref_columns:
+            if ref is None:
+                columns.append(column)
+                continue
+            target_name, is_list = ref
+            name = column["name"]
+            target = tables.get(target_name)
+            if target is None:
+                issues.append(f"{table.name} column {name} references unknown table {target_name!r}")
+                columns.append({"name": name, "type": "string[]" if is_list else "string"})
+                continue
+            id_type = next(col["type"] for col in target.columns if col["name"] == target.id_field)
+            if id_type not in COLUMN_CONVERTERS or id_type.endswith("[]"):
+                issues.append(f"{table.name} column {name} references {target_name} whose id type is {id_type!r}")
+                columns.append({"name": name, "type": "string[]" if is_list else "string"})
+                continue
+            ids = id_sets.get(target_name)
+            if ids is None:
+                ids = id_sets[target_name] = {row.get(target.id_field) for row in target.rows}
+            convert = COLUMN_CONVERTERS[id_type]
+            for row, row_number in zip(table.rows, table.row_numbers):
+                try:
+                    if is_list:
+                        value: Any = [convert(item) for item in row[name]]
+                        refs = value
+                    else:
+                        value = convert(row[name])
+                        refs = (value,)
+                except (TypeError, ValueError) as exc:
+                    issues.append(f"{table.name}[row {row_number}].{name} parse error: {exc}")
+                    continue
+                row[name] = value
+                for ref_id in refs:
+                    if ref_id not in ids and ref_id is not None and ref_id != "":
+                        issues.append(
+                            f"{table.name}[row {row_number}].{name} references missing {target_name} id {ref_id!r}"
+                        )
+            columns.append({"name": name, "type": f"{id_type}[]" if is_list else id_type})
+        table.columns = columns
+    return issues
+
+
+def table_to_columnar(table: dict[str, Any]) -> dict[str, Any]:
+    """Struct-of-arrays form of an exported table: one value list per column."""
+    names = [column["name"] for column in table["columns"]]
+    rows = table["rows"]
+    columnar = {
+        "idField": table["idField"],
+        "columns": table["columns"],
+        "data": {name: [row.get(name) for row in rows] for name in names},
+    }
+    if "index" in table:
+        columnar["index"] = table["index"]
+    return columnar
+
+
+def table_to_series(table: dict[str, Any]) -> dict[str, Any]:
+    """Encoded form of a ``@series`` table (see check_series); the id column is implied.
+
+    ``rle`` stores each column as ``[startId, length, value]`` runs, ``delta``
+    as the first value followed by the difference to the previous row.
+    """
+    id_field = table["idField"]
+    rows = table["rows"]
+    start = rows[0][id_field] if rows else 0
+    encoded: dict[str, list[Any]] = {}
+    for column in table["columns"]:
+        name = column["name"]
+        if name == id_field:
+            continue
+        values = [row[name] for row in rows]
+        if table["encoding"] == "delta":
+            encoded[name] = [value - previous for previous, value in zip([0, *values], values)]
+            continue
+        runs: list[list[int]] = []
+        for offset, value in enumerate(values):
+            if runs and runs[-1][2] == value:
+                runs[-1][1] += 1
+            else:
+                runs.append([start + offset, 1, value])
+        encoded[name] = runs
+    return {
+        "idField": id_field,
+        "columns": table["columns"],
+        "encoding": table["encoding"],
+        "series": {"start": start, "count": len(rows), "columns": encoded},
+    }
+
+
+def series_to_rows(table: dict[str, Any]) -> list[dict[str, Any]]:
+    """Rebuild row dicts from a table written by table_to_series."""
+    series = table["series"]
+    start, count = series["start"], series["count"]
+    values: dict[str, list[Any]] = {table["idField"]: list(range(start, start + count))}
+    for name, encoded in series["columns"].items():
+        if table["encoding"] == "delta":
+            values[name] = list(accumulate(encoded))
+        else:
+            values[name] = [value for _, length, value in encoded for _ in range(length)]
+    names = [column["name"] for column in table["columns"]]
+    return [dict(zip(names, cells)) for cells in zip(*(values[name] for name in names))]
+
+
+def columnar_to_rows(table: dict[str, Any]) -> list[dict[str, Any]]:
+    """Rebuild row dicts from a columnar table, in column order."""
+    data = table["data"]
+    names = [column["name"] for column in table["columns"]]
+    columns = [data[name] for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _string_columns(table: dict[str, Any]) -> list[tuple[str, bool]]:
+    return [
+        (column["name"], column["type"] == "string[]")
+        for column in table["columns"]
+        if column["type"] in {"string", "string[]"}
+    ]
+
+
+def intern_strings(tables: dict[str, Any], reporter: Reporter) -> tuple[dict[str, Any], list[str]]:
+    """Replace repeated string cells (and string[] elements) with indexes into a shared pool.
+
+    A string is pooled only when it occurs more than once and the references
+    are shorter than repeating the text, so the pass never grows the payload.
+    The most frequent strings get the smallest (shortest) indexes. Returns new
+    table dicts; the input tables are not modified.
+    """
+    counts: dict[str, int] = {}
+    for table in tables.values():
+        string_columns = _string_columns(table)
+        for row in table["rows"]:
+            for name, is_list in string_columns:
+                value = row.get(name)
+                for item in value if is_list else (value,):
+                    if item is not None:
+                        counts[item] = counts.get(item, 0) + 1
+
+    pool: list[str] = []
+    refs: dict[str, int] = {}
+    encoded_len: dict[str, int] = {}
+    for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+        if count < 2:
+            break
+        cost = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        ref_cost = len(str(len(pool)))
+        # Repeated text saved must outweigh the pool entry (text plus separator).
+        if count * (cost - ref_cost) > cost + 1:
+            refs[value] = len(pool)
+            encoded_len[value] = cost
+            pool.append(value)
+
+    interned: dict[str, Any] = {}
+    for table_name, table in tables.items():
+        string_columns = _string_columns(table)
+        cells = 0
+        hits = 0
+        saved = 0
+        unique: set[str] = set()
+
+        def ref_of(value: Any) -> Any:
+            nonlocal cells, hits, saved
+            cells += 1
+            unique.add(value)
+            ref = refs.get(value)
+            if ref is None:
+                return value
+            hits += 1
+            saved += encoded_len[value] - len(str(ref))
+            return ref
+
+        rows = []
+        for row in table["rows"]:
+            new_row = dict(row)
+            for name, is_list in string_columns:
+                value = row.get(name)
+                if is_list:
+                    new_row[name] = [ref_of(item) for item in value]
+                elif value is not None:
+                    new_row[name] = ref_of(value)
+            rows.append(new_row)
+        interned[table_name] = {**table, "rows": rows}
+        if string_columns:
+            reporter.info(
+                "intern table=%s stringCells=%d unique=%d interned=%d bytesSaved=%d",
+                table_name,
+                cells,
+                len(unique),
+                hits,
+                saved,
+            )
+    pool_bytes = sum(encoded_len[value] + 1 for value in pool)
+    reporter.info("intern pool=%d poolBytes=%d", len(pool), pool_bytes)
+    return interned, pool
+
+
+def resolve_strings(tables: dict[str, Any], pool: list[str]) -> dict[str, Any]:
+    """Inverse of intern_strings for row-layout tables."""
+
+    def resolve(value: Any) -> Any:
+        return pool[value] if isinstance(value, int) else value
+
+    resolved: dict[str, Any] = {}
+    for table_name, table in tables.items():
+        string_columns = _string_columns(table)
+        rows = []
+        for row in table["rows"]:
+            new_row = dict(row)
+            for name, is_list in string_columns:
+                value = row.get(name)
+                new_row[name] = [resolve(item) for item in value] if is_list else resolve(value)
+            rows.append(new_row)
+        resolved[table_name] = {**table, "rows": rows}
+    return resolved
+
+
+def read_tables(document: dict[str, Any]) -> dict[str, Any]:
+    """Return a loaded game_data document's tables as plain rows, whatever layout or interning it uses."""
+    tables = document.get("tables", {})
+    if any("series" in table for table in tables.values()):
+        tables = {
+            name: {
+                "idField": table["idField"],
+                "columns": table["columns"],
+                "rows": series_to_rows(table),
+                "encoding": table["encoding"],
+            }
+            if "series" in table
+            else table
+            for name, table in tables.items()
+        }
+    if document.get("layout", "rows") != "rows":
+        tables = {
+            name: {
+                "idField": table["idField"],
+                "columns": table["columns"],
+                "rows": columnar_to_rows(table),
+                **({"index": table["index"]} if "index" in table else {}),
+            }
+            if "data" in table
+            else table
+            for name, table in tables.items()
+        }
+    if "strings" in document:
+        tables = resolve_strings(tables, document["strings"])
+    return tables
+
+
+def open_workbook(xlsx_path: Path, *, read_only: bool = True):
+    """Open the workbook for export.
+
+    Read-only mode streams rows from the underlying XML instead of building the
+    whole cell model in memory; the caller must close the workbook afterwards.
+    """
+    from openpyxl import load_workbook
+
+    return load_workbook(xlsx_path, read_only=read_only, data_only=True)
+
+
 def find_git_root(start: Path) -> Path | None:
+    # The nearest directory holding .git (a directory, or a file for worktrees) is
+    # what `git rev-parse --show-toplevel` reports; only fall back to git itself
+    # when there is none, which costs a process spawn.
+    for candidate in (start, *start.parents):
+        if (candidate / ".git").exists():
+            return candidate
+    import subprocess
+
     try:
         completed = subprocess.run(
             ["git", "rev-parse", "--show-toplevel"],
@@ -235,6 +1156,56 @@ def resolve_path(root: Path, value: str | None, default_rel: str) -> Path:
     return path.resolve()
 
 
+@dataclass(slots=True)
+class WorkbookSet:
+    """Several workbooks exported as one, given as a directory or a glob such as
+    ``GameData/Local/*.xlsx``; one domain per file.
+
+    The pattern is re-evaluated on every export so added or removed files are
+    picked up. ``parsed`` keeps each file's parsed sheets keyed by its stat
+    signature, so a long-running --watch/--serve process only reloads the
+    workbooks whose mtime or size changed.
+    """
+
+    pattern: str
+    parsed: dict[Path, tuple[tuple[int, int, int] | None, dict[str, ParsedSheet]]] = field(default_factory=dict)
+
+    def paths(self) -> list[Path]:
+        # Excel lock files (~$name.xlsx) and hidden temp files are never workbooks.
+        return sorted(
+            Path(match).resolve()
+            for match in glob.glob(self.pattern)
+            if not Path(match).name.startswith(("~$", ".")) and Path(match).is_file()
+        )
+
+    def __str__(self) -> str:
+        return self.pattern
+
+
+def resolve_workbooks(root: Path, value: str | None) -> Path | WorkbookSet:
+    """A single workbook path, or a WorkbookSet for a directory or glob pattern."""
+    raw = value or DEFAULT_XLSX
+    if glob.has_magic(raw):
+        pattern = Path(raw).expanduser()
+        return WorkbookSet(str(pattern if pattern.is_absolute() else root / pattern))
+    path = resolve_path(root, raw, DEFAULT_XLSX)
+    if path.is_dir():
+        return WorkbookSet(str(path / "*.xlsx"))
+    return path
+
+
+def _workbooks_missing(xlsx: Path | WorkbookSet, reporter: Reporter) -> bool:
+    if isinstance(xlsx, WorkbookSet):
+        if not xlsx.paths():
+            reporter.error("No workbooks match %s", xlsx)
+            return True
+        return False
+    if not xlsx.exists():
+        reporter.error("XLSX does not exist: %s", xlsx)
+        return True
+    return False
+
+
 def parse_args(argv: list[str]) -> argparse.Namespace:
     legacy_xlsx: str | None = None
     legacy_out: str | None = None
@@ -245,7 +1216,14 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("legacy_xlsx", nargs="?", help=argparse.SUPPRESS)
     parser.add_argument("legacy_out", nargs="?", help=argparse.SUPPRESS)
-    parser.add_argument("--xlsx", dest="xlsx", help="Path to game_data.xlsx")
+    parser.add_argument(
+        "--xlsx",
+        dest="xlsx",
+        help=(
+            "Path to game_data.xlsx, or a directory or glob of workbooks (e.g. 'GameData/Local/*.xlsx') "
+            "loaded concurrently and merged into one export."
+        ),
+    )
     parser.add_argument("--out", dest="out", help="Path to output game_data.json")
     parser.add_argument(
         "--project-root",
@@ -272,6 +1250,140 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Emit compact JSON instead of pretty-printed JSON.",
     )
+    parser.add_argument(
+        "--layout",
+        dest="layout",
+        default="rows",
+        choices=["rows", "columnar"],
+        help="Table layout: a list of row objects, or one value array per column (default: rows).",
+    )
+    parser.add_argument(
+        "--intern-strings",
+        dest="intern_strings",
+        action="store_true",
+        help="Pool repeated string cells into a top-level strings array referenced by index.",
+    )
+    parser.add_argument(
+        "--shard",
+        dest="shard",
+        action="store_true",
+        help="Write one JSON file per table plus manifest.json into a directory named after --out.",
+    )
+    parser.add_argument(
+        "--format",
+        dest="format",
+        default="json",
+        choices=["json", "bin", "both"],
+        help="Output format; bin is written next to --out with a .bin suffix (default: json).",
+    )
+    parser.add_argument(
+        "--compress",
+        dest="compress",
+        default="",
+        help="Comma-separated precompressed siblings to write next to each output: gzip, br.",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        dest="max_bytes",
+        action="append",
+        default=[],
+        metavar="[TABLE=]N",
+        help=(
+            "Size budget in bytes: N for the total, TABLE=N for one table, *=N for every table. "
+            "Checked against the smallest --compress encoding when given, else raw bytes. "
+            f"Exceeding it exits with {EXIT_BUDGET_EXCEEDED}. Repeatable."
+        ),
+    )
+    parser.add_argument(
+        "--full-load",
+        dest="full_load",
+        action="store_true",
+        help="Load the workbook in full edit mode instead of streaming it read-only.",
+    )
+    parser.add_argument(
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="Parse sheets in N worker processes; 0 uses every CPU (default: 1).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Reparse every sheet instead of reusing cached results for unchanged sheets.",
+    )
+    parser.add_argument(
+        "--force",
+        dest="force",
+        action="store_true",
+        help=(
+            "Export even if the stamp file next to the output shows the workbook, exporter "
+            "and output options are unchanged since the last export."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        help="Directory for the per-sheet parse cache (default: GameData/.cache/xlsx_to_json).",
+    )
+    parser.add_argument(
+        "--watch",
+        dest="watch",
+        action="store_true",
+        help="Stay resident and re-export whenever the workbook's contents change.",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        dest="watch_interval",
+        type=float,
+        default=0.1,
+        help="Seconds between workbook polls in --watch mode (default: 0.1).",
+    )
+    parser.add_argument(
+        "--debounce",
+        dest="debounce",
+        type=float,
+        default=0.25,
+        help="Seconds the workbook must stay unchanged before a --watch export (default: 0.25).",
+    )
+    parser.add_argument(
+        "--serve",
+        dest="serve",
+        action="store_true",
+        help="Run as a localhost export daemon; see tools/xlsx_export_client.py.",
+    )
+    parser.add_argument(
+        "--port",
+        dest="port",
+        type=int,
+        default=DEFAULT_SERVE_PORT,
+        help=f"TCP port on 127.0.0.1 for --serve (default: {DEFAULT_SERVE_PORT}).",
+    )
+    parser.add_argument(
+        "--index",
+        dest="index",
+        action="store_true",
+        help=(
+            "Sort each table's rows by id and add an 'index' section: id -> row position, "
+            f"plus value -> positions for columns whose comment contains {INDEX_MARKER}."
+        ),
+    )
+    parser.add_argument(
+        "--profile-report",
+        dest="profile_report",
+        default=os.environ.get(PROFILE_REPORT_ENV) or None,
+        help=(
+            "Write per-phase wall/CPU times and per-sheet parse timings to this JSON file "
+            f"(default: ${PROFILE_REPORT_ENV})."
+        ),
+    )
+    parser.add_argument(
+        "--cprofile",
+        dest="cprofile",
+        default=os.environ.get(CPROFILE_ENV) or None,
+        help=f"Dump a cProfile of the whole run (main process only) to this file (default: ${CPROFILE_ENV}).",
+    )
 
     args = parser.parse_args(argv[1:])
 
@@ -279,67 +1391,770 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         args.xlsx = legacy_xlsx or args.legacy_xlsx
     if not args.out:
         args.out = legacy_out or args.legacy_out
+    args.compress = [method.strip() for method in args.compress.split(",") if method.strip()]
+    for method in args.compress:
+        if method not in COMPRESSED_SUFFIXES:
+            parser.error(f"--compress: unknown method {method!r} (choose from {', '.join(COMPRESSED_SUFFIXES)})")
+    budgets: dict[str, int] = {}
+    for spec in args.max_bytes:
+        name, _, value = spec.rpartition("=")
+        try:
+            budgets[name.strip()] = int(value)
+        except ValueError:
+            parser.error(f"--max-bytes: expected [TABLE=]N, got {spec!r}")
+    args.max_bytes = budgets
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
 
     return args
 
 
-def run(argv: list[str]) -> int:
-    args = parse_args(argv)
+class ExportError(Exception):
+    """Export produced output that failed its own consistency checks."""
+
+
+def render_json(
+    tables: dict[str, Any],
+    meta: dict[str, Any] | None,
+    args: argparse.Namespace,
+    reporter: Reporter,
+) -> bytes:
+    """Serialise tables as a game_data JSON document honouring --layout and --intern-strings.
+
+    ``@series`` tables are written run-length or delta encoded instead and are
+    left out of interning and the columnar layout. Any transformed document
+    is decoded again and must give back ``tables``.
+    """
+    data: dict[str, Any] = {}
+    if meta is not None:
+        data["meta"] = meta
+    data["tables"] = tables
+    series_names = {name for name, table in tables.items() if "encoding" in table}
+    if series_names:
+        data["tables"] = {name: table for name, table in tables.items() if name not in series_names}
+    if args.intern_strings:
+        data["tables"], data["strings"] = intern_strings(data["tables"], reporter)
+    if args.layout == "columnar":
+        data["layout"] = "columnar"
+        data["tables"] = {name: table_to_columnar(table) for name, table in data["tables"].items()}
+    if series_names:
+        data["tables"] = {
+            name: table_to_series(table) if name in series_names else data["tables"][name]
+            for name, table in tables.items()
+        }
+        for name in sorted(series_names):
+            reporter.info(
+                "series table=%s encoding=%s rows=%d entries=%d",
+                name,
+                tables[name]["encoding"],
+                len(tables[name]["rows"]),
+                sum(len(encoded) for encoded in data["tables"][name]["series"]["columns"].values()),
+            )
+    indent = None if args.no_pretty else 2
+    json_text = json.dumps(data, ensure_ascii=False, indent=indent)
+    if data["tables"] is not tables and read_tables(json.loads(json_text)) != tables:
+        raise ExportError(f"layout={args.layout} does not round-trip to the parsed rows")
+    return json_text.encode("utf-8")
+
+
+def build_shards(
+    tables: dict[str, Any],
+    meta: dict[str, Any],
+    args: argparse.Namespace,
+    reporter: Reporter,
+    shard_dir: Path,
+) -> tuple[list[tuple[Path, bytes]], list[Path]]:
+    """Render one JSON document per table plus ``manifest.json``.
+
+    Shards carry no ``meta`` (it lives in the manifest) and intern strings per
+    shard, so a shard's bytes only change when its own table does. Returns the
+    files to write and the shard files of tables that no longer exist.
+    """
+    outputs: list[tuple[Path, bytes]] = []
+    entries: list[dict[str, Any]] = []
+    for name, table in tables.items():
+        payload = render_json({name: table}, None, args, reporter)
+        file_name = f"{name}.json"
+        outputs.append((shard_dir / file_name, payload))
+        entries.append(
+            {
+                "table": name,
+                "file": file_name,
+                "bytes": len(payload),
+                "sha256": hashlib.sha256(payload).hexdigest(),
+                "rows": len(table["rows"]),
+            }
+        )
+        reporter.info("shard %s bytes=%d rows=%d", file_name, len(payload), len(table["rows"]))
+
+    manifest: dict[str, Any] = {"meta": meta, "layout": args.layout, "shards": entries}
+    manifest_path = shard_dir / "manifest.json"
+    indent = None if args.no_pretty else 2
+    outputs.append((manifest_path, json.dumps(manifest, ensure_ascii=False, indent=indent).encode("utf-8")))
+
+    stale: list[Path] = []
     try:
-        reporter = Reporter(args.log_level)
-    except ValueError as exc:
-        print(f"[ERROR] {exc}", file=sys.stderr)
-        return 1
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    current_files = {entry["file"] for entry in entries}
+    for entry in previous.get("shards", []):
+        file_name = entry.get("file")
+        if isinstance(file_name, str) and file_name not in current_files and Path(file_name).name == file_name:
+            stale.append(shard_dir / file_name)
+    return outputs, stale
 
-    start_time = time.perf_counter()
 
-    project_root = resolve_project_root(args.project_root)
-    xlsx_path = resolve_path(project_root, args.xlsx, "GameData/Local/game_data.xlsx")
-    out_path = resolve_path(project_root, args.out, "Assets/StreamingAssets/game_data.json")
+def compress_payload(method: str, data: bytes) -> bytes:
+    """Compress at maximum level with no timestamps or names, so equal input gives equal bytes."""
+    import gzip
 
-    reporter.info("xlsx=%s out=%s", xlsx_path, out_path)
+    if method == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if method == "br":
+        try:
+            import brotli
+        except ImportError as exc:
+            raise ExportError("--compress br requires the 'brotli' package: python -m pip install brotli") from exc
+        return brotli.compress(data, quality=11)
+    raise ValueError(f"Unsupported compression: {method}")
 
-    if not xlsx_path.exists():
-        reporter.error("XLSX does not exist: %s", xlsx_path)
-        return 1
 
+def _payload_sizes(data: bytes, methods: list[str]) -> dict[str, int]:
+    sizes = {"raw": len(data)}
+    for method in methods:
+        sizes[method] = len(compress_payload(method, data))
+    return sizes
+
+
+def _budget_bytes(sizes: dict[str, int]) -> int:
+    # With --compress the budget is what the browser downloads: the smallest encoding.
+    return min(size for method, size in sizes.items() if method != "raw") if len(sizes) > 1 else sizes["raw"]
+
+
+def check_size_budget(
+    tables: dict[str, Any],
+    outputs: list[tuple[Path, bytes, bool]],
+    args: argparse.Namespace,
+    reporter: Reporter,
+) -> list[str]:
+    """Report raw/compressed bytes per table and in total; return budget violations.
+
+    Per-table sizes are those of the table rendered on its own (exactly the
+    shard with --shard). The total is summed over every output file, using
+    the compressed siblings already in ``outputs``.
+    """
+    silent = BufferedReporter("ERROR")
+    table_sizes: dict[str, dict[str, int]] = {}
+    for name, table in tables.items():
+        table_sizes[name] = _payload_sizes(render_json({name: table}, None, args, silent), args.compress)
+    suffix_methods = {suffix: method for method, suffix in COMPRESSED_SUFFIXES.items()}
+    total_sizes = {"raw": 0, **{method: 0 for method in args.compress}}
+    for path, payload, _ in outputs:
+        total_sizes[suffix_methods.get(path.suffix, "raw")] += len(payload)
+
+    def describe(sizes: dict[str, int]) -> str:
+        return " ".join(f"{method}={size}" for method, size in sizes.items())
+
+    for name, sizes in table_sizes.items():
+        reporter.info("size table=%s %s", name, describe(sizes))
+    reporter.info("size total %s", describe(total_sizes))
+
+    violations: list[str] = []
+    per_table_default = args.max_bytes.get("*")
+    for name, sizes in table_sizes.items():
+        limit = args.max_bytes.get(name, per_table_default)
+        if limit is not None and _budget_bytes(sizes) > limit:
+            violations.append(f"table {name} is {_budget_bytes(sizes)} bytes, budget {limit}")
+    unknown = sorted(set(args.max_bytes) - set(tables) - {"", "*"})
+    violations.extend(f"budget names unknown table {name!r}" for name in unknown)
+    total_limit = args.max_bytes.get("")
+    if total_limit is not None and _budget_bytes(total_sizes) > total_limit:
+        violations.append(f"total is {_budget_bytes(total_sizes)} bytes, budget {total_limit}")
+    return violations
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """Leave files whose bytes already match untouched so mtimes and HTTP caches stay valid."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    write_bytes_atomic(path, data)
+    return True
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write via a sibling temp file so readers never observe a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+@dataclass(slots=True)
+class ExportResult:
+    status: int
+    issues: list[str]
+    timings_ms: dict[str, float]
+    out_bytes: int = 0
+    paths: list[Path] = field(default_factory=list)
+
+
+def stamp_path(out_path: Path) -> Path:
+    """Hidden sibling of the output (Unity skips dot files), e.g. ``.game_data.json.stamp``."""
+    return out_path.with_name(f".{out_path.name}.stamp")
+
+
+def _file_sha256(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def build_stamp(args: argparse.Namespace, xlsx_path: Path | WorkbookSet) -> dict[str, Any]:
+    """What an export depends on: workbook bytes, exporter source and output options.
+
+    Everything here is read with the stdlib only, so checking a stamp never
+    imports openpyxl. gamedata_bin.py is hashed as a file rather than imported.
+    """
+    exporter = hashlib.sha256(exporter_fingerprint().encode("utf-8"))
+    exporter.update(Path(__file__).with_name("gamedata_bin.py").read_bytes())
+    paths = xlsx_path.paths() if isinstance(xlsx_path, WorkbookSet) else [xlsx_path]
+    return {
+        "format": STAMP_FORMAT,
+        "exporter": exporter.hexdigest(),
+        "options": {name: getattr(args, name) for name in STAMP_OPTIONS},
+        "inputs": {str(path): _file_sha256(path) for path in paths},
+    }
+
+
+def stamp_is_current(path: Path, expected: dict[str, Any]) -> bool:
+    """True when the stamp at ``path`` matches ``expected`` and every output it lists is unchanged."""
+    try:
+        stamp = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return False
+    if not isinstance(stamp, dict) or not stamp.get("outputs"):
+        return False
+    if any(stamp.get(key) != value for key, value in expected.items()):
+        return False
+    return all(_file_sha256(Path(output)) == digest for output, digest in stamp["outputs"].items())
+
+
+def write_stamp(path: Path, stamp: dict[str, Any], outputs: list[Path]) -> None:
+    stamp = {**stamp, "outputs": {str(output): _file_sha256(output) for output in outputs}}
+    write_bytes_atomic(path, json.dumps(stamp, ensure_ascii=False, indent=2).encode("utf-8") + b"\n")
+
+
+class WorkbookMemo:
+    """In-memory cache of parsed workbooks keyed by the xlsx file's content hash."""
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[dict[str, Any], list[str], BufferedReporter]] = {}
+
+    def get(self, digest: str) -> tuple[dict[str, Any], list[str], BufferedReporter] | None:
+        entry = self._entries.pop(digest, None)
+        if entry is not None:
+            self._entries[digest] = entry
+        return entry
+
+    def put(self, digest: str, entry: tuple[dict[str, Any], list[str], BufferedReporter]) -> None:
+        self._entries.pop(digest, None)
+        self._entries[digest] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+
+def _load_tables(
+    args: argparse.Namespace,
+    reporter: Reporter,
+    xlsx_path: Path | WorkbookSet,
+    cache: SheetCache | None,
+    memo: WorkbookMemo | None,
+    profiler: PhaseProfiler,
+) -> tuple[dict[str, Any], list[str]]:
+    if isinstance(xlsx_path, WorkbookSet):
+        return _load_workbook_set(args, reporter, xlsx_path, cache, profiler)
+    digest = None
+    if memo is not None:
+        with profiler.phase("memo_lookup"):
+            digest = hashlib.sha256(xlsx_path.read_bytes()).hexdigest()
+            entry = memo.get(digest)
+        if entry is not None:
+            tables, issues, buffered = entry
+            reporter.info("workbook memo=hit sha256=%s", digest[:12])
+            buffered.replay(reporter)
+            return tables, issues
+        reporter.info("workbook memo=miss sha256=%s", digest[:12])
+    buffered = BufferedReporter("DEBUG")
+    with profiler.phase("load", readOnly=not args.full_load):
+        workbook = open_workbook(xlsx_path, read_only=not args.full_load)
     try:
-        workbook = load_workbook(xlsx_path, data_only=True)
-        tables, issues = build_tables(workbook, reporter)
+        tables, issues = build_tables(
+            workbook,
+            buffered,
+            xlsx_path=xlsx_path,
+            jobs=args.jobs,
+            cache=cache,
+            profiler=profiler,
+            index=args.index,
+        )
+    finally:
+        workbook.close()
+    # Parse with a DEBUG buffer so a memoised entry can be replayed at any level.
+    buffered.replay(reporter)
+    if memo is not None and digest is not None:
+        memo.put(digest, (tables, issues, buffered))
+    return tables, issues
+
+
+def _parse_workbook_in_worker(
+    xlsx_path: str,
+    sheet_names: list[str] | None,
+    read_only: bool,
+    profile: bool,
+) -> tuple[list[str], list[ParsedSheet], list[dict[str, Any]]]:
+    """Open one workbook in a worker process and parse ``sheet_names`` (None: all of them)."""
+    workbook = open_workbook(Path(xlsx_path), read_only=read_only)
+    try:
+        names = list(workbook.sheetnames) if sheet_names is None else sheet_names
+        results: list[ParsedSheet] = []
+        entries: list[dict[str, Any]] = []
+        for sheet_name in names:
+            # DEBUG buffers so reused results can be replayed at any level.
+            buffered = BufferedReporter("DEBUG")
+            if profile:
+                table, issues, entry = parse_sheet_profiled(workbook[sheet_name], buffered)
+                entries.append(entry)
+            else:
+                table, issues = parse_sheet(workbook[sheet_name], buffered)
+            results.append((table, issues, buffered))
+        return list(workbook.sheetnames), results, entries
+    finally:
+        workbook.close()
+
+
+def _fresh_sheet(result: ParsedSheet) -> ParsedSheet:
+    # resolve_references rewrites ref columns in place; reused results must stay unresolved.
+    table, issues, buffered = result
+    if table is not None:
+        table = replace(table, columns=list(table.columns), rows=[dict(row) for row in table.rows])
+    return table, issues, buffered
+
+
+def _load_workbook_set(
+    args: argparse.Namespace,
+    reporter: Reporter,
+    workbooks: WorkbookSet,
+    cache: SheetCache | None,
+    profiler: PhaseProfiler,
+) -> tuple[dict[str, Any], list[str]]:
+    """Parse every workbook of the set and merge their sheets into one tables dict.
+
+    A file whose stat signature matches the previous export reuses its parsed
+    sheets; otherwise the parse cache is consulted by sheet content hash, and
+    only files with uncached sheets are opened with openpyxl, concurrently in
+    worker processes when there is more than one. Sheets are merged in file
+    order; a sheet name defined in two files is a validation issue.
+    """
+    paths = workbooks.paths()
+    per_file: dict[Path, dict[str, ParsedSheet]] = {}
+    signatures = {path: _file_signature(path) for path in paths}
+    # path -> (sheet names or None, cache hits, cache keys, sheets to parse or None for all)
+    pending: dict[Path, tuple[list[str] | None, dict[str, ParsedSheet], dict[str, str], list[str] | None]] = {}
+    for path in paths:
+        previous = workbooks.parsed.get(path)
+        if previous is not None and previous[0] is not None and previous[0] == signatures[path]:
+            per_file[path] = previous[1]
+            reporter.info("workbook %s unchanged (mtime), sheets=%d reused", path.name, len(previous[1]))
+            continue
+        if cache is None:
+            pending[path] = (None, {}, {}, None)
+            continue
+        names, hits, cache_keys = _cached_sheets(cache, path, None, reporter, profiler)
+        dirty = [name for name in names if name not in hits]
+        if dirty:
+            pending[path] = (names, hits, cache_keys, dirty)
+        else:
+            per_file[path] = hits
+            reporter.info("workbook %s cache=hit sheets=%d (not opened)", path.name, len(names))
+
+    # Same cap as the single-workbook path (_parse_sheets).
+    workers = min(len(pending), args.jobs, os.cpu_count() or 1)
+    read_only = not args.full_load
+    profile = profiler.per_sheet
+    with profiler.phase("parse", files=len(pending), workers=workers, sheets=sum(
+        len(dirty) if dirty is not None else 0 for *_, dirty in pending.values()
+    )):
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(
+                    executor.map(
+                        _parse_workbook_in_worker,
+                        [str(path) for path in pending],
+                        [dirty for *_, dirty in pending.values()],
+                        [read_only] * len(pending),
+                        [profile] * len(pending),
+                    )
+                )
+        else:
+            outcomes = [
+                _parse_workbook_in_worker(str(path), dirty, read_only, profile)
+                for path, (*_, dirty) in pending.items()
+            ]
+    for (path, (names, hits, cache_keys, dirty)), (all_names, results, entries) in zip(pending.items(), outcomes):
+        profiler.sheets.extend(entries)
+        parsed_now = dict(zip(all_names if dirty is None else dirty, results))
+        if cache is not None:
+            _store_sheets(cache, cache_keys, parsed_now, profiler)
+        merged = {**hits, **parsed_now}
+        per_file[path] = {name: merged[name] for name in (names or all_names)}
+        reporter.info("workbook %s parsed sheets=%d", path.name, len(parsed_now))
+
+    workbooks.parsed = {path: (signatures[path], per_file[path]) for path in paths}
+
+    owners: dict[str, Path] = {}
+    parsed: dict[str, ParsedSheet] = {}
+    collisions: list[str] = []
+    for path in paths:
+        for sheet_name, result in per_file[path].items():
+            if sheet_name in owners:
+                collisions.append(f"sheet {sheet_name!r} is defined in both {owners[sheet_name].name} and {path.name}")
+                continue
+            owners[sheet_name] = path
+            parsed[sheet_name] = _fresh_sheet(result)
+    meta_owner = owners.get("Meta")
+    reporter.info(
+        "workbooks=%d sheets=%d meta=%s",
+        len(paths),
+        len(parsed),
+        meta_owner.name if meta_owner is not None else "-",
+    )
+    tables, issues = assemble_tables(parsed, reporter, profiler=profiler, index=args.index and not collisions)
+    return tables, collisions + issues
+
+
+def write_profile_report(
+    path: Path,
+    profiler: PhaseProfiler,
+    result: ExportResult,
+    xlsx_path: Path | WorkbookSet,
+    wall_start: float,
+    cpu_start: float,
+) -> None:
+    sheets = profiler.sheets
+    report = {
+        "xlsx": str(xlsx_path),
+        "status": result.status,
+        "wall_ms": _elapsed_ms(wall_start, time.perf_counter()),
+        "cpu_ms": _elapsed_ms(cpu_start, time.process_time()),
+        "phases": profiler.phases,
+        "sheets": sheets,
+        # Read-only workbooks stream their XML lazily, so most openpyxl time
+        # shows up inside parse_sheet as openpyxl_read_ms, not under "load".
+        "summary": {
+            "load_ms": sum(entry["wall_ms"] for entry in profiler.phases if entry["phase"] == "load"),
+            "openpyxl_read_ms": round(sum(entry["openpyxl_read_ms"] for entry in sheets), 3),
+            "convert_ms": round(sum(entry["convert_ms"] for entry in sheets), 3),
+            "rows": sum(entry["rows"] for entry in sheets),
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def export_workbook(
+    args: argparse.Namespace,
+    reporter: Reporter,
+    xlsx_path: Path | WorkbookSet,
+    out_path: Path,
+    cache: SheetCache | None,
+    memo: WorkbookMemo | None = None,
+) -> ExportResult:
+    if not args.profile_report:
+        return _export_workbook(args, reporter, xlsx_path, out_path, cache, memo, PhaseProfiler())
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    profiler = PhaseProfiler(per_sheet=True)
+    result = _export_workbook(args, reporter, xlsx_path, out_path, cache, memo, profiler)
+    report_path = Path(args.profile_report)
+    write_profile_report(report_path, profiler, result, xlsx_path, wall_start, cpu_start)
+    reporter.info("profile_report=%s", report_path)
+    return result
+
+
+def _export_workbook(
+    args: argparse.Namespace,
+    reporter: Reporter,
+    xlsx_path: Path | WorkbookSet,
+    out_path: Path,
+    cache: SheetCache | None,
+    memo: WorkbookMemo | None,
+    profiler: PhaseProfiler,
+) -> ExportResult:
+    start_time = time.perf_counter()
+    timings_ms: dict[str, float] = {}
+    issues: list[str] = []
+
+    def lap(name: str, since: float) -> float:
+        now = time.perf_counter()
+        timings_ms[name] = round((now - since) * 1000, 3)
+        return now
+
+    try:
+        tables, issues = _load_tables(args, reporter, xlsx_path, cache, memo, profiler)
+        phase_start = lap("parse", start_time)
+        profiler.mark()
         if issues:
             reporter.error("validate=FAIL issues=%d", len(issues))
             for issue in issues:
                 reporter.error(" - %s", issue)
-            return 2
+            profiler.lap("validate", issues=len(issues))
+            lap("total", start_time)
+            return ExportResult(2, issues, timings_ms)
         reporter.info("validate=OK")
+        profiler.lap("validate", issues=0)
 
         meta = {}
         meta_table = tables.get("Meta")
         if meta_table and meta_table.get("rows"):
             meta = meta_table["rows"][0]
-        data = {
-            "meta": meta,
-            "tables": tables,
-        }
-        indent = None if args.no_pretty else 2
-        json_text = json.dumps(data, ensure_ascii=False, indent=indent)
-        json_bytes = json_text.encode("utf-8")
-        reporter.info("json_bytes=%d", len(json_bytes))
+        # (path, payload, skip_if_unchanged)
+        outputs: list[tuple[Path, bytes, bool]] = []
+        # Shard files left over from a previous export; only JSON shards are ever pruned.
+        stale: list[Path] = []
+        if args.format in {"json", "both"} and args.shard:
+            shard_outputs, stale = build_shards(tables, meta, args, reporter, out_path.with_suffix(""))
+            outputs.extend((path, payload, True) for path, payload in shard_outputs)
+        elif args.format in {"json", "both"}:
+            json_bytes = render_json(tables, meta, args, reporter)
+            reporter.info("json_bytes=%d layout=%s", len(json_bytes), args.layout)
+            outputs.append((out_path, json_bytes, False))
+        if args.format in {"bin", "both"}:
+            import gamedata_bin
+
+            bin_bytes = gamedata_bin.encode(meta, tables)
+            reporter.info("bin_bytes=%d", len(bin_bytes))
+            if gamedata_bin.decode(bin_bytes) != {"meta": meta, "tables": tables}:
+                raise ExportError("binary export does not round-trip to the parsed rows")
+            outputs.append((out_path.with_suffix(".bin"), bin_bytes, False))
+        if args.compress:
+            outputs.extend(
+                (path.with_name(path.name + COMPRESSED_SUFFIXES[method]), compress_payload(method, payload), skip)
+                for path, payload, skip in list(outputs)
+                for method in args.compress
+            )
+        phase_start = lap("serialize", phase_start)
+        profiler.lap("serialize", files=len(outputs), bytes=sum(len(payload) for _, payload, _ in outputs))
+
+        if args.compress or args.max_bytes:
+            violations = check_size_budget(tables, outputs, args, reporter)
+            profiler.lap("budget", violations=len(violations))
+            if violations:
+                reporter.error("budget=FAIL violations=%d", len(violations))
+                for violation in violations:
+                    reporter.error(" - %s", violation)
+                lap("total", start_time)
+                return ExportResult(EXIT_BUDGET_EXCEEDED, violations, timings_ms)
 
         if args.validate_only:
-            elapsed_ms = (time.perf_counter() - start_time) * 1000
-            reporter.success("validate_only elapsed_ms=%.2f", elapsed_ms)
-            return 0
+            lap("total", start_time)
+            reporter.success("validate_only elapsed_ms=%.2f", timings_ms["total"])
+            return ExportResult(0, issues, timings_ms)
 
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_bytes(json_bytes)
-        size_bytes = out_path.stat().st_size
-        elapsed_ms = (time.perf_counter() - start_time) * 1000
-        reporter.success("out_bytes=%d elapsed_ms=%.2f", size_bytes, elapsed_ms)
-        return 0
+        size_bytes = 0
+        for path, payload, skip_if_unchanged in outputs:
+            if skip_if_unchanged:
+                write_bytes_if_changed(path, payload)
+            else:
+                write_bytes_atomic(path, payload)
+            size_bytes += len(payload)
+        if args.shard:
+            for path in stale:
+                path.unlink(missing_ok=True)
+                reporter.info("shard removed %s", path.name)
+        lap("write", phase_start)
+        profiler.lap("write", files=len(outputs), bytes=size_bytes)
+        lap("total", start_time)
+        reporter.success("out_bytes=%d elapsed_ms=%.2f", size_bytes, timings_ms["total"])
+        return ExportResult(0, issues, timings_ms, size_bytes, [path for path, _, _ in outputs])
+    except ExportError as exc:
+        reporter.error("%s", exc)
+        lap("total", start_time)
+        return ExportResult(3, issues, timings_ms)
     except Exception as exc:
         reporter.error("Unhandled exception during export: %s", exc)
-        return 3
+        lap("total", start_time)
+        return ExportResult(3, issues, timings_ms)
+
+
+def _file_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _settled_digest(path: Path) -> str | None:
+    """Hash the workbook once it is a complete zip; None while it is missing or mid-save."""
+    import io
+    import zipfile
+
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if not data.startswith(b"PK"):
+        return None
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            archive.getinfo("[Content_Types].xml")
+    except (zipfile.BadZipFile, KeyError):
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+
+def _watch_signature(xlsx: Path | WorkbookSet) -> Any:
+    if isinstance(xlsx, WorkbookSet):
+        paths = xlsx.paths()
+        return tuple((path, _file_signature(path)) for path in paths) if paths else None
+    return _file_signature(xlsx)
+
+
+def _watch_digest(xlsx: Path | WorkbookSet) -> str | None:
+    if not isinstance(xlsx, WorkbookSet):
+        return _settled_digest(xlsx)
+    digest = hashlib.sha256()
+    for path in xlsx.paths():
+        file_digest = _settled_digest(path)
+        if file_digest is None:
+            return None
+        digest.update(f"{path}\0{file_digest}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def watch_workbook(
+    args: argparse.Namespace,
+    reporter: Reporter,
+    xlsx_path: Path | WorkbookSet,
+    out_path: Path,
+    cache: SheetCache | None,
+) -> int:
+    """Stay resident and re-export whenever the workbook's contents change.
+
+    The file is polled by stat signature, so Excel's save pattern (write a temp
+    file, rename it over the original) shows up as a normal change. Events are
+    debounced until the signature has been stable for ``--debounce`` seconds,
+    then the export only runs if the content hash differs from the last export.
+    Lock files (``~$game_data.xlsx``) are never looked at. For a WorkbookSet
+    every matching file is polled, and only the files that changed are
+    reloaded.
+    """
+    reporter.info(
+        "watch xlsx=%s interval=%.2fs debounce=%.2fs",
+        xlsx_path,
+        args.watch_interval,
+        args.debounce,
+    )
+    last_digest: str | None = None
+    last_signature = _watch_signature(xlsx_path)
+    changed_at: float | None = time.monotonic() - args.debounce
+    try:
+        while True:
+            signature = _watch_signature(xlsx_path)
+            now = time.monotonic()
+            if signature != last_signature:
+                last_signature = signature
+                changed_at = now
+            elif changed_at is not None and signature is not None and now - changed_at >= args.debounce:
+                digest = _watch_digest(xlsx_path)
+                if digest is None:
+                    # Still mid-save (or replaced between stat and read); check again next tick.
+                    changed_at = now
+                else:
+                    changed_at = None
+                    if digest != last_digest:
+                        last_digest = digest
+                        export_workbook(args, reporter, xlsx_path, out_path, cache)
+                    else:
+                        reporter.info("watch unchanged content, skipping export")
+            time.sleep(args.watch_interval)
+    except KeyboardInterrupt:
+        reporter.info("watch stopped")
+        return 0
+
+
+def run(argv: list[str]) -> int:
+    if len(argv) > 1 and argv[1] in DELTA_COMMANDS:
+        import gamedata_delta
+
+        return gamedata_delta.run(argv)
+    args = parse_args(argv)
+    try:
+        reporter = Reporter(args.log_level)
+    except ValueError as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        return 1
+
+    if not args.cprofile:
+        return _run(args, reporter)
+    import cProfile
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        return _run(args, reporter)
+    finally:
+        profile.disable()
+        cprofile_path = Path(args.cprofile)
+        cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(cprofile_path)
+        reporter.info("cprofile=%s", cprofile_path)
+
+
+def _run(args: argparse.Namespace, reporter: Reporter) -> int:
+    project_root = resolve_project_root(args.project_root)
+    cache = None
+    if not args.no_cache:
+        cache = SheetCache(resolve_path(project_root, args.cache_dir, "GameData/.cache/xlsx_to_json"))
+
+    if args.serve:
+        from xlsx_export_server import serve_exports
+
+        return serve_exports(args, reporter, project_root, cache)
+
+    xlsx_path = resolve_workbooks(project_root, args.xlsx)
+    out_path = resolve_path(project_root, args.out, DEFAULT_OUT)
+
+    reporter.info("xlsx=%s out=%s", xlsx_path, out_path)
+
+    if _workbooks_missing(xlsx_path, reporter):
+        return 1
+
+    if args.watch:
+        return watch_workbook(args, reporter, xlsx_path, out_path, cache)
+
+    # Profiled runs always export, so the reports describe a real build.
+    use_stamp = not (args.force or args.profile_report or args.cprofile)
+    if use_stamp:
+        started = time.perf_counter()
+        stamp = build_stamp(args, xlsx_path)
+        if stamp_is_current(stamp_path(out_path), stamp):
+            reporter.success("up to date (stamp) elapsed_ms=%.2f", (time.perf_counter() - started) * 1000)
+            return 0
+    result = export_workbook(args, reporter, xlsx_path, out_path, cache)
+    if use_stamp and result.status == 0 and not args.validate_only:
+        # Input hashes were taken before the export, so a save that lands mid-export leaves the stamp stale.
+        write_stamp(stamp_path(out_path), stamp, result.paths)
+    return result.status
 
 
 def main() -> None:
@@ -347,4 +2162,7 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Lets modules imported on demand (xlsx_export_server) share this module
+    # instead of importing a second copy of the script.
+    sys.modules.setdefault("xlsx_to_json", sys.modules[__name__])
     main()